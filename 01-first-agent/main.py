@@ -1,45 +1,152 @@
 from dotenv import load_dotenv
-import os
-from agents import AsyncOpenAI, OpenAIChatCompletionsModel, Agent, Runner, RunConfig
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from agents import Agent, Runner
 import asyncio
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.response_cache import ResponseCache
+
 load_dotenv()
 
-async def main():
-    MODEL_NAME = "gemini-2.0-flash"
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Usage:
+#   uv run main.py                                   -> interactive mode (one query at a time)
+#   uv run main.py --batch queries.txt               -> batch mode, one query per line
+#   uv run main.py --batch queries.jsonl -o out.jsonl --concurrency 16
+#   cat queries.txt | uv run main.py --batch -      -> batch mode reading from stdin
+#   uv run main.py --batch queries.txt --cache --cache-db cache.sqlite3  -> answer repeated queries from a cache
+# JSONL lines may be a plain string or an object with a "query" (or "input") field.
 
-    external_client = AsyncOpenAI(
-        api_key=GEMINI_API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
 
-    model = OpenAIChatCompletionsModel(
-        model=MODEL_NAME,
-        openai_client=external_client
-    )
+def read_queries(source):
+    """Reads queries from a file path (or '-' for stdin), either JSONL or one query per line."""
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    queries = []
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] in "{\"":
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    queries.append(line)  # Not JSON after all, keep the raw line
+                    continue
+                if isinstance(item, dict):
+                    item = item.get("query", item.get("input", ""))
+                queries.append(str(item))
+            else:
+                queries.append(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return queries
+
+
+async def run_batch(assistant, queries, config, concurrency=8, cache=None):
+    """Runs all queries concurrently (at most `concurrency` in flight) and returns results in input order."""
+    semaphore = asyncio.Semaphore(concurrency)
+    run = cache.run if cache else Runner.run
+
+    async def run_one(index, query):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await run(assistant, query, run_config=config)
+                output, error = result.final_output, None
+                cached = getattr(result, "cached", False)
+            except Exception as e:
+                output, error, cached = None, f"{type(e).__name__}: {e}", False
+            latency_ms = (time.perf_counter() - started) * 1000
+        return {"index": index, "query": query, "output": output, "error": error, "latency_ms": round(latency_ms, 1), "cached": cached}
+
+    # gather keeps the results in the same order as the queries
+    return await asyncio.gather(*(run_one(i, q) for i, q in enumerate(queries)))
+
+
+def print_batch_summary(results, elapsed):
+    """Prints latency and throughput stats for a finished batch to stderr."""
+    latencies = sorted(r["latency_ms"] for r in results)
+    failed = sum(1 for r in results if r["error"])
+    if not latencies:
+        print("No queries to run.", file=sys.stderr)
+        return
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
 
-    config = RunConfig(
-        model=model,
-        model_provider=external_client,
-        tracing_disabled=True
+    print(
+        f"{len(results)} queries ({failed} failed) in {elapsed:.2f}s -> "
+        f"{len(results) / elapsed:.2f} queries/s | latency ms: "
+        f"p50={percentile(50):.0f} p90={percentile(90):.0f} p99={percentile(99):.0f} max={latencies[-1]:.0f}",
+        file=sys.stderr,
     )
 
+
+async def main(args):
+    # One pooled client, model and config shared by every query (interactive or batch)
+    config = get_config()
+    await warm_up()
+
+    cache = ResponseCache(max_entries=args.cache_size, ttl=args.cache_ttl, db_path=args.cache_db) if args.cache else None
+
     assistant = Agent(
         name="Assistant",
         instructions="Your job is to resolve queries",
         # model=model
     )
 
+    if args.batch:
+        queries = read_queries(args.batch)
+        started = time.perf_counter()
+        results = await run_batch(assistant, queries, config, concurrency=args.concurrency, cache=cache)
+        elapsed = time.perf_counter() - started
+
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for r in results:
+                out.write(json.dumps(r, ensure_ascii=False) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        print_batch_summary(results, elapsed)
+        if cache:
+            print(f"cache: {cache.stats()}", file=sys.stderr)
+        return
+
     while True:  # This loop will run continuously
         user_input = input("Enter your query here (or type 'exit' to quit): ")
         if user_input.lower() == 'exit':
             break  # Exit the loop if user types 'exit'
-        
-        result = await Runner.run(assistant, user_input, run_config=config)
+
+        if cache:
+            result = await cache.run(assistant, user_input, run_config=config)
+        else:
+            result = await Runner.run(assistant, user_input, run_config=config)
 
         print(result.final_output)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Resolve queries with a Gemini-backed agent.")
+    parser.add_argument("--batch", metavar="FILE", help="read queries from FILE (JSONL or one per line), '-' for stdin")
+    parser.add_argument("-o", "--output", metavar="FILE", help="write JSONL results to FILE instead of stdout")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="max queries in flight at once (default: 8)")
+    parser.add_argument("--cache", action="store_true", help="answer repeated queries from an exact-match response cache")
+    parser.add_argument("--cache-db", metavar="FILE", help="persist the response cache in this SQLite file")
+    parser.add_argument("--cache-ttl", type=float, default=3600, help="seconds a cached answer stays valid (default: 3600)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="max cached answers kept in memory (default: 1024)")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
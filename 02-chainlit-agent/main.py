@@ -1,34 +1,47 @@
-import os 
+import os
 import chainlit as cl
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, RunConfig, OpenAIChatCompletionsModel
+from agents import Agent, Runner
+import sys
+from pathlib import Path
 
-load_dotenv()
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.response_cache import ResponseCache
+from shared.semantic_cache import SemanticCache
 
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+load_dotenv()
 
-external_client = AsyncOpenAI(
-    api_key = GEMINI_API_KEY,
-    base_url = "https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+config = get_config()
 
-model = OpenAIChatCompletionsModel(
-    model = MODEL_NAME,
-    openai_client = external_client
-)
+# Opt-in exact-match response cache: set RESPONSE_CACHE=1 in .env
+# (and RESPONSE_CACHE_DB=cache.sqlite3 to keep answers across restarts)
+response_cache = None
+if os.getenv("RESPONSE_CACHE") == "1":
+    response_cache = ResponseCache(
+        max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+        db_path=os.getenv("RESPONSE_CACHE_DB"),
+    )
 
-config = RunConfig(
-    model = model,
-    model_provider = external_client,
-    tracing_disabled = True
-)
+# Opt-in semantic cache for paraphrased questions: set SEMANTIC_CACHE=1 in .env
+semantic_cache = None
+if os.getenv("SEMANTIC_CACHE") == "1":
+    semantic_cache = SemanticCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", "1000")),
+    )
 
 my_assitant = Agent(
     name = "AI Assitant",
     instructions = "You are helpful assitant"
 )
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+
 @cl.on_chat_start
 async def start():
     await cl.Message(
@@ -39,7 +52,12 @@ async def start():
 async def handle_message(message: cl.Message):
     try:
         user_input = message.content
-        result = await Runner.run(my_assitant,input = user_input, run_config=config)
+        run = response_cache.run if response_cache else Runner.run
+        if semantic_cache:
+            # semantic misses fall through to the exact-match cache (if enabled), then to Gemini
+            result = await semantic_cache.run(my_assitant, user_input, runner=run, run_config=config)
+        else:
+            result = await run(my_assitant, input = user_input, run_config=config)
         await cl.Message(content = result.final_output).send()
     except Exception as e:
         await cl.Message(content = f"❌ Error: {e}").send()
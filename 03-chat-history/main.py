@@ -1,60 +1,56 @@
 
-import chainlit as cl
 import os
-from agents import Agent, RunConfig, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+import chainlit as cl
+from agents import Agent, Runner
 from dotenv import load_dotenv
 import traceback
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.session_store import SessionCache, get_session_store
 
 load_dotenv()
 
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+config = get_config()
+
+# Chat history is written to the session store as it happens and loaded lazily per chat;
+# only recently active sessions are kept in RAM. Set SESSION_DB (a SQLite file path) to
+# keep it across restarts, otherwise it lives in memory
+sessions = SessionCache(get_session_store())
 
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
 my_assistant = Agent(
     name="Personal Assistant",
     instructions="You are a helpful personal assistant.",
 )
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+
 @cl.on_chat_start
 async def on_chat_start():
-    cl.user_session.set("history", [])
+    sessions.get(cl.context.session.thread_id)  # loads a resumed thread's history from the store
     await cl.Message(content="Welcome! How can I assist you today?").send()
 
 @cl.on_message
 async def handle_message(message: cl.Message):
-    history = cl.user_session.get("history") or []
-
-    # Append the new user message to history
-    history.append({"role": "user", "content": message.content})
-
-    # Build the prompt from history
-    prompt = ""
-    for msg in history:
-        if msg["role"] == "user":
-            prompt += f"User: {msg['content']}\n"
-        else:
-            prompt += f"Assistant: {msg['content']}\n"
-    prompt += "Assistant:"
-  
-    result = await Runner.run(
-            my_assistant,
-            input=prompt,
-            run_config=config,
-        )
-    history.append({"role": "assistant", "content": result.final_output})
-    cl.user_session.set("history", history)
-
-    await cl.Message(content=result.final_output).send()
+    # Kept in RAM until the reply is stored, so the session can't be reloaded mid-turn
+    with sessions.turn(cl.context.session.thread_id) as history:
+        # Append only the new user message; earlier turns are never re-rendered
+        history.add_user(message.content)  # written through to the session store
+
+        # Send the summary + recent turns (within the token budget) as structured input items
+        result = await Runner.run(
+                my_assistant,
+                input=history.to_input_items(),
+                run_config=config,
+            )
+        history.add_assistant(result.final_output)
+
+        await cl.Message(content=result.final_output).send()
+
+        # Now that the reply is out, fold old turns into the summary in the background
+        history.summarize_in_background()
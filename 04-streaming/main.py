@@ -2,65 +2,69 @@
 import chainlit as cl
 import os
 import asyncio
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner 
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.token_stream import TokenCoalescer
+from shared.stream_metrics import TimedStream, start_metrics_server
+from shared.session_store import SessionCache, get_session_store
 
 load_dotenv()
 
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+config = get_config()
 
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Chat history is written to the session store as it happens and loaded lazily per chat;
+# only recently active sessions are kept in RAM. Set SESSION_DB (a SQLite file path) to
+# keep it across restarts, otherwise it lives in memory
+sessions = SessionCache(get_session_store())
 
 my_assistant = Agent(
     name="Personal Assistant",
     instructions="You are a helpful personal assistant."
 )
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+    # TTFT / inter-token gap / tokens-per-second metrics for scraping at :METRICS_PORT/metrics
+    if os.getenv("METRICS_PORT"):
+        start_metrics_server(int(os.getenv("METRICS_PORT")))
+
 @cl.on_chat_start
 async def on_chat_start():
-    cl.user_session.set("history", [])
+    sessions.get(cl.context.session.thread_id)  # loads a resumed thread's history from the store
     await cl.Message(content="Welcome! How can I assist you today?").send()
 
 @cl.on_message
 async def handle_message(message: cl.Message):
-    history = cl.user_session.get("history")
-    
-    msg = cl.Message(content="")
-    await msg.send()
+    # Kept in RAM until the reply is stored, so the session can't be reloaded mid-turn
+    with sessions.turn(cl.context.session.thread_id) as history:
+        msg = cl.Message(content="")
+        await msg.send()
+
+        history.add_user(message.content)
+        # Run the agent with streaming enabled (summary + recent turns within the token budget)
+        result = Runner.run_streamed(my_assistant, history.to_input_items(), run_config=config)
+
+        # Deltas are batched into one websocket frame per ~64 chars / 30 ms instead of one per token
+        async with TokenCoalescer(msg.stream_token) as stream:
+            async for event in TimedStream(result, app="04-streaming"):
+                if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
+                    await stream.push(event.data.delta)
 
-    history.append({"role": "user", "content": message.content})
-    # Run the agent with streaming enabled
-    result = Runner.run_streamed(my_assistant, history, run_config=config)
+              #exact code to implement streaming in sdk
+        # async for event in result.stream_events():
+        #     if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+        #         print(event.data.delta, end="", flush=True)
 
-        # Stream the response token by token
-    async for event in result.stream_events():
-        if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
-            token = event.data.delta
-            await msg.stream_token(token)
+        history.add_assistant(result.final_output)
 
-          #exact code to implement streaming in sdk
-    # async for event in result.stream_events():
-    #     if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
-    #         print(event.data.delta, end="", flush=True)
-     
-    history.append({"role": "assistant", "content": result.final_output})
-    cl.user_session.set("history", history)
-    
-    await cl.Message(content=response).send()
+        await msg.update()
 
+        # Now that the reply is out, fold old turns into the summary in the background
+        history.summarize_in_background()
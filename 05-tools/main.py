@@ -2,29 +2,27 @@
 import os
 import asyncio
 import chainlit as cl
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.token_stream import TokenCoalescer
+from shared.stream_metrics import TimedStream, start_metrics_server
+from shared.pre_router import PreRouter, get_embedder
+from shared.speculation import Speculator
+from shared.session_store import SessionCache, get_session_store
 
 load_dotenv()
 #step1 : Initialize the model and API key
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+config = get_config()
 
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-#step2 : config
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Chat history is written to the session store as it happens and loaded lazily per chat;
+# only recently active sessions are kept in RAM. Set SESSION_DB (a SQLite file path) to
+# keep it across restarts, otherwise it lives in memory
+sessions = SessionCache(get_session_store())
 
 #step3: Tools
 
@@ -45,32 +43,86 @@ triage_agent = Agent(
     instructions="You determine which agent to use based on the user's homework question. You will translate output also if user needs in any language.",
     handoffs=[history_tutor_agent, math_tutor_agent]
 )
+
+# Pre-router: clearly-math or clearly-history questions go straight to the tutor, skipping
+# the triage round-trip. Translation requests stay with triage, which handles them.
+# "-" and "/" only count as operators with spaces around them, so years and dates
+# ("1914-1918", "9/11") are not mistaken for arithmetic.
+# PREROUTER_EMBED=local|gemini also enables the nearest-centroid classifier.
+router = PreRouter(
+    triage_agent,
+    rules={
+        math_tutor_agent.name: [
+            r"\d+(\.\d+)?(\s*[+*^=×÷]\s*|\s+[-/]\s+)\d+", "math", "maths", "equation", "solve", "algebra", "geometry",
+            "calculus", "integral", "derivative", "fraction", "percentage", "probability", "theorem",
+        ],
+        history_tutor_agent.name: [
+            "history", "historical", "war", "empire", "dynasty", "revolution", "ancient", "civilization",
+            "battle", "independence", "century", "medieval",
+        ],
+        triage_agent.name: [r"translat\w*", r"\bin (urdu|hindi|arabic|french|japanese|english)\b"],
+    },
+    embed=get_embedder(os.getenv("PREROUTER_EMBED")),
+    examples={
+        math_tutor_agent.name: ["How do I solve this equation?", "What is the area of a circle?", "Simplify 3/4 + 1/8"],
+        history_tutor_agent.name: ["Who was the first Mughal emperor?", "What caused World War 1?", "When did Rome fall?"],
+    },
+    app="05-tools",
+)
+
+# Speculation (opt-in, SPECULATE_K=1 or 2): when the pre-router leaves the choice to triage,
+# the k likeliest tutors start at the same time as triage. The one triage hands off to keeps
+# streaming, the others are cancelled; SPECULATE_BUDGET_CHARS caps what a candidate may stream.
+SPECULATE_K = int(os.getenv("SPECULATE_K", "0"))
+speculator = Speculator(
+    triage_agent,
+    k=SPECULATE_K,
+    budget_chars=int(os.getenv("SPECULATE_BUDGET_CHARS", "2000")),
+    rank=router.rank,
+    app="05-tools",
+) if SPECULATE_K else None
 #step5: Chainlit integration
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+    # TTFT / inter-token gap / tokens-per-second metrics for scraping at :METRICS_PORT/metrics
+    if os.getenv("METRICS_PORT"):
+        start_metrics_server(int(os.getenv("METRICS_PORT")))
+
 @cl.on_chat_start
 async def on_chat_start():
-    cl.user_session.set("history", [])
+    sessions.get(cl.context.session.thread_id)  # loads a resumed thread's history from the store
     await cl.Message(content="🚀 **🚨 HISTORY & MATH TUTOR 🚨** 🚀 \n\n Welcome! How can I assist you today?").send()
 
 @cl.on_message
 async def handle_message(message:cl.Message):
   
-    history = cl.user_session.get("history")
+    # Kept in RAM until the reply is stored, so the session can't be reloaded mid-turn
+    with sessions.turn(cl.context.session.thread_id) as history:
+        msg = cl.Message(content="")
+        await msg.send()
 
-    msg = cl.Message(content="")
-    await msg.send()
+        history.add_user(message.content)
+    # Run the Triage Agent (or the tutor the pre-router picked) with the user's message and history with streaming enabled
+        route = await router.route(message.content)
+        if route.skipped_triage or speculator is None:
+            result = Runner.run_streamed(route.agent, history.to_input_items(), run_config=config)
+        else:
+            result = await speculator.run_streamed(history.to_input_items(), text=message.content, run_config=config)
+        timed = TimedStream(result, app="05-tools")
 
-    history.append({"role":"user", "content":message.content})
-# Run the Triage Agent with the user's message and history with streaming enabled
-    result = Runner.run_streamed(triage_agent, history, run_config=config)
+    # Stream the response back to the user
+        # Deltas are batched into one websocket frame per ~64 chars / 30 ms instead of one per token
+        async with TokenCoalescer(msg.stream_token) as stream:
+            async for event in timed:
+                if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
+                    await stream.push(event.data.delta)
 
-# Stream the response back to the user
-    async for event in result.stream_events():
-        if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
-            token = event.data.delta
-            await msg.stream_token(token)
+    # Append the final output to the history
+        history.add_assistant(result.final_output)
+        router.observe(timed)  # measures the triage hop the pre-router saves
 
-# Append the final output to the history
-    history.append({"role":"assistant", "content":result.final_output})
-    cl.user_session.set("history", history)
-    
+        # Now that the reply is out, fold old turns into the summary in the background
+        history.summarize_in_background()
@@ -3,29 +3,24 @@
 import chainlit as cl
 import os
 import asyncio
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from contextlib import AsyncExitStack
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.token_stream import TokenCoalescer
+from shared.stream_metrics import TimedStream, start_metrics_server
+from shared.pre_router import PreRouter, get_embedder
+from shared.fan_out import fan_out, merge_translations, requested_languages
+from shared.context_window import ContextWindow
+from shared.language_id import precheck, with_source_note
 
 load_dotenv()
 #step1
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-#step2
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_config()
 #step3: multi agents
 urdu_translator_agent = Agent(
     name="Urdu Translator",
@@ -60,30 +55,112 @@ triage_agent = Agent(
     "If multi language translation is asked by the user then you will give task to each relevent agent.",
     handoffs=[hindi_translator_agent, arabic_translator_agent, japanese_translator_agent, french_translator_agent]
 )
+
+# Multi-language requests skip triage and run every translator at once (see handle_message)
+TRANSLATORS = {
+    "Urdu": urdu_translator_agent,
+    "Hindi": hindi_translator_agent,
+    "Arabic": arabic_translator_agent,
+    "Japanese": japanese_translator_agent,
+    "French": french_translator_agent,
+}
+
+# Pre-router: a message asking for exactly one target language ("to French", "into Hindi",
+# the same instruction requested_languages() looks for) goes straight to that translator,
+# skipping the triage round-trip. A message that only mentions a language ("The French
+# team won") or asks for several still goes through triage.
+# PREROUTER_EMBED=local|gemini also enables the nearest-centroid classifier.
+router = PreRouter(
+    triage_agent,
+    rules={
+        agent.name: [rf"\b(?:to|into)\s+{language}\b"]
+        for language, agent in TRANSLATORS.items() if agent in triage_agent.handoffs
+    },
+    embed=get_embedder(os.getenv("PREROUTER_EMBED")),
+    app="06-handoffs",
+)
 #step5`
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+    # TTFT / inter-token gap / tokens-per-second metrics for scraping at :METRICS_PORT/metrics
+    if os.getenv("METRICS_PORT"):
+        start_metrics_server(int(os.getenv("METRICS_PORT")))
+
 @cl.on_chat_start
 async def on_chat_start():
-    cl.user_session.set("history", [])
+    cl.user_session.set("history", ContextWindow())
     await cl.Message(content="Welcome! How can I assist you today?").send()
 
 @cl.on_message
 async def handle_message(message: cl.Message):
     history = cl.user_session.get("history")
-    
+    history.add_user(message.content)
+
+    # Nothing to translate (numbers, URLs, emoji): sent back as it is, without a model run
+    detection = precheck(message.content, app="06-handoffs")
+    if detection.skip:
+        await cl.Message(content=message.content).send()
+        history.add_assistant(message.content)
+        return
+
+    # Several target languages asked for ("to French and Arabic"): translate into all of them
+    # concurrently, one message per language. Merely naming languages does not count
+    languages = requested_languages(message.content, TRANSLATORS)
+    if len(languages) > 1:
+        await translate_to_many(history, languages)
+        return
+
     msg = cl.Message(content="")
     await msg.send()
 
-    history.append({"role": "user", "content": message.content})
-    # Run the agent with streaming enabled
-    result = Runner.run_streamed(triage_agent, history, run_config=config)
+    # Start at the translator when the pre-router is sure, otherwise at the triage agent
+    route = await router.route(message.content)
+    items = history.to_input_items()
+    if route.agent is triage_agent:
+        items = with_source_note(items, detection)  # the source language, detected locally
+    result = Runner.run_streamed(route.agent, items, run_config=config)
+    timed = TimedStream(result, app="06-handoffs")
 
-        # Stream the response token by token
-    async for event in result.stream_events():
-        if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
-            token = event.data.delta
-            await msg.stream_token(token)
+    # Deltas are batched into one websocket frame per ~64 chars / 30 ms instead of one per token
+    async with TokenCoalescer(msg.stream_token) as stream:
+        async for event in timed:
+            if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
+                await stream.push(event.data.delta)
      
-    history.append({"role": "assistant", "content": result.final_output})
+    history.add_assistant(result.final_output)
     cl.user_session.set("history", history)
+    router.observe(timed)  # measures the triage hop the pre-router saves
+
+    # Now that the reply is out, fold old turns into the summary in the background
+    history.summarize_in_background()
+
+
+async def translate_to_many(history, languages):
+    panels = {language: cl.Message(content=f"**{language}:**\n") for language in languages}
+    for panel in panels.values():
+        await panel.send()
+
+    async with AsyncExitStack() as stack:
+        streams = {
+            language: await stack.enter_async_context(TokenCoalescer(panel.stream_token))
+            for language, panel in panels.items()
+        }
+
+        async def show(language, delta):
+            await streams[language].push(delta)
+
+        outputs = await fan_out(
+            history.to_input_items(),
+            {language: TRANSLATORS[language] for language in languages},
+            on_delta=show,
+            app="06-handoffs",
+            run_config=config,
+        )
 
+    for panel in panels.values():
+        await panel.update()
+    history.add_assistant(merge_translations(outputs))
+    history.summarize_in_background()
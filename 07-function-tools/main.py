@@ -1,43 +1,47 @@
-import os 
 import asyncio
 import chainlit as cl
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
 from agents.tool import function_tool
+import sys
+from pathlib import Path
 
-load_dotenv()
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, get_model, warm_up
+from shared.context_window import ContextWindow
+from shared.agent_registry import AgentRegistry
 
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+load_dotenv()
 
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)    
+config = get_config()
+model = get_model()
 
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
+# One prebuilt assistant for the whole app; only the history is kept per session
+agents = AgentRegistry()
 
 @function_tool("get_weather")
 def get_weather(location: str, unit: str = "C") -> str:
     """Dummy weather tool"""
     return f"The weather in {location} is 22 degrees {unit}"
 
-@cl.on_chat_start
-async def on_chat_start():
-    
-    assistant = Agent(
+@agents.register("weather")
+def weather_assistant():
+    return Agent(
         name="Weather Assistant",
         instructions="You respond to weather queries. You also respond to tell any location within a specific area. Show temperature in celsius and fahrenheit. Show suggestion to show temperature of next 24 hours. Show map of the area.",
         tools=[get_weather],
         model=model
     )
 
-    cl.user_session.set("assistant", assistant)
-    cl.user_session.set("history", [])
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+    agents.prebuild()
+
+@cl.on_chat_start
+async def on_chat_start():
+    cl.user_session.set("history", ContextWindow())
 
     await cl.Message(content="⛅☔ Check weather by Location. 🌍").send()
 
@@ -45,16 +49,22 @@ async def on_chat_start():
 async def on_message(message: cl.Message):
     msg = await cl.Message(content="Thinking...").send()
 
-    assistant = cl.user_session.get("assistant")
-    history = cl.user_session.get("history") or []
+    history = cl.user_session.get("history")
+    if history is None:  # not `or`: an empty history is falsy (it has a length)
+        history = ContextWindow()
 
-    history.append({"role": "user", "content": message.content})
+    history.add_user(message.content)
 
     result = await Runner.run(
-        starting_agent=assistant,
-        input=history,)
+        starting_agent=agents.get("weather"),
+        input=history.to_input_items(),
+        run_config=config,  # the shared config: pooled client, tracing disabled
+    )
 
-    history.append({"role": "assistant", "content": result.final_output})
+    history.add_assistant(result.final_output)
     cl.user_session.set("history", history)
     msg.content = result.final_output
     await msg.update()
+
+    # Now that the reply is out, fold old turns into the summary in the background
+    history.summarize_in_background()
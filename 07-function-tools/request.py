@@ -1,70 +1,62 @@
-import os
 import asyncio
-import requests
 from dotenv import load_dotenv
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner, RunConfig
+from agents import Agent, Runner
 from agents.tool import function_tool
 import chainlit as cl
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, get_model, warm_up
+from shared.context_window import ContextWindow
+from shared.agent_registry import AgentRegistry
+from shared.async_tools import bounded, warm_up_http_client
+from shared.weather_client import WeatherClient
 
 # Load environment variables from .env file
 load_dotenv()
+config = get_config()
+
+# Prebuilt agents shared by all chat sessions
+agents = AgentRegistry()
+
+# Cached weather lookups shared by all chat sessions (same city within 10 minutes = no API call)
+weather = WeatherClient(app="07-function-tools")
 
 # Define a tool function to fetch weather by city
+# (async on the shared httpx pool, so a slow weather API never blocks other chats)
 @function_tool
-def get_weather(city: str) -> str:
+@bounded(timeout=5, max_concurrency=8)
+async def get_weather(city: str) -> str:
     """Fetches the current weather for a given city."""
     try:
-        response = requests.get(
-            f"http://api.weatherapi.com/v1/current.json?key=8e3aca2b91dc4342a1162608252604&q={city}",
-            timeout=2
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = await weather.current(city)
         return f"The current weather in {city} is {data['current']['temp_c']}°C with {data['current']['condition']['text']}."
     except Exception as e:
         return f"Sorry, I couldn't fetch the weather data for {city}. Please try again later."
 
-# Chainlit chat start handler
-@cl.on_chat_start
-async def start():
-    MODEL_NAME = "gemini-2.0-flash"
-    API_KEY = os.getenv("GEMINI_API_KEY")
-
-    if not API_KEY:
-        raise ValueError("GEMINI_API_KEY is not set in the environment variables.")
-
-    # Setup external Gemini-compatible OpenAI client
-    external_client = AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-
-    # Define the model
-    model = OpenAIChatCompletionsModel(
-        model=MODEL_NAME,
-        openai_client=external_client
-    )
-
-    # Optional config for tracing
-    config = RunConfig(
-        model=model,
-        model_provider=external_client,
-        tracing_disabled=True
-    )
-
-    # Set up conversation history
-    cl.user_session.set("history", [])
-
-    # Create the weather assistant agent
-    assistant = Agent(
+# The weather assistant agent, built once and shared by every session
+@agents.register("weather")
+def weather_assistant():
+    return Agent(
         name="Weather Assistant",
         instructions="You are a helpful assistant who answers weather-related questions using tools.",
-        model=model,
+        model=get_model(),
         tools=[get_weather]
     )
 
-    # Store the agent in user session
-    cl.user_session.set("assistant", assistant)
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+    await warm_up_http_client()  # the weather tool's client, certificates loaded off the loop
+    agents.prebuild()
+
+# Chainlit chat start handler
+@cl.on_chat_start
+async def start():
+    # Set up conversation history (the only per-session state)
+    cl.user_session.set("history", ContextWindow())
 
     # Send welcome message
     await cl.Message(content="⛅☔ Welcome! Ask me about the weather in any city. 🌍").send()
@@ -75,21 +67,23 @@ async def main(message: cl.Message):
     # Display interim thinking message
     msg = await cl.Message(content="Thinking...").send()
 
-    # Get the assistant and conversation history
-    assistant = cl.user_session.get("assistant")
-    history = cl.user_session.get("history") or []
+    # Get the conversation history
+    history = cl.user_session.get("history")
+    if history is None:  # not `or`: an empty history is falsy (it has a length)
+        history = ContextWindow()
 
     # Add the user's message to history
-    history.append({"role": "user", "content": message.content})
+    history.add_user(message.content)
 
-    # Run the assistant with full history
+    # Run the assistant with the summary + recent turns (within the token budget)
     result = await Runner.run(
-        starting_agent=assistant,
-        input=history,
+        starting_agent=agents.get("weather"),
+        input=history.to_input_items(),
+        run_config=config,  # the shared config: pooled client, tracing disabled
     )
 
     # Add the assistant's response to history
-    history.append({"role": "assistant", "content": result.final_output})
+    history.add_assistant(result.final_output)
 
     # Update stored history
     cl.user_session.set("history", history)
@@ -97,3 +91,6 @@ async def main(message: cl.Message):
     # Update the message with assistant response
     msg.content = result.final_output
     await msg.update()
+
+    # Now that the reply is out, fold old turns into the summary in the background
+    history.summarize_in_background()
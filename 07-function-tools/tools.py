@@ -1,13 +1,22 @@
-import os
 import asyncio
 from dotenv import load_dotenv
 import chainlit as cl
-import requests
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner, RunConfig
+from agents import Agent, Runner
 from agents.tool import function_tool
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, get_model, warm_up
+from shared.agent_registry import AgentRegistry
+from shared.context_window import ContextWindow
 
 # Load environment variables
 load_dotenv()
+config = get_config()
+
+# Prebuilt agents shared by all chat sessions
+agents = AgentRegistry()
 
 # Dummy weather tool
 @function_tool
@@ -15,44 +24,27 @@ def get_weather(city: str):
     """Returns dummy weather info for a city."""
     return f"The weather in {city} is sunny with a temperature of 25°C."
 
-# On chat start
-@cl.on_chat_start
-async def start():
-    MODEL_NAME = "gemini-2.0-flash"
-    API_KEY = os.getenv("GEMINI_API_KEY")
-
-    if not API_KEY:
-        raise ValueError("GEMINI_API_KEY is not set in the environment variables.")
-
-    # Setup Gemini-compatible OpenAI client
-    external_client = AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-
-    model = OpenAIChatCompletionsModel(
-        model=MODEL_NAME,
-        openai_client=external_client
-    )
-
-    # Optional config (can be used for tracing/debugging)
-    config = RunConfig(
-        model=model,
-        model_provider=external_client,
-        tracing_disabled=True
-    )
-
-    # Create assistant agent
-    assistant = Agent(
+# Assistant agent, built once and shared by every session
+@agents.register("weather")
+def weather_assistant():
+    return Agent(
         name="Weather Assistant",
         instructions="You respond to weather queries.",
-        model=model,
+        model=get_model(),
         tools=[get_weather]
     )
 
-    # Store in session
-    cl.user_session.set("assistant", assistant)
-    cl.user_session.set("history", [])
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+    agents.prebuild()
+
+# On chat start
+@cl.on_chat_start
+async def start():
+    # Only the history is kept per session
+    cl.user_session.set("history", ContextWindow())
 
     await cl.Message(content="⛅☔ Check weather by Location. 🌍").send()
 
@@ -61,5 +53,21 @@ async def start():
 async def handle_message(message: cl.Message):
     msg = await cl.Message(content="Thinking...").send()
 
-    assistant = cl.user_session.get("assistant")
-    history = cl.user_session.get_
+    history = cl.user_session.get("history")
+    if history is None:  # not `or`: an empty history is falsy (it has a length)
+        history = ContextWindow()
+    history.add_user(message.content)
+
+    result = await Runner.run(
+        starting_agent=agents.get("weather"),
+        input=history.to_input_items(),
+        run_config=config,  # the shared config: pooled client, tracing disabled
+    )
+
+    history.add_assistant(result.final_output)
+    cl.user_session.set("history", history)
+    msg.content = result.final_output
+    await msg.update()
+
+    # Now that the reply is out, fold old turns into the summary in the background
+    history.summarize_in_background()
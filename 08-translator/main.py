@@ -1,93 +1,62 @@
 import streamlit as st
-import os
-import asyncio
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
 from pathlib import Path
 import base64
+import sys
+import os
 
+ROOT_DIR = str(Path(__file__).resolve().parents[1])  # repo root, for the shared/ package
+if ROOT_DIR not in sys.path:  # Streamlit re-executes this script on every rerun
+    sys.path.append(ROOT_DIR)
+from shared.model_client import get_config, warm_up
+from shared.background_loop import run, stream, stream_updates, submit
+from shared.token_stream import ThrottledPlaceholder
+from shared.fan_out import fan_out, merge_translations, requested_languages
+from shared.multi_translate import SINGLE_CALL_ENABLED, translate_all, use_single_call
+from shared.translation_memory import TranslationMemory, needs_translation, split_segments
+from shared.document_translation import DEFAULT_CHUNK_TOKENS, chunk_document, translate_document
+from shared.context_window import estimate_tokens
+from shared.agent_registry import AgentRegistry
+from shared.language_id import precheck, with_source_note
 
 load_dotenv()
 
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+config = get_config()
+# Runs go to one long-lived event loop, so the Gemini connection stays open across clicks
+submit(warm_up())  # no-op after the first run
 
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+# Step 3: Translator agents, one per language. Registered here, built on first use and
+# shared by every session of this server (st.cache_resource survives script reruns)
+LANGUAGES = ["Urdu", "Hindi", "Arabic", "Japanese", "French", "English", "Spanish", "German", "Chinese", "Italian"]
+AUTO = "Auto (from message)"
 
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
+def translator(language):
+    return Agent(
+        name=f"{language} Translator",
+        handoff_description=f"Specialist agent for translating messages to {language}",
+        instructions=f"You translate the user's message to {language}. Provide accurate translations and maintain the original meaning."
+    )
 
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+@st.cache_resource
+def get_agents():
+    agents = AgentRegistry()
+    for language in LANGUAGES:
+        agents.register(language)(lambda language=language: translator(language))
 
-# Step 3: Define the Translator Agents
-urdu_translator_agent = Agent(
-    name="Urdu Translator",
-    handoff_description="Specialist agent for translating messages to Urdu",
-    instructions="You translate the user's message to Urdu. Provide accurate translations and maintain the original meaning."
-)
-hindi_translator_agent = Agent(
-    name="Hindi Translator",
-    handoff_description="Specialist agent for translating messages to Hindi",
-    instructions="You translate the user's message to Hindi. Provide accurate translations and maintain the original meaning."
-)
-arabic_translator_agent = Agent(
-    name="Arabic Translator",
-    handoff_description="Specialist agent for translating messages to Arabic",
-    instructions="You translate the user's message to Arabic. Provide accurate translations and maintain the original meaning."
-)
-japanese_translator_agent = Agent(
-    name="Japanese Translator",
-    handoff_description="Specialist agent for translating messages to Japanese",
-    instructions="You translate the user's message to Japanese. Provide accurate translations and maintain the original meaning."
-)
-french_translator_agent = Agent(
-    name="French Translator",
-    handoff_description="Specialist agent for translating messages to French",
-    instructions="You translate the user's message to French. Provide accurate translations and maintain the original meaning."
-)
-english_translator_agent = Agent(
-    name="English Translator",
-    handoff_description="Specialist agent for translating messages to English",
-    instructions="You translate the user's message to English. Provide accurate translations and maintain the original meaning."
-)
-spanish_translator_agent = Agent(
-    name="Spanish Translator",
-    handoff_description="Specialist agent for translating messages to Spanish",
-    instructions="You translate the user's message to Spanish. Provide accurate translations and maintain the original meaning."
-)
-german_translator_agent = Agent(
-    name="German Translator",
-    handoff_description="Specialist agent for translating messages to German",
-    instructions="You translate the user's message to German. Provide accurate translations and maintain the original meaning."
-)
-chinese_translator_agent = Agent(
-    name="Chinese Translator",
-    handoff_description="Specialist agent for translating messages to Chinese",
-    instructions="You translate the user's message to Chinese. Provide accurate translations and maintain the original meaning."
-)
-italian_translator_agent = Agent(
-    name="Italian Translator",
-    handoff_description="Specialist agent for translating messages to Italian",
-    instructions="You translate the user's message to Italian. Provide accurate translations and maintain the original meaning."
-)
+    # Step 4: Triage Agent, only for free-form requests where no target language is picked
+    @agents.register("Triage")
+    def triage_agent():
+        return Agent(
+            name="Triage Agent",
+            instructions="You determine which agent to use based on the user's request for translation."
+            "If multi-language translation is asked by the user then you will give tasks to each relevant agent.",
+            handoffs=[agents.get(language) for language in LANGUAGES]
+        )
 
-# Step 4: Triage Agent
-triage_agent = Agent(
-    name="Triage Agent",
-    instructions="You determine which agent to use based on the user's request for translation."
-    "If multi-language translation is asked by the user then you will give tasks to each relevant agent.",
-    handoffs=[hindi_translator_agent, arabic_translator_agent, japanese_translator_agent, french_translator_agent, english_translator_agent, spanish_translator_agent, german_translator_agent, chinese_translator_agent, urdu_translator_agent, italian_translator_agent]
-)
+    return agents
+
+agents = get_agents()
 
 # Step 5: Streamlit UI with title, Image and Stylish Button
 st.set_page_config(page_title="Multilingual Translation Assistant", page_icon="🤖", layout="wide")
@@ -159,57 +128,149 @@ st.markdown(
 # Sidebar for language selection
 selected_language = st.sidebar.selectbox(
     "Select Language for Translation",
-    ["Urdu", "Hindi", "Arabic", "Japanese", "French", "English", "Spanish", "German", "Chinese"]
+    [*LANGUAGES, AUTO]
+)
+# Several languages in one structured call: fewer input tokens, but slower and nothing streams
+single_call = selected_language == AUTO and st.sidebar.toggle(
+    "Fewer tokens for short multi-language requests (no streaming)",
+    value=SINGLE_CALL_ENABLED,
 )
 # Input area for user message
 message = st.text_area("Enter your message for translation:")
 
-# Function to handle translation asynchronously
-async def handle_translation(message, selected_language):
-    # Set up the history
-    history = [{"role": "user", "content": message}]
+# Sentence-level translation memory (SQLite), shared by every session of this server:
+# repeated sentences are served from it and only new ones go to the translator
+@st.cache_resource
+def get_translation_memory():
+    return TranslationMemory(os.getenv("TRANSLATION_MEMORY_DB", "translation_memory.sqlite3"), app="08-translator")
 
-    # Select the correct agent based on the language
-    if selected_language == "Urdu":
-        selected_agent = urdu_translator_agent
-    elif selected_language == "Hindi":
-        selected_agent = hindi_translator_agent
-    elif selected_language == "Arabic":
-        selected_agent = arabic_translator_agent
-    elif selected_language == "Japanese":
-        selected_agent = japanese_translator_agent
-    elif selected_language == "French":
-        selected_agent = french_translator_agent
-    elif selected_language == "English":
-        selected_agent = triage_agent
-    elif selected_language == "Spanish":
-        selected_agent = triage_agent
-    elif selected_language == "German":
-        selected_agent = triage_agent
-    elif selected_language == "Chinese":
-        selected_agent = triage_agent       
+memory = get_translation_memory()
+
+# Direct dispatch: the target language is known from the sidebar, so its translator runs
+# without a triage hop; triage only handles "Auto" (the message says what it wants)
+def select_agent(selected_language):
+    if selected_language in agents:
+        return agents.get(selected_language)
+    return agents.get("Triage")
+
+# Streams the translation deltas (runs on the background event loop)
+async def translation_deltas(message, selected_agent, detection=None):
+    # Set up the history (plus the locally detected source language, for triage)
+    history = [{"role": "user", "content": message}]
+    if detection:
+        history = with_source_note(history, detection)
 
     # Run the agent with streaming enabled
     result = Runner.run_streamed(selected_agent, history, run_config=config)
 
-    # Stream the response token by token
-    translated_text = ""
     async for event in result.stream_events():
         if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
-            token = event.data.delta
-            translated_text += token
-            st.text(translated_text)  # Display the translation as it comes in
+            yield event.data.delta
+
+# Show the translation as it comes in; Streamlit calls stay in the script thread
+def handle_translation(message, selected_language, detection=None):
+    selected_agent = select_agent(selected_language)
+
+    if selected_language not in agents:
+        # Triage: the target language is in the message itself, so it goes whole (no
+        # memory, no chunks) and the handoff picks the translator
+        with ThrottledPlaceholder(st.empty(), method="text") as output:
+            for token in stream(translation_deltas(message, selected_agent, detection)):
+                output.push(token)
+        return output.text
+
+    if estimate_tokens(message) > DEFAULT_CHUNK_TOKENS:
+        # Long document: chunks are translated in parallel and shown in order as soon as
+        # every chunk before them is done (DOC_CHUNK_TOKENS, DOC_CONCURRENCY)
+        st.caption(f"📄 Long text: translating {len(chunk_document(message))} parts in parallel")
+        with ThrottledPlaceholder(st.empty(), method="text") as output:
+            for piece in stream(translate_document(message, selected_agent, run_config=config)):
+                output.push(piece)
+        return output.text
+
+    sentences = [segment for segment, _ in split_segments(message) if needs_translation(segment)]
+
+    if len(sentences) > 1 or memory.get(message, selected_agent, selected_language) is not None:
+        # Several sentences (or a known one): translate only those missing from the memory
+        with st.spinner("Translating new sentences..."):
+            result = run(memory.translate(message, selected_agent, selected_language, run_config=config))
+        st.text(result.text)
+        st.caption(f"♻️ {result.hits}/{result.segments} sentences from translation memory "
+                   f"(~{result.tokens_saved} tokens saved)")
+        return result.text
+
+    # A single new sentence: stream it into one placeholder updated in place (at most
+    # every STREAM_RENDER_MS), then keep it in the memory
+    with ThrottledPlaceholder(st.empty(), method="text") as output:
+        for token in stream(translation_deltas(message, selected_agent)):
+            output.push(token)
+    memory.remember(message, selected_agent, selected_language, output.text)
+
+    return output.text
+
+# Translate into several languages concurrently, each streaming into its own column
+def handle_fan_out(message, languages):
+    outputs = {}
+    for column, language in zip(st.columns(len(languages)), languages):
+        column.subheader(language)
+        outputs[language] = ThrottledPlaceholder(column.empty())
 
-    return translated_text
+    # fan_out runs on the background loop and emits (language, delta) back to this thread
+    updates = stream_updates(lambda emit: fan_out(
+        message,
+        {language: agents.get(language) for language in languages},
+        on_delta=emit,
+        app="08-translator",
+        run_config=config,
+    ))
+    try:
+        for language, delta in updates:
+            outputs[language].push(delta)
+    finally:
+        for output in outputs.values():
+            output.flush()
+    return merge_translations(updates.result)
 
 # When user presses the 'Translate' button
 if st.button('Translate'):
     if message:
-        st.write(f"Translating message to {selected_language}...")
-        st.subheader(f"Translation to {selected_language}:")
+        # Target languages the message asks for ("...to French, Arabic and Japanese"); they are
+        # only used with "Auto", a language picked in the sidebar always wins
+        requested = requested_languages(message, LANGUAGES)
+        if selected_language != AUTO and set(requested) - {selected_language}:
+            st.info(f"The message asks for {', '.join(requested)}; translating to {selected_language} as selected. "
+                    f"Pick \"{AUTO}\" in the sidebar to use the languages in the message.")
+        languages = requested if selected_language == AUTO else [selected_language]
+        if len(languages) > 1 and use_single_call(message, enabled=single_call):
+            # Opted in and short: one structured call returns every language (fewer requests and input tokens)
+            with st.spinner(f"Translating message to {', '.join(languages)}..."):
+                outputs = run(translate_all(message, languages, run_config=config))
+            for column, (language, text) in zip(st.columns(len(languages)), outputs.items()):
+                column.subheader(language)
+                column.markdown(text)
+            translated_text = merge_translations(outputs)
+        elif len(languages) > 1:
+            st.write(f"Translating message to {', '.join(languages)}...")
+            translated_text = handle_fan_out(message, languages)
+        else:
+            if languages:
+                selected_language = languages[0]  # picked, or the one the message asks for: no triage needed
+            # Local language check (well under a millisecond): text already in the target
+            # language, or with nothing to translate, is shown as it is without a model run
+            detection = precheck(message, selected_language if selected_language in agents else None,
+                                 app="08-translator")
+            if detection.skip:
+                st.subheader(f"Translation to {selected_language}:")
+                st.text(message)
+                st.caption("✅ Nothing to translate" if detection.skip == "no_text"
+                           else f"✅ Already in {detection.language}")
+                translated_text = message
+            else:
+                st.write(f"Translating message to {selected_language}...")
+                st.subheader(f"Translation to {selected_language}:")
 
-        # Run the async function in the event loop
-        translated_text = asyncio.run(handle_translation(message, selected_language)) 
+                # Stream the translation from the background event loop
+                translated_text = handle_translation(message, selected_language, detection)
     else:
         st.error("Please enter a message to translate.")
 
@@ -1,69 +1,91 @@
 # weather_app.py
 import pydeck as pdk 
-import os
-import requests
-import asyncio
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 from dotenv import load_dotenv
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from agents.tool import function_tool
 from io import StringIO
 import base64
+import sys
+from pathlib import Path
+
+ROOT_DIR = str(Path(__file__).resolve().parents[1])  # repo root, for the shared/ package
+if ROOT_DIR not in sys.path:  # Streamlit re-executes this script on every rerun
+    sys.path.append(ROOT_DIR)
+from shared.model_client import get_config, warm_up
+from shared.background_loop import run, submit
+from shared.async_tools import bounded, warm_up_http_client
+from shared.weather_client import WeatherClient, normalize_city
+from shared.weather_data import WeatherData
+from shared.weather_board import WeatherBoard, convert_units, parse_cities, summarize
 
 # Load environment variables
 load_dotenv()
 
+# Runs go to one long-lived event loop, so the Gemini and weather API connections stay open across clicks
+submit(warm_up())  # no-op after the first run
+submit(warm_up_http_client())  # weather API client, certificates loaded off the loop
+
+# One weather data layer for the agent's tool and the UI: one forecast fetch per city
+# per TTL, shared by every session of this Streamlit server
+@st.cache_resource
+def get_weather_data():
+    return WeatherData(WeatherClient(app="09-weather-api-app"))
+
+weather_data = get_weather_data()  # looked up here: the tool runs on the background loop's thread
+
 # --- Tool Function ---
+# Reads the same cached forecast as the UI, so it usually answers without a network hop
 @function_tool
-def get_weather(city: str) -> str:
+@bounded(timeout=5, max_concurrency=8)
+async def get_weather(city: str) -> str:
     """Fetches the current weather for a given city."""
     try:
-        response = requests.get(
-            f"http://api.weatherapi.com/v1/forecast.json?key=8e3aca2b91dc4342a1162608252604&q={city}&days=7&aqi=no&alerts=no",
-            timeout=3
-        )
-        response.raise_for_status()
-        data = response.json()
-        current = data['current']
-        return f"The current weather in {city} is {current['temp_c']}°C with {current['condition']['text']}."
+        forecast = await weather_data.forecast(city)
+        return forecast.describe_current(city)
     except Exception:
         return f"Sorry, I couldn't fetch the weather data for {city}. Please try again later."
 
-@st.cache_data(ttl=600)
-def fetch_weather_data(city):
+def load_forecast(city):
     try:
-        res = requests.get(
-            f"http://api.weatherapi.com/v1/forecast.json?key=8e3aca2b91dc4342a1162608252604&q={city}&days=7&aqi=no&alerts=no",
-            timeout=3
-        )
-        res.raise_for_status()
-        forecast_data = res.json()
-        return forecast_data['forecast']['forecastday'], forecast_data['location'], forecast_data['current']
+        return run(weather_data.forecast(city))
     except Exception:
-        return [], {}, {}
+        return None
 
 def download_weather_details(text, filename="weather_report.txt"):
     b64 = base64.b64encode(text.encode()).decode()
     href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">📥 Download Weather Report</a>'
     return href
 
+# --- Derived data, cached across reruns ---
+# Toggling "Show hourly forecast" or switching the unit reruns the whole script. The
+# parsed hourly table is kept per (city, data timestamp) and the chart per (city, data
+# timestamp, unit) instead of being rebuilt; a new forecast has a new timestamp. The
+# hours are passed as _hours so Streamlit doesn't hash them for the key.
+@st.cache_data(max_entries=64, show_spinner=False)
+def hourly_frame(city, updated, _hours):
+    hours_df = pd.DataFrame(_hours, columns=['time', 'temp_c'])
+    hours_df['time'] = pd.to_datetime(hours_df['time']).dt.strftime('%I:%M %p')
+    hours_df['temp_f'] = hours_df['temp_c'] * 9/5 + 32  # one column op, both units ready
+    return hours_df
+
+@st.cache_resource(max_entries=64, show_spinner=False)  # one figure object, read-only, shared
+def hourly_figure(city, updated, unit, _hours):
+    hours_df = hourly_frame(city, updated, _hours)
+    hours_df['temp'] = hours_df['temp_c'] if unit == "Celsius" else hours_df['temp_f']
+
+    fig = px.line(hours_df, x='time', y='temp', title='Hourly Temperature', markers=True)
+    fig.update_traces(line=dict(color='skyblue'), marker=dict(size=6))
+    return fig
+
 # --- Agent Initialization ---
 @st.cache_resource
 def init_agent():
-    MODEL_NAME = "gemini-2.0-flash"
-    API_KEY = os.getenv("GEMINI_API_KEY")
-
-    external_client = AsyncOpenAI(
-        api_key=API_KEY, base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-    model = OpenAIChatCompletionsModel(model=MODEL_NAME, openai_client=external_client)
-
     return Agent(
         name="Weather Assistant",
         instructions="You are a helpful assistant who gives weather-related advice for the day.",
-        model=model,
         tools=[get_weather]
     )
 
@@ -116,40 +138,108 @@ st.markdown("""
 st.title("🌦️ Weather Assistant")
 st.markdown("Get the current weather and forecast for your favorite city.")
 
+DEFAULT_CITIES = "Karachi, Lahore, Islamabad, Peshawar, Quetta, Multan, Dubai, Riyadh, London, New York, Tokyo, Sydney"
+
 # --- Sidebar ---
 with st.sidebar:
-    city_input = st.text_input("📍 Enter city name", value="Karachi")
-    ask_button = st.button("🔍 Check Weather")
-    show_hourly = st.checkbox("🕒 Show hourly forecast")
+    mode = st.radio("🗺️ Mode", ["Single city", "Multi-city dashboard"])
+    if mode == "Single city":
+        city_input = st.text_input("📍 Enter city name", value="Karachi")
+        ask_button = st.button("🔍 Check Weather")
+        show_hourly = st.checkbox("🕒 Show hourly forecast")
+    else:
+        cities_input = st.text_area("🏙️ Cities (comma or line separated)", value=DEFAULT_CITIES)
     unit = st.radio("🌡️ Temperature Unit", ["Celsius", "Fahrenheit"])
 
+# --- Multi-city dashboard ---
+# All cities are fetched concurrently into one table. "🔄 Refresh" asks the API again
+# (past the cache) and reruns only the panel below, so the map is not redrawn; cards
+# are drawn only for the cities whose data changed. A unit or city change reruns it all.
+def show_dashboard(cities):
+    if "weather_board" not in st.session_state:
+        st.session_state.weather_board = WeatherBoard(weather_data)
+    update = st.session_state.get("board_update")
+    if update is None or update.cities != cities:
+        with st.spinner(f"⛅ Fetching {len(cities)} cities..."):
+            st.session_state.board_update = run(st.session_state.weather_board.refresh(cities))
+
+    dashboard_panel(cities)
+    table = st.session_state.board_update.table
+    if not table.empty:
+        st.map(table[["lat", "lon"]].dropna())
+
+@st.fragment
+def dashboard_panel(cities):
+    if st.button("🔄 Refresh"):
+        with st.spinner(f"⛅ Fetching {len(cities)} cities..."):
+            st.session_state.board_update = run(st.session_state.weather_board.refresh(cities, force=True))
+    update = st.session_state.board_update
+
+    table = update.table
+    st.subheader(f"🗺️ {len(table)} Cities")
+    st.caption(f"Fetched in {update.seconds:.1f}s · "
+               + ("first load" if update.first else f"{len(update.changed)} changed since the last refresh"))
+    if update.errors:
+        st.warning("Couldn't fetch: " + ", ".join(update.errors))
+    if table.empty:
+        return
+
+    summary = summarize(table)
+    to_unit = (lambda c: c) if unit == "Celsius" else (lambda c: c * 9/5 + 32)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Average", f"{to_unit(summary['mean_temp_c']):.1f}°{unit[0]}")
+    col2.metric(f"Hottest: {summary['hottest']}", f"{to_unit(table.at[summary['hottest'], 'temp_c']):.1f}°{unit[0]}")
+    col3.metric(f"Coldest: {summary['coldest']}", f"{to_unit(table.at[summary['coldest'], 'temp_c']):.1f}°{unit[0]}")
+    col4.metric("Rain likely", f"{summary['rain_likely']} cities")
+
+    shown = convert_units(table, unit)
+    shown.insert(0, "changed", shown.index.isin(update.changed))
+    st.dataframe(shown.drop(columns=["lat", "lon"]), use_container_width=True)
+
+    if update.changed and not update.first:
+        st.subheader("🔔 Changed since the last refresh")
+        changed = shown.loc[update.changed]
+        for start in range(0, len(changed), 4):
+            for column, (city, row) in zip(st.columns(4), changed.iloc[start:start + 4].iterrows()):
+                with column:
+                    st.markdown(f"**{city}**")
+                    st.markdown(f"{row['condition']}")
+                    st.markdown(f"🌡️ {row[f'temp °{unit[0]}']:.1f}°{unit[0]}")
+
+if mode == "Multi-city dashboard":
+    show_dashboard(parse_cities(cities_input))
+    st.stop()
+
 # --- Main Logic ---
+# Load the forecast first: the agent's tool call below then finds it in the cache
+forecast = load_forecast(city_input) if city_input else None
+
 if ask_button:
     st.snow()
     assistant = init_agent()
     question = f"What is the weather in {city_input}?"
 
     with st.spinner("⛅ Fetching weather details..."):
-        result = asyncio.run(Runner.run(starting_agent=assistant, input=[{"role": "user", "content": question}]))
+        result = run(Runner.run(starting_agent=assistant, input=[{"role": "user", "content": question}], run_config=get_config()))
 
     st.success(result.final_output)
     st.markdown(download_weather_details(result.final_output), unsafe_allow_html=True)
 
 # --- Forecast Section ---
-if city_input:
-    daily_data, location_data, current_weather = fetch_weather_data(city_input)
+if forecast:
+    daily_data, location_data, current_weather = forecast.days, forecast.location, forecast.current
 
     if current_weather:
         st.subheader("🌞 Current Weather")
         col1, col2 = st.columns([1, 3])
         with col1:
-            st.image("https:" + current_weather['condition']['icon'], width=80)
+            st.image(current_weather.icon_url, width=80)
         with col2:
-            st.markdown(f"### {current_weather['condition']['text']}")
-            temp = current_weather['temp_c'] if unit == "Celsius" else (current_weather['temp_c'] * 9/5) + 32
+            st.markdown(f"### {current_weather.condition}")
+            temp = current_weather.temp_c if unit == "Celsius" else (current_weather.temp_c * 9/5) + 32
             st.markdown(f"**Temperature:** {temp:.1f}°{unit[0]}")
-            st.markdown(f"**Wind Speed:** {current_weather['wind_kph']} kph")
-            st.markdown(f"**Feels Like:** {current_weather['feelslike_c']}°C")
+            st.markdown(f"**Wind Speed:** {current_weather.wind_kph} kph")
+            st.markdown(f"**Feels Like:** {current_weather.feelslike_c}°C")
 
         st.subheader("💡 Tips for Today")
         st.markdown("""
@@ -163,17 +253,13 @@ if city_input:
     if daily_data:
         if show_hourly:
             st.subheader("🕒 Hourly Weather Forecast")
-            hours_df = pd.DataFrame(daily_data[0]['hour'])
-            hours_df['time'] = pd.to_datetime(hours_df['time']).dt.strftime('%I:%M %p')
-            hours_df['temp'] = hours_df['temp_c'] if unit == "Celsius" else (hours_df['temp_c'] * 9/5) + 32
-
-            fig = px.line(hours_df, x='time', y='temp', title='Hourly Temperature', markers=True)
-            fig.update_traces(line=dict(color='skyblue'), marker=dict(size=6))
+            updated = f"{current_weather.last_updated}/{daily_data[0].date}"
+            fig = hourly_figure(normalize_city(city_input), updated, unit, daily_data[0].hours)
             st.plotly_chart(fig, use_container_width=True)
 
             # Map Section
             st.subheader("🌍 Location on Map")           
-            lat, lon = location_data.get("lat"), location_data.get("lon")
+            lat, lon = location_data.lat, location_data.lon
             if lat and lon:
                 st.map(pd.DataFrame({'lat': [lat], 'lon': [lon]}), zoom=10)
           
@@ -182,12 +268,12 @@ if city_input:
         columns = st.columns(3, gap="small")
         for i in range(min(3, len(daily_data))):
             day = daily_data[i]
-            date = day['date']
-            condition = day['day']['condition']['text']
-            icon_url = "https:" + day['day']['condition']['icon']
-            max_temp = day['day']['maxtemp_c'] if unit == "Celsius" else (day['day']['maxtemp_c'] * 9/5) + 32
-            min_temp = day['day']['mintemp_c'] if unit == "Celsius" else (day['day']['mintemp_c'] * 9/5) + 32
-            wind = day['day']['maxwind_kph']
+            date = day.date
+            condition = day.condition
+            icon_url = day.icon_url
+            max_temp = day.maxtemp_c if unit == "Celsius" else (day.maxtemp_c * 9/5) + 32
+            min_temp = day.mintemp_c if unit == "Celsius" else (day.mintemp_c * 9/5) + 32
+            wind = day.maxwind_kph
 
             with columns[i]:
                 st.markdown(f"**{date}**")
@@ -195,5 +281,5 @@ if city_input:
                 st.markdown(f"{condition}")
                 st.markdown(f"🌡️ {max_temp:.1f}° / {min_temp:.1f}°")
                 st.markdown(f"💨 {wind} kph")
-                st.markdown(f"**Humidity:** {day['day']['avghumidity']}%")
-                st.markdown(f"**Rain Chance:** {day['day']['daily_chance_of_rain']}%")
+                st.markdown(f"**Humidity:** {day.avghumidity}%")
+                st.markdown(f"**Rain Chance:** {day.chance_of_rain}%")
@@ -1,12 +1,18 @@
 
 #weather app using weather api and agnets function tool
-import os
 import requests
 import asyncio
 import streamlit as st
 from dotenv import load_dotenv
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner, RunConfig
+from agents import Agent, Runner
 from agents.tool import function_tool
+import sys
+from pathlib import Path
+
+ROOT_DIR = str(Path(__file__).resolve().parents[1])  # repo root, for the shared/ package
+if ROOT_DIR not in sys.path:  # Streamlit re-executes this script on every rerun
+    sys.path.append(ROOT_DIR)
+from shared.model_client import get_config
 
 # Load environment variables
 load_dotenv()
@@ -30,23 +36,10 @@ def get_weather(city: str) -> str:
 # Initialize agent
 @st.cache_resource
 def init_agent():
-    MODEL_NAME = "gemini-2.0-flash"
-    API_KEY = os.getenv("GEMINI_API_KEY")
-
-    external_client = AsyncOpenAI(
-        api_key=API_KEY, base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-
-    model = OpenAIChatCompletionsModel( model=MODEL_NAME, openai_client=external_client
-    )
-
-    config = RunConfig( model=model, model_provider=external_client, tracing_disabled=True
-    )
-
     assistant = Agent(
         name="Weather Assistant",
         instructions="You are a helpful assistant who answers weather-related questions using tools.",
-        model=model, tools=[get_weather]
+        tools=[get_weather]
     )
 
     return assistant
@@ -175,7 +168,8 @@ if ask_button:
     with st.spinner("Thinking..."):
         result = asyncio.run(Runner.run(
             starting_agent=assistant,
-            input=st.session_state["history"]
+            input=st.session_state["history"],
+            run_config=get_config()
         ))
 
     st.session_state["history"].append({"role": "assistant", "content": result.final_output})
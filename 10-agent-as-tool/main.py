@@ -1,33 +1,23 @@
 import streamlit as st
-import os
-import asyncio
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
 from pathlib import Path
 import base64
+import sys
 
+ROOT_DIR = str(Path(__file__).resolve().parents[1])  # repo root, for the shared/ package
+if ROOT_DIR not in sys.path:  # Streamlit re-executes this script on every rerun
+    sys.path.append(ROOT_DIR)
+from shared.model_client import get_config, warm_up
+from shared.background_loop import stream, submit
+from shared.token_stream import ThrottledPlaceholder
+from shared.language_id import precheck, with_source_note
 
 load_dotenv()
 
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_config()
+# Runs go to one long-lived event loop, so the Gemini connection stays open across clicks
+submit(warm_up())  # no-op after the first run
 # Step 3: Define the Translator Agents
 urdu_translator_agent = Agent(
     name="Urdu Translator",
@@ -121,8 +111,8 @@ selected_language = st.sidebar.selectbox(
 # Input area for user message
 message = st.text_area("Enter your message for translation:")
 
-# Function to handle translation asynchronously
-async def handle_translation(message, selected_language):
+# Streams the translation deltas (runs on the background event loop)
+async def translation_deltas(message, selected_language, detection=None):
     # Set up the history
     history = [{"role": "user", "content": message}]
 
@@ -146,27 +136,43 @@ async def handle_translation(message, selected_language):
     elif selected_language == "Chinese":
         selected_agent = triage_agent       
 
+    # The triage agent is told the locally detected source language
+    if selected_agent is triage_agent and detection:
+        history = with_source_note(history, detection)
+
     # Run the agent with streaming enabled
     result = Runner.run_streamed(selected_agent, history, run_config=config)
 
-    # Stream the response token by token
-    translated_text = ""
     async for event in result.stream_events():
         if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
-            token = event.data.delta
-            translated_text += token
-            st.text(translated_text)  # Display the translation as it comes in
+            yield event.data.delta
 
-    return translated_text
+# Show the translation as it comes in; Streamlit calls stay in the script thread
+def handle_translation(message, selected_language, detection=None):
+    # One placeholder updated in place, at most every STREAM_RENDER_MS
+    with ThrottledPlaceholder(st.empty(), method="text") as output:
+        for token in stream(translation_deltas(message, selected_language, detection)):
+            output.push(token)
+
+    return output.text
 
 # When user presses the 'Translate' button
 if st.button('Translate'):
     if message:
-        st.write(f"Translating message to {selected_language}...")
-        st.subheader(f"Translation to {selected_language}:")
-
-        # Run the async function in the event loop
-        translated_text = asyncio.run(handle_translation(message, selected_language)) 
+        # Already in the target language, or nothing to translate: shown as it is, no model run
+        detection = precheck(message, selected_language, app="10-agent-as-tool")
+        if detection.skip:
+            st.subheader(f"Translation to {selected_language}:")
+            st.text(message)
+            st.caption("✅ Nothing to translate" if detection.skip == "no_text"
+                       else f"✅ Already in {detection.language}")
+            translated_text = message
+        else:
+            st.write(f"Translating message to {selected_language}...")
+            st.subheader(f"Translation to {selected_language}:")
+
+            # Stream the translation from the background event loop
+            translated_text = handle_translation(message, selected_language, detection)
     else:
         st.error("Please enter a message to translate.")
 
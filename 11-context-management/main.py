@@ -1,10 +1,8 @@
 
-import os
 import asyncio
 import chainlit as cl
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
 from agents.tool import function_tool
 # 1. context via Input:
 #2. Context Via Instruction: it increases cost burden because each time instruction will proceed to llm
@@ -12,25 +10,15 @@ from agents.tool import function_tool
 #3. Context via tool-call: Ondemand context: info is passed only when user asks   # Rather than context tool is best to use
 # with tool company info is passed
 #4. Retrieval or web Search: matches for specific search and gives only that part in result
+import sys
+from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
+from shared.context_window import ContextWindow
 
 load_dotenv()
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_config()
 # Company Inforamtion
 
 company_info = {
@@ -73,9 +61,14 @@ company_agent = Agent(
 )
 #step5: Chainlit integration
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+
 @cl.on_chat_start
 async def on_chat_start():
-    cl.user_session.set("history", [])
+    cl.user_session.set("history", ContextWindow())
     await cl.Message(content="🚀 MandACo Solution. 🚀 \n\n Welcome! How can I assist you today?").send()
 
 @cl.on_message
@@ -86,9 +79,9 @@ async def handle_message(message:cl.Message):
     msg = cl.Message(content="")
     await msg.send()
 
-    history.append({"role":"user", "content":message.content})
+    history.add_user(message.content)
 # Run the Triage Agent with the user's message and history with streaming enabled
-    result = Runner.run_streamed(company_agent, history, run_config=config)
+    result = Runner.run_streamed(company_agent, history.to_input_items(), run_config=config)
 
 # Stream the response back to the user
     async for event in result.stream_events():
@@ -97,6 +90,9 @@ async def handle_message(message:cl.Message):
             await msg.stream_token(token)
 
 # Append the final output to the history
-    history.append({"role":"assistant", "content":result.final_output})
+    history.add_assistant(result.final_output)
     cl.user_session.set("history", history)
+
+    # Now that the reply is out, fold old turns into the summary in the background
+    history.summarize_in_background()
     
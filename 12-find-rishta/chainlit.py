@@ -1,25 +1,21 @@
-from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled, function_tool
+from agents import Agent, Runner, set_tracing_disabled, function_tool
 from dotenv import load_dotenv
 import os
-from openai import AsyncOpenAI
 import chainlit as cl
 import requests
 import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_model
 
 # Load env vars
 load_dotenv()
 set_tracing_disabled(True)
 
 # Model Setup
-API_KEY = os.getenv("GEMINI_API_KEY")
-external_client = AsyncOpenAI(
-    api_key=API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+model = get_model("gemini-2.5-flash")
 
 # Tool: Get User Data
 @function_tool
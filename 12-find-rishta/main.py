@@ -1,25 +1,27 @@
 import os
-import asyncio
 import streamlit as st
 from dotenv import load_dotenv
-from agents import Agent, Runner, OpenAIChatCompletionsModel, function_tool, set_tracing_disabled
-from openai import AsyncOpenAI
-import requests
+from agents import Agent, Runner, function_tool, set_tracing_disabled
+import httpx
+import sys
+from pathlib import Path
+
+ROOT_DIR = str(Path(__file__).resolve().parents[1])  # repo root, for the shared/ package
+if ROOT_DIR not in sys.path:  # Streamlit re-executes this script on every rerun
+    sys.path.append(ROOT_DIR)
+from shared.model_client import get_model, warm_up
+from shared.background_loop import run, submit
+from shared.async_tools import bounded, get_http_client, warm_up_http_client
 
 # Load environment variables
 load_dotenv()
 set_tracing_disabled(True)
 
 # Setup Gemini model
-API_KEY = os.getenv("GEMINI_API_KEY")
-external_client = AsyncOpenAI(
-    api_key=API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+model = get_model("gemini-2.5-flash")
+# Runs go to one long-lived event loop, so connections stay open across clicks
+submit(warm_up())  # no-op after the first run
+submit(warm_up_http_client())  # the WhatsApp tool's client, certificates loaded off the loop
 
 # Define tools
 @function_tool
@@ -39,8 +41,8 @@ def get_user_data(min_age: int, desired_gender: str) -> list[dict]:
     ]
     return [user for user in users if user["age"] >= min_age and user["gender"].lower() == desired_gender.lower()]
 
-@function_tool
-def send_whatsapp_message(phone: str, message: str) -> str:
+@bounded(timeout=10, max_concurrency=4)
+async def send_whatsapp(phone: str, message: str) -> str:
     """Send WhatsApp message via UltraMsg API."""
     instance_id = os.getenv("WHATSAPP_INSTANCE_ID")
     token = os.getenv("WHATSAPP_API_TOKEN")
@@ -49,14 +51,18 @@ def send_whatsapp_message(phone: str, message: str) -> str:
     url = f"{api_url}/instance{instance_id}/messages/chat"
     payload = {"token": token, "to": phone, "body": message}
 
+    # Async on the shared httpx pool instead of a blocking requests.post on the event loop
     try:
-        response = requests.post(url, data=payload)
+        response = await get_http_client().post(url, data=payload)
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return f"❌ Error sending message: {e}"
 
     return f"✅ Message sent to {phone}!"
 
+# The same function as an agent tool (send_whatsapp stays callable from the UI below)
+send_whatsapp_message = function_tool(send_whatsapp, name_override="send_whatsapp_message")
+
 # Create the Agent
 assistant = Agent(
     name="Rishty Wali",
@@ -87,7 +93,7 @@ if st.button("🔎 Find Match"):
     st.session_state.history.append({"role": "user", "content": user_input})
     with st.spinner("🔍 Finding the best match..."):
         try:
-            output = asyncio.run(run_agent(st.session_state.history))
+            output = run(run_agent(st.session_state.history))
             st.session_state.history.append({"role": "assistant", "content": output})
             st.success("✅ Match found!")
 
@@ -103,7 +109,7 @@ if st.button("🔎 Find Match"):
                 if "Phone" in line or "phone" in line:
                     phone = line.split(":")[-1].strip()
                     if st.button(f"📱 Send to {phone}", key=phone):
-                        message_status = send_whatsapp_message(phone=phone, message=output)
+                        message_status = run(send_whatsapp(phone=phone, message=output))
                         st.success(message_status)
 
         except Exception as e:
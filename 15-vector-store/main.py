@@ -1,32 +1,19 @@
 
 
 import chainlit as cl
-import os
 import asyncio
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents import Agent, Runner
 from dotenv import load_dotenv
-from agents.run import RunConfig
 from agents import FileSearchTool
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_config, warm_up
 
 load_dotenv()
 #step1
-MODEL_NAME = "gemini-2.0-flash"
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-external_client = AsyncOpenAI(
-    api_key=GEMINI_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model=MODEL_NAME,
-    openai_client=external_client
-)
-#step2
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_config()
 # step 3: Agent
 # creating a simple assisstant agent that can search files in a vector store
 # vector store is a collection of documents that can be searched using embeddings
@@ -50,6 +37,11 @@ agent = Agent(
 )
 #step5`
 
+@cl.on_app_startup
+async def on_app_startup():
+    # Open the pooled connection to Gemini before the first user shows up
+    await warm_up()
+
 @cl.on_chat_start
 async def on_chat_start():
     cl.user_session.set("history", [])
@@ -4,36 +4,31 @@
 # Next, the guardrail function runs to produce a GuardrailFunctionOutput, which is then wrapped in an InputGuardrailResult.
 # Finally, we check if .tripwire_triggered is true. If true, an InputGuardrailTripwireTriggered exception is raised, so you can appropriately respond to the user or handle the exception.
 import asyncio
-import os
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from agents import (
     Agent,
     GuardrailFunctionOutput,
     InputGuardrailTripwireTriggered,
     RunContextWrapper,
     Runner,
-    OpenAIChatCompletionsModel,
     TResponseInputItem,
     input_guardrail,
     set_tracing_disabled,
 )
 from pydantic import BaseModel
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_model
+
 # Load environment variables
 load_dotenv()
 set_tracing_disabled(True)
 
 # Setup Gemini model
-API_KEY = os.getenv("GEMINI_API_KEY")
-external_client = AsyncOpenAI(
-    api_key=API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+model = get_model("gemini-2.5-flash")
 
 # --------- Output type from guardrail
 class MathHomeWork(BaseModel):
@@ -1,14 +1,11 @@
 import asyncio
-import os
 from dotenv import  load_dotenv
-from openai import AsyncOpenAI
 from agents import (
     Agent,
     GuardrailFunctionOutput,
     InputGuardrailTripwireTriggered,
     RunContextWrapper,
     Runner,
-    OpenAIChatCompletionsModel,
     GuardrailFunctionOutput,
     OutputGuardrailTripwireTriggered,
     TResponseInputItem,
@@ -17,22 +14,16 @@ from agents import (
     set_tracing_disabled,
 )
 from pydantic import BaseModel
+import sys
+from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_model
 
 load_dotenv()
 set_tracing_disabled(True)
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-
-external_client = AsyncOpenAI(
-    api_key=API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+model = get_model("gemini-2.5-flash")
 
 # -------- input types checker
 class CheckJobRequest(BaseModel):
@@ -5,9 +5,7 @@
 # Finally , we check if .tripwire_triggered is true. If true, an OutputGuardrailTripwireTriggered exception is raised, so you can appropriately respond to the user or handle the exception.
 
 import asyncio
-import os
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from pydantic import BaseModel
 from agents import (
     Agent,
@@ -15,7 +13,6 @@ from agents import (
     InputGuardrailTripwireTriggered,
     RunContextWrapper,
     Runner,
-    OpenAIChatCompletionsModel,
     GuardrailFunctionOutput,
     OutputGuardrailTripwireTriggered,
     TResponseInputItem,
@@ -23,16 +20,16 @@ from agents import (
     output_guardrail,
     set_tracing_disabled,
 )
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.model_client import get_model
 
 load_dotenv()
 set_tracing_disabled(True)
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-external_client = AsyncOpenAI(api_key=API_KEY, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+model = get_model("gemini-2.5-flash")
 # --------- Output type from guardrail
 class QueryResponse(BaseModel):
    response: str
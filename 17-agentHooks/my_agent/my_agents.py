@@ -1,21 +1,16 @@
-import os
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
-from agents import Agent, OpenAIChatCompletionsModel
+from agents import Agent
 from my_tool.my_tools import Add
 from my_hooks.my_agent_hooks import MyAgentHooks
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for the shared/ package
+from shared.model_client import get_model
 
 load_dotenv()
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-external_client = AsyncOpenAI(
-    api_key=API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+model = get_model()
 #using on_handoff
 # math_assistant = Agent(
 #     name="Math Assistant",
@@ -0,0 +1,95 @@
+# Load test: per-session memory and chat-start time for 1k simulated 07-function-tools sessions.
+#
+#   GEMINI_API_KEY=x uv run benchmarks/bench_agent_registry.py
+#   GEMINI_API_KEY=x uv run benchmarks/bench_agent_registry.py --sessions 5000
+#
+# Replays what @cl.on_chat_start did for each session, keeping everything a session
+# would hold in cl.user_session alive until the end:
+#   per-session client  the original code: new AsyncOpenAI client + model + Agent per chat
+#   per-session agent   shared model, but still a new Agent per chat
+#   registry            one prebuilt Agent from AgentRegistry; the session keeps only its history
+# No requests are sent; the key only has to be non-empty.
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from openai import AsyncOpenAI
+from agents import Agent, OpenAIChatCompletionsModel
+from agents.tool import function_tool
+from shared.model_client import GEMINI_BASE_URL, DEFAULT_MODEL_NAME, get_model
+from shared.agent_registry import AgentRegistry
+from shared.context_window import ContextWindow
+
+INSTRUCTIONS = "You are a helpful assistant who answers weather-related questions using tools."
+
+
+@function_tool
+def get_weather(city: str) -> str:
+    """Fetches the current weather for a given city."""
+    return f"The weather in {city} is sunny."
+
+
+def per_session_client():
+    client = AsyncOpenAI(api_key="x", base_url=GEMINI_BASE_URL)
+    model = OpenAIChatCompletionsModel(model=DEFAULT_MODEL_NAME, openai_client=client)
+    agent = Agent(name="Weather Assistant", instructions=INSTRUCTIONS, model=model, tools=[get_weather])
+    return {"assistant": agent, "history": ContextWindow()}
+
+
+def per_session_agent():
+    agent = Agent(name="Weather Assistant", instructions=INSTRUCTIONS, model=get_model(), tools=[get_weather])
+    return {"assistant": agent, "history": ContextWindow()}
+
+
+agents = AgentRegistry()
+
+
+@agents.register("weather")
+def weather_assistant():
+    return Agent(name="Weather Assistant", instructions=INSTRUCTIONS, model=get_model(), tools=[get_weather])
+
+
+def registry_session():
+    agents.get("weather")  # what the message handler does; the session does not keep it
+    return {"history": ContextWindow()}
+
+
+def load_test(name, chat_start, sessions):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    timings = []
+    user_sessions = []
+    for _ in range(sessions):
+        started = time.perf_counter()
+        user_sessions.append(chat_start())
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"{name:<20} {used / sessions / 1024:8.1f} KiB/session  {used / 2**20:7.1f} MiB total  "
+          f"chat start p50 {p50:8.1f} µs  p99 {p99:8.1f} µs")
+    return used
+
+
+def main(args):
+    get_model()  # the shared client exists before the first chat in every variant
+    agents.prebuild()
+    print(f"{args.sessions:,} simulated chat sessions")
+    baseline = load_test("per-session client", per_session_client, args.sessions)
+    load_test("per-session agent", per_session_agent, args.sessions)
+    shared = load_test("registry", registry_session, args.sessions)
+    print(f"memory per session: {baseline / max(shared, 1):.0f}x less with the registry; agents built: {agents.builds}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test prebuilt vs per-session agents.")
+    parser.add_argument("--sessions", type=int, default=1000, help="simulated chat sessions (default: 1000)")
+    main(parser.parse_args())
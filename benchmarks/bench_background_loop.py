@@ -0,0 +1,118 @@
+# Button clicks in a Streamlit app: asyncio.run() per click vs the shared background loop.
+#
+#   uv run benchmarks/bench_background_loop.py
+#   uv run benchmarks/bench_background_loop.py --clicks 50 --handshake-ms 120
+#
+# A local OpenAI-compatible server stands in for Gemini. It keeps connections alive
+# and sleeps --handshake-ms on every new connection, about what a TCP + TLS handshake
+# to Gemini costs. Each "click" sends one chat completion through a single shared
+# AsyncOpenAI client, the way the apps use shared/model_client.py, from a script
+# thread (Streamlit runs every session in its own thread). With asyncio.run, sessions
+# clicking at the same time share pooled connections across loops, which fails or
+# hangs; --timeout turns a hang into a failed click.
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from shared.background_loop import run
+from shared.model_client import HTTP_LIMITS
+
+REPLY = {
+    "id": "bench", "object": "chat.completion", "created": 0, "model": "bench",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Bonjour"}}],
+}
+
+
+def start_fake_gemini(handshake: float):
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def setup(self):
+            super().setup()
+            connections.append(1)
+            time.sleep(handshake)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            body = json.dumps(REPLY).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.handle_error = lambda request, address: None  # clients that failed hang up mid-reply
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/v1", connections
+
+
+def make_client(base_url):
+    http_client = DefaultAsyncHttpxClient(limits=HTTP_LIMITS, timeout=httpx.Timeout(10.0))
+    return AsyncOpenAI(api_key="x", base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def click(client, use_background_loop, timeout):
+    request = client.chat.completions.create(model="bench", messages=[{"role": "user", "content": "Translate: hello"}])
+    if use_background_loop:
+        return run(request, timeout)
+    return asyncio.run(asyncio.wait_for(request, timeout))  # what the apps did before
+
+
+def session(client, clicks, use_background_loop, timeout, latencies, errors):
+    for _ in range(clicks):
+        started = time.perf_counter()
+        try:
+            click(client, use_background_loop, timeout)
+            latencies.append(time.perf_counter() - started)
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+
+def measure(name, base_url, connections, args, use_background_loop):
+    client = make_client(base_url)
+    before = len(connections)
+    latencies, errors = [], []
+    threads = [threading.Thread(target=session, args=(client, args.clicks, use_background_loop, args.timeout, latencies, errors))
+               for _ in range(args.sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+    kinds = ", ".join(sorted(set(errors))) or "-"
+    print(f"{name:<16} {len(latencies):>4} ok  {len(errors):>4} failed ({kinds})  "
+          f"connections opened {len(connections) - before:>4}  click p50 {p50:7.1f} ms  wall {wall:6.2f}s")
+
+
+def main(args):
+    base_url, connections = start_fake_gemini(args.handshake_ms / 1000)
+    print(f"{args.sessions} sessions x {args.clicks} clicks, new connection costs {args.handshake_ms:.0f} ms")
+    measure("asyncio.run", base_url, connections, args, use_background_loop=False)
+    measure("background loop", base_url, connections, args, use_background_loop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare asyncio.run per click with the shared background loop.")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent Streamlit sessions (default: 4)")
+    parser.add_argument("--clicks", type=int, default=20, help="clicks per session (default: 20)")
+    parser.add_argument("--timeout", type=float, default=5, help="give up on a click after this many seconds (default: 5)")
+    parser.add_argument("--handshake-ms", type=float, default=100, help="cost of opening a connection (default: 100)")
+    main(parser.parse_args())
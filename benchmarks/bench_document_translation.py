@@ -0,0 +1,113 @@
+# Long-document translation: one whole-document run vs chunked parallel translation.
+#
+#   uv run benchmarks/bench_document_translation.py
+#   uv run benchmarks/bench_document_translation.py --paragraphs 80 --rpm 120
+#
+# Uses an offline stand-in for the translator agent: a fixed request latency, a
+# prefill cost per input token (the model reads the whole input before the first
+# output token), a fixed ms per output token (tokens estimated at ~4 chars/token), and
+# an output cap like the model's max output tokens, beyond which a whole-document
+# translation is cut off. The whole-document baseline streams, as 08-translator did;
+# chunks show up when they and every chunk before them are done. For each concurrency
+# it reports total time, time until the first translated text can be shown, how much
+# of the document got translated, and checks that the chunks came back in order.
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent
+from shared.context_window import estimate_tokens
+from shared.document_translation import chunk_document, translate_document
+
+agent = Agent(
+    name="French Translator",
+    instructions="You translate the user's message to French. Provide accurate translations and maintain the original meaning.",
+)
+
+PARAGRAPH = ("Paragraph {n}. The committee met on Tuesday to review the proposed budget for the coming year. "
+             "Several members asked for more detail on maintenance costs, and the chair agreed to circulate "
+             "a revised table before the next meeting. Public comments will be accepted until the end of the month.")
+
+
+class FakeTranslator:
+    """Takes as long as a model run would and marks its output, so order can be checked."""
+
+    def __init__(self, args):
+        self.latency = args.latency_ms / 1000
+        self.prefill = args.prefill_ms_per_token / 1000
+        self.per_token = args.ms_per_token / 1000
+        self.max_output_tokens = args.max_output_tokens
+        self.requests = 0
+
+    def timings(self, text):
+        """(seconds to the first output token, seconds to generate the rest, output tokens)."""
+        out_tokens = min(estimate_tokens(text), self.max_output_tokens)
+        return self.latency + estimate_tokens(text) * self.prefill, out_tokens * self.per_token, out_tokens
+
+    async def __call__(self, agent, input, **kwargs):
+        self.requests += 1
+        text = input if isinstance(input, str) else input[-1]["content"]
+        first, rest, out_tokens = self.timings(text)
+        await asyncio.sleep(first + rest)
+        translated = text[:out_tokens * 4]  # cut off like a reply that hit the output limit
+        return SimpleNamespace(final_output=translated.upper())
+
+    async def stream(self, text):
+        self.requests += 1
+        first, rest, out_tokens = self.timings(text)
+        translated = text[:out_tokens * 4].upper()
+        await asyncio.sleep(first)
+        yield translated[:4]
+        await asyncio.sleep(rest)
+        yield translated[4:]
+
+
+async def measure(name, run, document):
+    started = time.perf_counter()
+    first = None
+    pieces = []
+    async for piece in run():
+        if first is None:
+            first = time.perf_counter() - started
+        pieces.append(piece)
+    total = time.perf_counter() - started
+    translated = "".join(pieces)
+    in_order = translated.strip() == document.upper()[:len(translated.strip())]
+    coverage = len(translated.strip()) / len(document)
+    print(f"{name:<20} total {total:6.2f}s  first text after {first:6.2f}s  translated {coverage:5.0%}  "
+          f"in order: {'yes' if in_order else 'NO'}")
+    return total
+
+
+async def main(args):
+    document = "\n\n".join(PARAGRAPH.format(n=n) for n in range(1, args.paragraphs + 1))
+    chunks = chunk_document(document, args.chunk_tokens)
+    print(f"{args.paragraphs} paragraphs, ~{estimate_tokens(document):,} tokens, {len(chunks)} chunks of "
+          f"<= {args.chunk_tokens} tokens; model {args.latency_ms:.0f} ms + {args.prefill_ms_per_token:g} ms/input token, "
+          f"{args.ms_per_token:g} ms/output token, "
+          f"max {args.max_output_tokens:,} output tokens" + (f", {args.rpm:g} requests/min" if args.rpm else ""))
+
+    baseline = await measure("whole document", lambda: FakeTranslator(args).stream(document), document)
+    for concurrency in args.concurrency:
+        fake = FakeTranslator(args)
+        total = await measure(f"chunked x{concurrency}", lambda: translate_document(
+            document, agent, max_concurrency=concurrency, max_tokens=args.chunk_tokens,
+            requests_per_minute=args.rpm, runner=fake), document)
+        print(f"{'':<20} {fake.requests} requests, {baseline / total:.1f}x faster than whole document")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare whole-document and chunked parallel translation.")
+    parser.add_argument("--paragraphs", type=int, default=60, help="paragraphs in the document (default: 60)")
+    parser.add_argument("--chunk-tokens", type=int, default=600, help="chunk token budget (default: 600)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="worker counts to try")
+    parser.add_argument("--rpm", type=float, default=None, help="client-side requests/minute limit (default: none)")
+    parser.add_argument("--latency-ms", type=float, default=300, help="fixed latency per request (default: 300)")
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.5, help="input reading cost (default: 0.5)")
+    parser.add_argument("--ms-per-token", type=float, default=2, help="model generation speed (default: 2)")
+    parser.add_argument("--max-output-tokens", type=int, default=4096, help="model output cap (default: 4096)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+# Wall time of a multi-language translation request: one language at a time vs fan_out().
+#
+#   uv run benchmarks/bench_fan_out.py
+#   uv run benchmarks/bench_fan_out.py --languages 10 --concurrency 5
+#
+# Each simulated translator streams --tokens deltas after a first-token delay of
+# ~--ttft-ms, with per-language speed varying ±50%. "sequential" is what a chain of
+# handoffs costs at best (the sum); fan_out should take about the slowest language.
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent
+from shared.fan_out import fan_out
+
+LANGUAGES = ["Urdu", "Hindi", "Arabic", "Japanese", "French", "English", "Spanish", "German", "Chinese", "Italian"]
+
+
+class SimulatedRun:
+    """A translator's streamed run: stream_events(), current_agent and final_output."""
+
+    def __init__(self, agent, speed, args):
+        self.current_agent = agent
+        self.final_output = None
+        self.speed = speed
+        self.args = args
+
+    async def stream_events(self):
+        await asyncio.sleep(self.args.ttft_ms / 1000 * self.speed)
+        for _ in range(self.args.tokens):
+            yield SimpleNamespace(type="raw_response_event", data=SimpleNamespace(type="response.output_text.delta", delta="mot "))
+            await asyncio.sleep(self.args.token_ms / 1000 * self.speed)
+        self.final_output = "mot " * self.args.tokens
+
+
+async def main(args):
+    random.seed(3)
+    languages = LANGUAGES[:args.languages]
+    translators = {language: Agent(name=f"{language} Translator") for language in languages}
+    speeds = {agent.name: random.uniform(0.5, 1.5) for agent in translators.values()}
+
+    def runner(agent, input, **kwargs):
+        return SimulatedRun(agent, speeds[agent.name], args)
+
+    started = time.perf_counter()
+    for language, agent in translators.items():
+        await fan_out("Hello", {language: agent}, runner=runner)
+    sequential = time.perf_counter() - started
+
+    first_delta = {}
+
+    async def on_delta(language, delta):
+        first_delta.setdefault(language, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    outputs = await fan_out("Hello", translators, on_delta=on_delta, max_concurrency=args.concurrency, runner=runner)
+    parallel = time.perf_counter() - started
+
+    slowest = max(speeds.values()) * (args.ttft_ms + args.tokens * args.token_ms) / 1000
+    print(f"{len(languages)} languages, ~{args.ttft_ms:.0f} ms to first token, {args.tokens} deltas each, "
+          f"concurrency cap {args.concurrency}")
+    print(f"  sequential  {sequential * 1000:7.0f} ms")
+    print(f"  fan_out     {parallel * 1000:7.0f} ms  ({sequential / parallel:.1f}x faster; slowest language alone "
+          f"~{slowest * 1000:.0f} ms)")
+    print(f"  first text per panel after {min(first_delta.values()) * 1000:.0f}-{max(first_delta.values()) * 1000:.0f} ms, "
+          f"{len(outputs)} translations merged")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel multi-language fan-out.")
+    parser.add_argument("--languages", type=int, default=5, help="target languages, up to 10 (default: 5)")
+    parser.add_argument("--concurrency", type=int, default=5, help="fan_out concurrency cap (default: 5)")
+    parser.add_argument("--ttft-ms", type=float, default=600, help="mean time to first token (default: 600)")
+    parser.add_argument("--token-ms", type=float, default=15, help="gap between deltas (default: 15)")
+    parser.add_argument("--tokens", type=int, default=80, help="deltas per translation (default: 80)")
+    asyncio.run(main(parser.parse_args()))
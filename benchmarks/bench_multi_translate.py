@@ -0,0 +1,113 @@
+# Cost and latency: one structured multi-language call vs one translator agent per language.
+#
+#   uv run benchmarks/bench_multi_translate.py                  # offline token/latency model
+#   uv run benchmarks/bench_multi_translate.py --languages 3
+#   uv run benchmarks/bench_multi_translate.py --live           # real Gemini calls (GEMINI_API_KEY)
+#
+# Offline, tokens are estimated the way the context window does (~4 chars/token) and
+# latency is time to first token plus output tokens at a fixed generation speed.
+# Per-language agents run in parallel (fan_out), so they pay N x the input but only
+# wait for one translation; the single call pays the input once but generates all N
+# translations in one stream. --live measures the same with real usage numbers.
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent, Runner
+from shared.context_window import estimate_tokens
+from shared.fan_out import only_this_language
+from shared.multi_translate import multi_translator_agent, multi_translation_prompt, translate_all
+
+LANGUAGES = ["French", "Arabic", "Japanese", "Spanish", "German", "Urdu", "Hindi", "Chinese", "Italian", "English"]
+SAMPLE = ("Our store will be closed on Friday for the public holiday. Orders placed before Thursday noon "
+          "will still ship the same day, and support will answer emails again on Monday morning. ")
+LENGTHS = [100, 400, 1600, 6400]
+JSON_OVERHEAD_TOKENS = 12  # {"language": "...", "text": "..."} per entry
+
+
+def translator(language):
+    return Agent(
+        name=f"{language} Translator",
+        instructions=f"You translate the user's message to {language}. Provide accurate translations and maintain the original meaning.",
+    )
+
+
+def sample_text(chars):
+    return (SAMPLE * (chars // len(SAMPLE) + 1))[:chars]
+
+
+def offline(args):
+    languages = LANGUAGES[:args.languages]
+    print(f"{len(languages)} languages, TTFT {args.ttft_ms:.0f} ms, {args.ms_per_token:.0f} ms/output token (model)")
+    print(f"{'chars':>6} | {'per-language agents':^34} | {'single structured call':^34}")
+    print(f"{'':>6} | {'reqs':>4} {'in tok':>7} {'out tok':>7} {'latency':>10} | {'reqs':>4} {'in tok':>7} {'out tok':>7} {'latency':>10}")
+    for chars in LENGTHS:
+        text = sample_text(chars)
+        text_tokens = estimate_tokens(text)
+        out_each = int(text_tokens * args.expansion)
+
+        per_in = sum(
+            estimate_tokens(translator(l).instructions) + sum(estimate_tokens(i["content"]) for i in only_this_language(l, text))
+            for l in languages
+        )
+        per_out = out_each * len(languages)
+        per_latency = args.ttft_ms + out_each * args.ms_per_token
+
+        single_in = estimate_tokens(multi_translator_agent.instructions) + estimate_tokens(
+            multi_translation_prompt(text, languages)) + args.schema_tokens
+        single_out = (out_each + JSON_OVERHEAD_TOKENS) * len(languages)
+        single_latency = args.ttft_ms + single_out * args.ms_per_token
+
+        print(f"{chars:>6} | {len(languages):>4} {per_in:>7,} {per_out:>7,} {per_latency / 1000:>9.2f}s | "
+              f"{1:>4} {single_in:>7,} {single_out:>7,} {single_latency / 1000:>9.2f}s")
+
+
+async def live(args):
+    from shared.model_client import get_config
+    config = get_config()
+    languages = LANGUAGES[:args.languages]
+    agents = {language: translator(language) for language in languages}
+    print(f"{len(languages)} languages, live Gemini calls")
+    for chars in LENGTHS[:args.live_lengths]:
+        text = sample_text(chars)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            Runner.run(agents[l], only_this_language(l, text), run_config=config) for l in languages
+        ))
+        per_latency = time.perf_counter() - started
+        per_in = sum(r.context_wrapper.usage.input_tokens for r in results)
+        per_out = sum(r.context_wrapper.usage.output_tokens for r in results)
+
+        usage = {}
+
+        async def run_and_keep_usage(agent, input, **kwargs):
+            result = await Runner.run(agent, input, **kwargs)
+            usage["in"], usage["out"] = result.context_wrapper.usage.input_tokens, result.context_wrapper.usage.output_tokens
+            return result
+
+        started = time.perf_counter()
+        await translate_all(text, languages, runner=run_and_keep_usage, run_config=config)
+        single_latency = time.perf_counter() - started
+
+        print(f"{chars:>6} chars | per-language: {len(languages)} reqs, {per_in:,} in / {per_out:,} out, "
+              f"{per_latency:.2f}s | single: 1 req, {usage['in']:,} in / {usage['out']:,} out, {single_latency:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare single-call and per-language translation.")
+    parser.add_argument("--languages", type=int, default=5, help="target languages, up to 10 (default: 5)")
+    parser.add_argument("--ttft-ms", type=float, default=500, help="model: time to first token (default: 500)")
+    parser.add_argument("--ms-per-token", type=float, default=6, help="model: generation speed (default: 6)")
+    parser.add_argument("--expansion", type=float, default=1.3, help="model: output/input token ratio (default: 1.3)")
+    parser.add_argument("--schema-tokens", type=int, default=60, help="model: output schema prompt size (default: 60)")
+    parser.add_argument("--live", action="store_true", help="measure with real Gemini calls instead")
+    parser.add_argument("--live-lengths", type=int, default=3, help="how many text lengths to try live (default: 3)")
+    args = parser.parse_args()
+    if args.live:
+        asyncio.run(live(args))
+    else:
+        offline(args)
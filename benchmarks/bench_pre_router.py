@@ -0,0 +1,110 @@
+# Triage hops skipped by the pre-router, how accurate the skips are, and latency saved.
+#
+#   uv run benchmarks/bench_pre_router.py                    # rules only (the app default)
+#   uv run benchmarks/bench_pre_router.py --embed local      # rules + local nearest-centroid
+#   uv run benchmarks/bench_pre_router.py --triage-ms 900
+#
+# Uses the 05-tools tutors and a labelled set of homework questions. "label" is the
+# agent the triage agent should pick; "Triage Agent" means it must keep the message
+# (translation requests, small talk). A skip to the wrong tutor counts as a misroute.
+# Latency saved is skips x --triage-ms, the cost of one triage round-trip (measure
+# yours with the prerouter_triage_hop_seconds metric).
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent
+from shared.pre_router import PreRouter, get_embedder
+from shared.stream_metrics import MetricsRegistry
+
+history_tutor_agent = Agent(name="History Tutor", handoff_description="Specialist agent for historical questions")
+math_tutor_agent = Agent(name="Math Tutor", handoff_description="Specialist agent for math questions")
+triage_agent = Agent(name="Triage Agent", handoffs=[history_tutor_agent, math_tutor_agent])
+
+RULES = {  # same rules as 05-tools/main.py
+    math_tutor_agent.name: [
+        r"\d+(\.\d+)?(\s*[+*^=×÷]\s*|\s+[-/]\s+)\d+", "math", "maths", "equation", "solve", "algebra", "geometry",
+        "calculus", "integral", "derivative", "fraction", "percentage", "probability", "theorem",
+    ],
+    history_tutor_agent.name: [
+        "history", "historical", "war", "empire", "dynasty", "revolution", "ancient", "civilization",
+        "battle", "independence", "century", "medieval",
+    ],
+    triage_agent.name: [r"translat\w*", r"\bin (urdu|hindi|arabic|french|japanese|english)\b"],
+}
+
+EXAMPLES = {  # same examples as 05-tools/main.py
+    math_tutor_agent.name: ["How do I solve this equation?", "What is the area of a circle?", "Simplify 3/4 + 1/8"],
+    history_tutor_agent.name: ["Who was the first Mughal emperor?", "What caused World War 1?", "When did Rome fall?"],
+}
+
+QUESTIONS = [
+    ("What is 12 * 7?", "Math Tutor"),
+    ("Solve 2x + 3 = 11", "Math Tutor"),
+    ("Can you explain the Pythagorean theorem?", "Math Tutor"),
+    ("How do I find the derivative of x^2?", "Math Tutor"),
+    ("What's 15 percent of 80? I'm stuck on percentage problems", "Math Tutor"),
+    ("What is the probability of rolling two sixes?", "Math Tutor"),
+    ("How do you add fractions with different denominators?", "Math Tutor"),
+    ("What is the area of a circle with radius 4?", "Math Tutor"),
+    ("Explain how to simplify square roots", "Math Tutor"),
+    ("What is the integral of 1/x?", "Math Tutor"),
+    ("What caused the First World War?", "History Tutor"),
+    ("Tell me about the Mughal Empire", "History Tutor"),
+    ("Who won the battle of Panipat?", "History Tutor"),
+    ("What was the French Revolution about?", "History Tutor"),
+    ("How did Pakistan gain independence in 1947?", "History Tutor"),
+    ("Describe life in ancient Egypt", "History Tutor"),
+    ("Who was Napoleon?", "History Tutor"),
+    ("When did the Roman republic become an empire?", "History Tutor"),
+    ("What happened in the 18th century in Europe?", "History Tutor"),
+    ("Who built the Taj Mahal and why?", "History Tutor"),
+    ("What happened in Europe between 1914-1918?", "History Tutor"),  # a year range, not a subtraction
+    ("Why did 9/11 change air travel?", "History Tutor"),  # a date, not a division
+    ("Who ruled Britain in 1939-1945?", "History Tutor"),
+    ("Explain the Pythagorean theorem in Urdu", "Triage Agent"),
+    ("Translate your last answer to French", "Triage Agent"),
+    ("Hi, how are you?", "Triage Agent"),
+    ("Thanks, that helped!", "Triage Agent"),
+    ("How many soldiers died in the war, as a percentage of the population?", "Triage Agent"),
+]
+
+
+async def main(args):
+    router = PreRouter(triage_agent, rules=RULES, embed=get_embedder(args.embed), examples=EXAMPLES,
+                       app="bench", metrics=MetricsRegistry())
+    await router.route("warm up the centroids")  # centroids are built once, on first use
+    router.decisions = dict.fromkeys(router.decisions, 0)
+
+    misroutes = []
+    routing_time = 0.0
+    for question, label in QUESTIONS:
+        started = time.perf_counter()
+        decision = await router.route(question)
+        routing_time += time.perf_counter() - started
+        if decision.skipped_triage and decision.agent.name != label:
+            misroutes.append((question, decision.agent.name, decision.method))
+
+    stats = router.stats()
+    skipped = stats["rule"] + stats["embedding"]
+    total = len(QUESTIONS)
+    print(f"{total} questions, embedder: {args.embed or 'none (rules only)'}")
+    print(f"  routed by rule      {stats['rule']:>3}")
+    print(f"  routed by embedding {stats['embedding']:>3}")
+    print(f"  sent to triage      {stats['triage']:>3}")
+    print(f"  triage hop skipped  {skipped / total:.0%}  ({len(misroutes)} misrouted)")
+    for question, agent, method in misroutes:
+        print(f"    misroute [{method}] {question!r} -> {agent}")
+    print(f"  routing overhead    {routing_time / total * 1e6:.0f} µs/message")
+    print(f"  latency saved       {skipped * args.triage_ms / 1000:.1f} s total, "
+          f"{skipped * args.triage_ms / total:.0f} ms/message on average at {args.triage_ms:.0f} ms per triage hop")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the deterministic pre-router.")
+    parser.add_argument("--embed", choices=["local", "gemini"], help="also use the nearest-centroid classifier")
+    parser.add_argument("--triage-ms", type=float, default=700, help="cost of one triage hop (default: 700)")
+    asyncio.run(main(parser.parse_args()))
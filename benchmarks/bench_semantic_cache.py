@@ -0,0 +1,117 @@
+# Replays a query log through SemanticCache and reports hit rate and latency saved.
+#
+#   uv run benchmarks/bench_semantic_cache.py                      # offline: built-in log, local embedder, simulated LLM
+#   uv run benchmarks/bench_semantic_cache.py --log queries.txt --threshold 0.85
+#   uv run benchmarks/bench_semantic_cache.py --live               # real Gemini embeddings + agent (needs GEMINI_API_KEY)
+#
+# Offline mode uses the pre-router's hashed character-trigram embedder (hashed_embed),
+# which is much weaker than gemini-embedding-001, so it needs a lower threshold
+# (default 0.6 offline, 0.92 live).
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.semantic_cache import SemanticCache
+from shared.pre_router import hashed_embed
+
+SAMPLE_LOG = [
+    "What's the weather in Karachi?",
+    "weather in Karachi?",
+    "How do I reset my password?",
+    "what is karachi weather",
+    "How can I reset my password",
+    "What are your opening hours?",
+    "When are you open?",
+    "what are your opening hours",
+    "Do you ship to Lahore?",
+    "do you deliver to lahore?",
+    "How do I reset my password?",
+    "What payment methods do you accept?",
+    "Which payment methods are accepted?",
+    "Can I cancel my order?",
+    "how can i cancel my order",
+    "What's the weather in Karachi today?",
+    "Do you ship internationally?",
+    "What are your opening hours on Sunday?",
+    "can I pay with a credit card?",
+    "Can I cancel my order?",
+]
+
+
+class SimulatedResult:
+    def __init__(self, final_output):
+        self.final_output = final_output
+
+
+def simulated_runner(latency: float):
+    async def run(agent, input, **kwargs):
+        await asyncio.sleep(latency)
+        return SimulatedResult(f"Answer to: {input}")
+    return run
+
+
+async def replay(queries, cache, agent, runner, **kwargs):
+    rows = []
+    for query in queries:
+        started = time.perf_counter()
+        result = await cache.run(agent, query, runner=runner, **kwargs)
+        rows.append((query, getattr(result, "cached", False), time.perf_counter() - started))
+    return rows
+
+
+def report(rows, cache):
+    hit_latencies = [t for _, hit, t in rows if hit]
+    miss_latencies = [t for _, hit, t in rows if not hit]
+    avg_hit = sum(hit_latencies) / len(hit_latencies) if hit_latencies else 0.0
+    avg_miss = sum(miss_latencies) / len(miss_latencies) if miss_latencies else 0.0
+    total = sum(t for _, _, t in rows)
+    # each hit would otherwise have cost an average miss
+    saved = len(hit_latencies) * avg_miss - sum(hit_latencies)
+
+    for query, hit, t in rows:
+        print(f"{'HIT ' if hit else 'miss'} {t * 1000:8.1f} ms  {query}")
+    print()
+    print(f"queries:        {len(rows)}")
+    print(f"hit rate:       {len(hit_latencies) / len(rows):.1%} ({len(hit_latencies)} hits)")
+    print(f"avg latency:    hit {avg_hit * 1000:.1f} ms | miss {avg_miss * 1000:.1f} ms")
+    print(f"total time:     {total:.2f} s (without cache ~{total + saved:.2f} s)")
+    print(f"latency saved:  {saved:.2f} s ({saved / (total + saved):.1%})" if total + saved else "latency saved:  0")
+    print(f"cache stats:    {cache.stats()}")
+
+
+async def main(args):
+    queries = SAMPLE_LOG
+    if args.log:
+        queries = [line.strip() for line in open(args.log, encoding="utf-8") if line.strip()]
+
+    if args.live:
+        from dotenv import load_dotenv
+        from agents import Agent
+        from shared.model_client import get_config
+
+        load_dotenv()
+        config = get_config()
+        agent = Agent(name="FAQ Assistant", instructions="Answer customer questions briefly.")
+        cache = SemanticCache(threshold=args.threshold or 0.92, max_entries=args.max_entries)
+        rows = await replay(queries, cache, agent, None, run_config=config)
+    else:
+        from types import SimpleNamespace
+
+        agent = SimpleNamespace(name="FAQ Assistant", instructions="Answer customer questions briefly.", model=None)
+        cache = SemanticCache(embed=hashed_embed, threshold=args.threshold or 0.6, max_entries=args.max_entries)
+        rows = await replay(queries, cache, agent, simulated_runner(args.llm_latency))
+
+    report(rows, cache)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a query log through the semantic cache.")
+    parser.add_argument("--log", metavar="FILE", help="query log to replay, one query per line")
+    parser.add_argument("--threshold", type=float, help="cosine similarity needed for a hit")
+    parser.add_argument("--max-entries", type=int, default=1000, help="cache size per namespace")
+    parser.add_argument("--live", action="store_true", help="use Gemini embeddings and a real agent")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="simulated agent latency in seconds (offline)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,164 @@
+# Time to first token with and without speculative specialists, hit rate and waste.
+#
+#   uv run benchmarks/bench_speculation.py
+#   uv run benchmarks/bench_speculation.py --requests 1000 --triage-ms 700 --accuracy 0.8
+#
+# Simulated 05-tools traffic: the triage hop takes ~--triage-ms, then hands off to the
+# History or Math tutor (the ranker's first guess is right --accuracy of the time,
+# triage answers by itself --self-answer of the time). A specialist's first token
+# arrives after ~--ttft-ms and it streams --tokens deltas. Each k runs the same
+# requests through a Speculator backed by these simulated streamed runs. Requests
+# where triage answers by itself gain nothing, so they dominate p99.
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent
+from shared.speculation import Speculator
+from shared.stream_metrics import MetricsRegistry, TimedStream
+
+history_tutor_agent = Agent(name="History Tutor", handoff_description="Specialist agent for historical questions")
+math_tutor_agent = Agent(name="Math Tutor", handoff_description="Specialist agent for math questions")
+triage_agent = Agent(name="Triage Agent", handoffs=[history_tutor_agent, math_tutor_agent])
+
+
+def text_delta(text):
+    return SimpleNamespace(type="raw_response_event", data=SimpleNamespace(type="response.output_text.delta", delta=text))
+
+
+def agent_updated(agent):
+    return SimpleNamespace(type="agent_updated_stream_event", new_agent=agent)
+
+
+class SimulatedRun:
+    """Just enough of RunResultStreaming: stream_events(), cancel(), current_agent, final_output."""
+
+    def __init__(self, agent, plan, args):
+        self.current_agent = agent
+        self.final_output = None
+        self.plan = plan
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    async def _specialist(self, agent):
+        yield agent_updated(agent)
+        await asyncio.sleep(random.uniform(0.5, 1.5) * self.args.ttft_ms / 1000)
+        for _ in range(self.args.tokens):
+            if self.cancelled:
+                return
+            yield text_delta("word ")
+            await asyncio.sleep(self.args.token_ms / 1000)
+        self.final_output = "word " * self.args.tokens
+
+    async def stream_events(self):
+        if self.current_agent is not triage_agent:
+            async for event in self._specialist(self.current_agent):
+                yield event
+            return
+        yield agent_updated(triage_agent)
+        await asyncio.sleep(random.uniform(0.5, 1.5) * self.args.triage_ms / 1000)
+        if self.cancelled:
+            return
+        if self.plan["chosen"] is None:  # triage answers by itself
+            self.current_agent = triage_agent
+            async for event in self._specialist(triage_agent):
+                if event.type != "agent_updated_stream_event":
+                    yield event
+            return
+        self.current_agent = self.plan["chosen"]
+        async for event in self._specialist(self.plan["chosen"]):
+            yield event
+
+
+def make_plans(args):
+    plans = []
+    for _ in range(args.requests):
+        guess = random.choice([history_tutor_agent, math_tutor_agent])
+        if random.random() < args.self_answer:
+            chosen = None
+        elif random.random() < args.accuracy:
+            chosen = guess
+        else:
+            chosen = math_tutor_agent if guess is history_tutor_agent else history_tutor_agent
+        plans.append({"guess": guess, "chosen": chosen})
+    return plans
+
+
+async def run_all(plans, k, args):
+    metrics = MetricsRegistry()
+    queue = iter(plans)
+    current = {}
+
+    def runner(agent, input, **kwargs):
+        return SimulatedRun(agent, current[input], args)
+
+    async def rank(text):
+        guess = current[text]["guess"]
+        return [guess, math_tutor_agent if guess is history_tutor_agent else history_tutor_agent]
+
+    speculator = Speculator(triage_agent, k=k, budget_chars=args.budget_chars, max_inflight=args.max_inflight,
+                            rank=rank, runner=runner, app="bench", metrics=metrics)
+    ttfts = []
+
+    async def one_request(i, plan):
+        key = f"request-{i}"
+        current[key] = plan
+        result = await speculator.run_streamed(key, text=key)
+        timed = TimedStream(result, app="bench", metrics=metrics)
+        async for _ in timed:
+            pass
+        ttfts.append(timed.ttft)
+
+    # requests arrive in waves of --concurrency
+    batch = []
+    for i, plan in enumerate(queue):
+        batch.append(one_request(i, plan))
+        if len(batch) == args.concurrency:
+            await asyncio.gather(*batch)
+            batch = []
+    await asyncio.gather(*batch)
+    return sorted(ttfts), speculator.stats()
+
+
+def pct(values, p):
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] * 1000
+
+
+async def main(args):
+    random.seed(7)
+    plans = make_plans(args)
+    print(f"{args.requests} requests, triage ~{args.triage_ms:.0f} ms, specialist TTFT ~{args.ttft_ms:.0f} ms, "
+          f"ranker accuracy {args.accuracy:.0%}, triage self-answers {args.self_answer:.0%}")
+    baseline = None
+    for k in (0, 1, 2):
+        started = time.perf_counter()
+        ttfts, stats = await run_all(plans, k, args)
+        elapsed = time.perf_counter() - started
+        p50, p90, p99 = pct(ttfts, 50), pct(ttfts, 90), pct(ttfts, 99)
+        baseline = baseline or p90
+        print(f"k={k}  TTFT p50 {p50:5.0f} ms  p90 {p90:5.0f} ms ({(p90 / baseline - 1) * 100:+4.0f}%)  p99 {p99:5.0f} ms  "
+              f"hit rate {stats['hit_rate']:4.0%}  "
+              f"wasted {stats['wasted_chars']:>7,} chars  not speculated {stats['skipped']:>4}  [{elapsed:.1f}s]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark speculative specialists during triage.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--triage-ms", type=float, default=700, help="mean triage hop (default: 700)")
+    parser.add_argument("--ttft-ms", type=float, default=500, help="mean specialist time to first token (default: 500)")
+    parser.add_argument("--token-ms", type=float, default=10, help="gap between deltas (default: 10)")
+    parser.add_argument("--tokens", type=int, default=60, help="deltas per answer (default: 60)")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="how often the ranker's first guess is right")
+    parser.add_argument("--self-answer", type=float, default=0.1, help="how often triage answers by itself")
+    parser.add_argument("--budget-chars", type=int, default=2000, help="speculation budget per candidate")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="cap on concurrent candidates")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+# Rendering a streamed translation in Streamlit: st.text per token vs ThrottledPlaceholder.
+#
+#   uv run benchmarks/bench_streamlit_render.py
+#   uv run benchmarks/bench_streamlit_render.py --tokens 5000 --token-ms 2 --render-ms 100
+#
+# Runs a minimal version of handle_translation() under Streamlit's AppTest, with a
+# fake model stream of --tokens ~5-char deltas every --token-ms, so the real Streamlit
+# element code runs. For each variant it reports the time spent inside Streamlit calls
+# (the sleeps standing in for the model are excluded), how many render calls were
+# made, the bytes those elements would send to the browser (protobuf size), and how
+# many elements end up on the page.
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from streamlit.testing.v1 import AppTest
+
+
+def app(variant: str, tokens: int, token_ms: float, render_ms: float):
+    import time
+    import streamlit as st
+    from streamlit.proto.Element_pb2 import Element
+    from shared.token_stream import ThrottledPlaceholder
+
+    stats = {"render_seconds": 0.0, "renders": 0, "payload_bytes": 0}
+
+    def measured(render):
+        def call(text):
+            started = time.perf_counter()
+            render(text)
+            stats["render_seconds"] += time.perf_counter() - started
+            stats["renders"] += 1
+            element = Element()
+            element.text.body = text
+            stats["payload_bytes"] += element.ByteSize()
+        return call
+
+    def deltas():
+        words = ["Bonjour ", "le ", "monde, ", "ceci ", "est ", "une ", "traduction. "]
+        for i in range(tokens):
+            time.sleep(token_ms / 1000)  # the model producing the next token
+            yield words[i % len(words)]
+
+    if variant == "st.text per token":  # what handle_translation did
+        render = measured(st.text)
+        translated_text = ""
+        for token in deltas():
+            translated_text += token
+            render(translated_text)
+    else:
+        placeholder = st.empty()
+        placeholder.text = measured(placeholder.text)
+        with ThrottledPlaceholder(placeholder, min_interval=render_ms / 1000, method="text") as output:
+            for token in deltas():
+                output.push(token)
+        translated_text = output.text
+
+    st.session_state["stats"] = {**stats, "chars": len(translated_text)}
+
+
+def main(args):
+    print(f"{args.tokens} tokens, one every {args.token_ms:g} ms, throttled renders every {args.render_ms:g} ms")
+    for variant in ["st.text per token", "ThrottledPlaceholder"]:
+        at = AppTest.from_function(app, default_timeout=600, kwargs={
+            "variant": variant, "tokens": args.tokens, "token_ms": args.token_ms, "render_ms": args.render_ms,
+        })
+        started = time.perf_counter()
+        at.run()
+        wall = time.perf_counter() - started
+        assert not at.exception, at.exception
+        stats = at.session_state["stats"]
+        print(f"{variant:<22} render time {stats['render_seconds'] * 1000:9.1f} ms  renders {stats['renders']:>5}  "
+              f"payload {stats['payload_bytes'] / 2**20:8.2f} MiB  elements on page {len(at.text):>5}  "
+              f"text {stats['chars']:,} chars  wall {wall:5.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-token st.text with the throttled placeholder.")
+    parser.add_argument("--tokens", type=int, default=5000, help="streamed deltas (default: 5000)")
+    parser.add_argument("--token-ms", type=float, default=2, help="time between deltas (default: 2)")
+    parser.add_argument("--render-ms", type=float, default=100, help="throttled render interval (default: 100)")
+    main(parser.parse_args())
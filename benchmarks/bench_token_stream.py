@@ -0,0 +1,108 @@
+# Frames sent and event-loop lag: per-token stream_token vs TokenCoalescer.
+#
+#   uv run benchmarks/bench_token_stream.py
+#   uv run benchmarks/bench_token_stream.py --users 500 --tokens 300 --flush-chars 64 --flush-ms 30
+#
+# Simulates many users streaming at once. Each model stream yields a ~4-char token
+# every few ms; each websocket frame costs some CPU (JSON encoding + a socket write,
+# modelled by --frame-cost-us of busy work). A probe task sleeps 5 ms in a loop and
+# records how late it wakes up, which is the event-loop lag every user feels.
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.token_stream import TokenCoalescer
+
+
+class FakeSocket:
+    """Counts frames and burns `frame_cost` seconds of CPU per frame, like emitting over a websocket."""
+
+    def __init__(self, frame_cost: float):
+        self.frame_cost = frame_cost
+        self.frames = 0
+        self.chars = 0
+
+    async def stream_token(self, token: str) -> None:
+        deadline = time.perf_counter() + self.frame_cost
+        payload = {"type": "stream_token", "id": "msg", "token": token}
+        while time.perf_counter() < deadline:
+            json.dumps(payload)
+        self.frames += 1
+        self.chars += len(token)
+        await asyncio.sleep(0)
+
+
+async def fake_deltas(tokens: int, gap: float):
+    for _ in range(tokens):
+        await asyncio.sleep(random.uniform(0, 2 * gap))
+        yield "tok "
+
+
+async def per_token_user(socket, tokens, gap):
+    async for delta in fake_deltas(tokens, gap):
+        await socket.stream_token(delta)
+
+
+async def coalesced_user(socket, tokens, gap, max_chars, max_delay):
+    async with TokenCoalescer(socket.stream_token, max_chars=max_chars, max_delay=max_delay) as stream:
+        async for delta in fake_deltas(tokens, gap):
+            await stream.push(delta)
+
+
+async def probe_lag(stop: asyncio.Event, interval: float = 0.005):
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run_scenario(name, make_user, users, frame_cost):
+    socket = FakeSocket(frame_cost)
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(make_user(socket) for _ in range(users)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = sorted(await probe)
+
+    def pct(p):
+        return lags[min(len(lags) - 1, int(p / 100 * len(lags)))] * 1000 if lags else 0.0
+
+    print(f"{name:<12} frames {socket.frames:>8,}  chars {socket.chars:>9,}  wall {elapsed:6.2f}s  "
+          f"loop lag p50 {pct(50):6.2f} ms  p99 {pct(99):7.2f} ms  max {lags[-1] * 1000 if lags else 0:7.2f} ms")
+    return socket.frames
+
+
+async def main(args):
+    random.seed(1)
+    frame_cost = args.frame_cost_us / 1e6
+    gap = args.token_gap_ms / 1000
+    print(f"{args.users} users x {args.tokens} tokens, token gap ~{args.token_gap_ms} ms, "
+          f"frame cost {args.frame_cost_us} µs, flush at {args.flush_chars} chars / {args.flush_ms} ms")
+    before = await run_scenario("per-token", lambda s: per_token_user(s, args.tokens, gap), args.users, frame_cost)
+    after = await run_scenario(
+        "coalesced",
+        lambda s: coalesced_user(s, args.tokens, gap, args.flush_chars, args.flush_ms / 1000),
+        args.users,
+        frame_cost,
+    )
+    print(f"frames reduced {before / max(after, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-token and coalesced stream flushing.")
+    parser.add_argument("--users", type=int, default=200, help="concurrent streams (default: 200)")
+    parser.add_argument("--tokens", type=int, default=200, help="tokens per stream (default: 200)")
+    parser.add_argument("--token-gap-ms", type=float, default=5, help="mean gap between tokens (default: 5)")
+    parser.add_argument("--frame-cost-us", type=float, default=40, help="CPU cost per websocket frame (default: 40)")
+    parser.add_argument("--flush-chars", type=int, default=64, help="coalescer size threshold (default: 64)")
+    parser.add_argument("--flush-ms", type=float, default=30, help="coalescer time threshold (default: 30)")
+    asyncio.run(main(parser.parse_args()))
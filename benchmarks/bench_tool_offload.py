@@ -0,0 +1,125 @@
+# Event-loop lag while tools are slow: blocking sync tool vs @bounded (thread pool) vs async httpx.
+#
+#   uv run benchmarks/bench_tool_offload.py
+#   uv run benchmarks/bench_tool_offload.py --calls 50 --delay-ms 500
+#
+# Starts a local HTTP server that answers after --delay-ms (a slow weather API), then
+# invokes each tool variant --calls times concurrently through the SDK's FunctionTool
+# path, exactly as an agent run would. A probe task sleeps 10 ms in a loop and records
+# how late it wakes up: that lag is what every other user on the event loop waits.
+# The tool HTTP client is warmed up first, as the apps do at startup, and each variant
+# runs --rounds bursts: the first one also pays for starting the pool's threads.
+# (Recent openai-agents releases run sync function tools in a worker thread themselves,
+# so there the blocking variant shows no lag; the versions in the apps' uv.lock files call
+# them on the loop.)
+import sys
+import time
+import asyncio
+import inspect
+import argparse
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+import requests
+from agents import function_tool
+from agents.tool_context import ToolContext
+from shared.async_tools import bounded, get_http_client, warm_up_http_client
+
+
+def start_slow_server(delay: float) -> str:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = b'{"temp_c": 31}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    ThreadingHTTPServer.request_queue_size = 128  # many clients connect at once
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/weather"
+
+
+def make_tools(url, timeout):
+    @function_tool
+    def blocking_weather(city: str) -> str:
+        """Old style: requests.get on the event loop."""
+        return requests.get(url, params={"q": city}, timeout=timeout).text
+
+    @function_tool
+    @bounded(timeout=timeout, max_concurrency=16)
+    def offloaded_weather(city: str) -> str:
+        """Same sync code, run in the bounded thread pool."""
+        return requests.get(url, params={"q": city}, timeout=timeout).text
+
+    @function_tool
+    @bounded(timeout=timeout, max_concurrency=16)
+    async def async_weather(city: str) -> str:
+        """Async httpx on the shared pool."""
+        response = await get_http_client().get(url, params={"q": city})
+        return response.text
+
+    return [blocking_weather, offloaded_weather, async_weather]
+
+
+async def probe_lag(stop, interval=0.01):
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return sorted(lags)
+
+
+def tool_context(tool, call_id: str, arguments: str) -> ToolContext:
+    """What the runner passes to a tool; newer openai-agents also require the call's arguments."""
+    kwargs = {"tool_name": tool.name, "tool_call_id": call_id}
+    if "tool_arguments" in inspect.signature(ToolContext).parameters:
+        kwargs["tool_arguments"] = arguments
+    return ToolContext(context=None, **kwargs)
+
+
+async def run_variant(tool, calls, round):
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop))
+    await asyncio.sleep(0.05)  # baseline samples before the burst
+    started = time.perf_counter()
+    arguments = '{"city": "Karachi"}'
+    results = await asyncio.gather(*(
+        tool.on_invoke_tool(tool_context(tool, str(i), arguments), arguments)
+        for i in range(calls)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = await probe
+    ok = sum("temp_c" in str(r) for r in results)
+    p50 = lags[len(lags) // 2] * 1000
+    worst = lags[-1] * 1000
+    print(f"{tool.name:<18} #{round}  {ok:>3}/{calls} ok  wall {elapsed:6.2f}s  "
+          f"loop lag p50 {p50:7.1f} ms  max {worst:7.1f} ms")
+
+
+async def main(args):
+    url = start_slow_server(args.delay_ms / 1000)
+    print(f"{args.calls} concurrent tool calls, API answers after {args.delay_ms:.0f} ms")
+    await warm_up_http_client()
+    for tool in make_tools(url, timeout=args.delay_ms / 1000 * 20):
+        for round in range(1, args.rounds + 1):
+            await run_variant(tool, args.calls, round)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show event-loop lag for blocking vs non-blocking tools.")
+    parser.add_argument("--calls", type=int, default=20, help="concurrent tool calls (default: 20)")
+    parser.add_argument("--delay-ms", type=float, default=300, help="slow API response time (default: 300)")
+    parser.add_argument("--rounds", type=int, default=2, help="bursts per variant (default: 2)")
+    asyncio.run(main(parser.parse_args()))
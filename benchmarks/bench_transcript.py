@@ -0,0 +1,96 @@
+# Per-turn history build time: old 03-chat-history prompt rebuild vs Conversation / ContextWindow.
+#
+#   uv run benchmarks/bench_transcript.py                # 1,000-turn sessions
+#   uv run benchmarks/bench_transcript.py --turns 5000 --sessions 3
+#
+# "Build time" is everything the app does per message before calling Runner.run:
+# the old code appended to `history` and re-rendered the whole prompt string; the new
+# code appends one item to a Conversation and hands over its input items. ContextWindow
+# (what 03 uses now) is a Conversation that also trims what it hands over to a token
+# budget; no summarizer runs here, so it shows the cost of the budgeting alone.
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.conversation import Conversation
+from shared.context_window import ContextWindow
+
+USER_MESSAGE = "Can you explain that again with a short example, please? " * 2
+ASSISTANT_MESSAGE = "Sure. Here is a longer explanation with an example that covers the main idea. " * 5
+
+
+def old_build(history, message):
+    """What 03-chat-history/main.py did before: rebuild the full prompt every turn."""
+    history.append({"role": "user", "content": message})
+    prompt = ""
+    for msg in history:
+        if msg["role"] == "user":
+            prompt += f"User: {msg['content']}\n"
+        else:
+            prompt += f"Assistant: {msg['content']}\n"
+    prompt += "Assistant:"
+    return prompt
+
+
+def new_build(conversation, message):
+    conversation.add_user(message)
+    return conversation.to_input_items()
+
+
+def run_session(turns, build, state, on_reply):
+    timings = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        build(state, USER_MESSAGE)
+        timings.append(time.perf_counter() - started)
+        on_reply(state, ASSISTANT_MESSAGE)
+    return timings
+
+
+def summarize(name, sessions):
+    turns = len(sessions[0])
+    per_turn = [sum(s[i] for s in sessions) / len(sessions) for i in range(turns)]
+    checkpoints = [i for i in (1, 10, 100, 500, 1000, 5000, turns) if i <= turns]
+    points = "  ".join(f"t{i}={per_turn[i - 1] * 1e6:.1f}µs" for i in sorted(set(checkpoints)))
+    total = sum(per_turn)
+    print(f"{name:<14} total {total * 1000:9.2f} ms/session  {points}")
+    return total
+
+
+def main(args):
+    old_sessions = [
+        run_session(args.turns, old_build, [], lambda h, m: h.append({"role": "assistant", "content": m}))
+        for _ in range(args.sessions)
+    ]
+    new_sessions = [
+        run_session(args.turns, new_build, Conversation(), lambda c, m: c.add_assistant(m))
+        for _ in range(args.sessions)
+    ]
+    window_sessions = [
+        run_session(args.turns, new_build, ContextWindow(), lambda c, m: c.add_assistant(m))
+        for _ in range(args.sessions)
+    ]
+
+    print(f"{args.sessions} session(s) x {args.turns} turns, per-turn build time (mean over sessions):")
+    old_total = summarize("prompt rebuild", old_sessions)
+    new_total = summarize("Conversation", new_sessions)
+    window_total = summarize("ContextWindow", window_sessions)
+    print(f"speedup: {old_total / new_total:.0f}x (Conversation), {old_total / window_total:.0f}x (ContextWindow)")
+
+    # Work done per turn by the app itself: the old code re-rendered the whole prompt,
+    # the new code renders just the new message.
+    history = []
+    last_prompt = ""
+    for _ in range(args.turns):
+        last_prompt = old_build(history, USER_MESSAGE)
+        history.append({"role": "assistant", "content": ASSISTANT_MESSAGE})
+    print(f"chars rendered on the last turn: prompt rebuild {len(last_prompt):,} | Conversation {len(USER_MESSAGE):,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark history building for long chat sessions.")
+    parser.add_argument("--turns", type=int, default=1000, help="user turns per session (default: 1000)")
+    parser.add_argument("--sessions", type=int, default=5, help="sessions to average over (default: 5)")
+    main(parser.parse_args())
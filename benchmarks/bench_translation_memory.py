@@ -0,0 +1,117 @@
+# Hit ratio, model tokens and latency with the sentence-level translation memory.
+#
+#   uv run benchmarks/bench_translation_memory.py
+#   uv run benchmarks/bench_translation_memory.py --messages 2000 --repeat 0.7
+#
+# Replays a stream of translator messages built like real traffic: most sentences come
+# from a pool of recurring UI strings, greetings and boilerplate (--repeat of them), the
+# rest are one-off sentences. Translations come from an offline stand-in for the agent
+# (time to first token plus a fixed ms per output token, tokens estimated at ~4
+# chars/token like the context window), so the numbers are about what is sent, not
+# about Gemini. Baseline: every message translated whole, as 08-translator did.
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent
+from shared.context_window import estimate_tokens
+from shared.translation_memory import TranslationMemory
+
+COMMON = [
+    "Hello, how are you?", "Thank you for your order.", "Your payment was received.",
+    "Please contact support if you have any questions.", "Our office is closed on Sunday.",
+    "Click the button below to reset your password.", "Welcome back!", "Have a nice day.",
+    "Your package has been shipped.", "We will reply within 24 hours.", "Good morning.",
+    "The meeting is moved to tomorrow.", "Please find the invoice attached.", "See you soon.",
+    "Your account has been updated.", "Sorry for the inconvenience.", "Delivery is free this week.",
+    "Do not share your password with anyone.", "Best regards.", "Thanks for reaching out.",
+]
+WORDS = "price order city weather train ticket friend family market school river garden phone".split()
+
+agent = Agent(
+    name="French Translator",
+    instructions="You translate the user's message to French. Provide accurate translations and maintain the original meaning.",
+)
+
+
+def messages(count, repeat, seed=11):
+    rng = random.Random(seed)
+    for i in range(count):
+        sentences = []
+        for _ in range(rng.randint(1, 5)):
+            if rng.random() < repeat:
+                sentences.append(rng.choice(COMMON))
+            else:
+                sentences.append(" ".join(rng.choices(WORDS, k=rng.randint(5, 12))).capitalize() + f" #{i}.")
+        yield " ".join(sentences)
+
+
+class FakeTranslator:
+    """Counts what a translator agent run would cost and waits as long as it would take."""
+
+    def __init__(self, ttft_ms, ms_per_token, expansion=1.2):
+        self.ttft = ttft_ms / 1000
+        self.per_token = ms_per_token / 1000
+        self.expansion = expansion
+        self.requests = self.input_tokens = self.output_tokens = 0
+
+    async def __call__(self, agent, input, **kwargs):
+        out_tokens = int(estimate_tokens(input) * self.expansion)
+        self.requests += 1
+        self.input_tokens += estimate_tokens(agent.instructions) + estimate_tokens(input)
+        self.output_tokens += out_tokens
+        await asyncio.sleep(self.ttft + out_tokens * self.per_token)
+        return SimpleNamespace(final_output=f"[fr] {input}")
+
+
+async def main(args):
+    plan = list(messages(args.messages, args.repeat))
+    print(f"{args.messages} messages, {args.repeat:.0%} recurring sentences, "
+          f"TTFT {args.ttft_ms:.0f} ms, {args.ms_per_token:g} ms/output token (model)")
+
+    baseline = FakeTranslator(args.ttft_ms, args.ms_per_token)
+    latencies = []
+    for message in plan:
+        started = time.perf_counter()
+        await baseline(agent, message)
+        latencies.append(time.perf_counter() - started)
+    report("whole message", baseline, latencies)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = TranslationMemory(os.path.join(tmp, "tm.sqlite3"))
+        fake = FakeTranslator(args.ttft_ms, args.ms_per_token)
+        latencies = []
+        for message in plan:
+            started = time.perf_counter()
+            await memory.translate(message, agent, "French", runner=fake)
+            latencies.append(time.perf_counter() - started)
+        report("translation memory", fake, latencies)
+        stats = memory.stats()
+        print(f"memory: {stats['entries']} sentences stored, hit ratio {stats['hit_ratio']:.0%}, "
+              f"~{stats['tokens_saved']:,} tokens saved; model tokens "
+              f"{(fake.input_tokens + fake.output_tokens) / (baseline.input_tokens + baseline.output_tokens):.0%} of baseline")
+        memory.close()
+
+
+def report(name, translator, latencies):
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p90 = latencies[int(len(latencies) * 0.9)] * 1000
+    print(f"{name:<19} requests {translator.requests:>5}  in tok {translator.input_tokens:>8,}  "
+          f"out tok {translator.output_tokens:>8,}  latency p50 {p50:7.1f} ms  p90 {p90:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the translation memory on repetitive translator traffic.")
+    parser.add_argument("--messages", type=int, default=500, help="messages to translate (default: 500)")
+    parser.add_argument("--repeat", type=float, default=0.6, help="share of recurring sentences (default: 0.6)")
+    parser.add_argument("--ttft-ms", type=float, default=20, help="model time to first token (default: 20)")
+    parser.add_argument("--ms-per-token", type=float, default=0.5, help="model generation speed (default: 0.5)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+# Latency and tokens: triage hop vs direct dispatch to the chosen language's translator.
+#
+#   uv run benchmarks/bench_translator_dispatch.py                 # offline token/latency model
+#   uv run benchmarks/bench_translator_dispatch.py --live          # real Gemini calls (GEMINI_API_KEY)
+#
+# 08-translator sent English, Spanish, German and Chinese to the triage agent even
+# though the sidebar already named the language. The triage request carries the
+# triage instructions and one handoff tool schema per translator (ten of them) and
+# generates a handoff call; only then does the translator run, with the handoff call
+# and its result in its input. Direct dispatch runs the translator alone.
+#
+# Offline, the requests are built from the same Agent objects the app uses: tool
+# schemas come from the SDK's handoff objects and tokens are estimated at ~4 chars per
+# token like the context window. Latency is time to first token plus output tokens at
+# a fixed speed per request. --live runs both paths and reads the usage the API reports.
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from agents import Agent, Runner, handoff
+from shared.agent_registry import AgentRegistry
+from shared.context_window import estimate_tokens
+
+LANGUAGES = ["Urdu", "Hindi", "Arabic", "Japanese", "French", "English", "Spanish", "German", "Chinese", "Italian"]
+MESSAGE = "Please let the team know that tomorrow's meeting has moved to 3 pm in the second-floor conference room."
+HANDOFF_CALL_TOKENS = 20  # {"name": "transfer_to_spanish_translator", "arguments": "{}"}
+
+
+def translator(language):
+    return Agent(
+        name=f"{language} Translator",
+        handoff_description=f"Specialist agent for translating messages to {language}",
+        instructions=f"You translate the user's message to {language}. Provide accurate translations and maintain the original meaning.",
+    )
+
+
+agents = AgentRegistry()
+for language in LANGUAGES:
+    agents.register(language)(lambda language=language: translator(language))
+
+
+@agents.register("Triage")
+def triage_agent():
+    return Agent(
+        name="Triage Agent",
+        instructions="You determine which agent to use based on the user's request for translation."
+        "If multi-language translation is asked by the user then you will give tasks to each relevant agent.",
+        handoffs=[agents.get(language) for language in LANGUAGES],
+    )
+
+
+def handoff_schema_tokens(agent) -> int:
+    total = 0
+    for target in agent.handoffs:
+        h = handoff(target)
+        total += estimate_tokens(json.dumps({"name": h.tool_name, "description": h.tool_description,
+                                             "parameters": h.input_json_schema}))
+    return total
+
+
+def offline(args):
+    triage = agents.get("Triage")
+    target = agents.get(args.language)
+    message_tokens = estimate_tokens(MESSAGE)
+    out_tokens = int(message_tokens * args.expansion)
+    schemas = handoff_schema_tokens(triage)
+
+    triage_in = estimate_tokens(triage.instructions) + schemas + message_tokens
+    after_handoff_in = estimate_tokens(target.instructions) + message_tokens + 2 * HANDOFF_CALL_TOKENS
+    via_triage = (2, triage_in + after_handoff_in, HANDOFF_CALL_TOKENS + out_tokens,
+                  2 * args.ttft_ms + (HANDOFF_CALL_TOKENS + out_tokens) * args.ms_per_token)
+    direct = (1, estimate_tokens(target.instructions) + message_tokens, out_tokens,
+              args.ttft_ms + out_tokens * args.ms_per_token)
+
+    print(f"{args.language}, {message_tokens} token message; triage carries {len(triage.handoffs)} handoff "
+          f"schemas (~{schemas} tokens); TTFT {args.ttft_ms:.0f} ms, {args.ms_per_token:g} ms/output token (model)")
+    print(f"{'path':<16} {'requests':>8} {'in tok':>7} {'out tok':>8} {'latency':>9}")
+    for name, (requests, tokens_in, tokens_out, latency) in [("via triage", via_triage), ("direct", direct)]:
+        print(f"{name:<16} {requests:>8} {tokens_in:>7} {tokens_out:>8} {latency:>7.0f}ms")
+    print(f"direct dispatch saves {via_triage[1] + via_triage[2] - direct[1] - direct[2]} tokens "
+          f"({1 - (direct[1] + direct[2]) / (via_triage[1] + via_triage[2]):.0%}) and "
+          f"{via_triage[3] - direct[3]:.0f} ms per request")
+
+
+async def live(args):
+    from shared.model_client import get_config
+    config = get_config()
+    print(f"{args.language}, live Gemini calls, {args.runs} runs each")
+    for name, agent in [("via triage", agents.get("Triage")), ("direct", agents.get(args.language))]:
+        tokens_in = tokens_out = requests = 0
+        latencies = []
+        for _ in range(args.runs):
+            prompt = MESSAGE if name == "direct" else f"Translate to {args.language}: {MESSAGE}"
+            started = time.perf_counter()
+            result = await Runner.run(agent, prompt, run_config=config)
+            latencies.append(time.perf_counter() - started)
+            usage = result.context_wrapper.usage
+            tokens_in += usage.input_tokens
+            tokens_out += usage.output_tokens
+            requests += usage.requests
+        latencies.sort()
+        print(f"{name:<16} requests/run {requests / args.runs:4.1f}  in tok/run {tokens_in / args.runs:7.0f}  "
+              f"out tok/run {tokens_out / args.runs:6.0f}  latency p50 {latencies[len(latencies) // 2]:5.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the triage hop with direct translator dispatch.")
+    parser.add_argument("--language", default="Spanish", choices=LANGUAGES, help="target language (default: Spanish)")
+    parser.add_argument("--ttft-ms", type=float, default=450, help="model time to first token (default: 450)")
+    parser.add_argument("--ms-per-token", type=float, default=8, help="model generation speed (default: 8)")
+    parser.add_argument("--expansion", type=float, default=1.2, help="output/input token ratio (default: 1.2)")
+    parser.add_argument("--live", action="store_true", help="call Gemini instead of the offline model")
+    parser.add_argument("--runs", type=int, default=5, help="live runs per path (default: 5)")
+    args = parser.parse_args()
+    asyncio.run(live(args)) if args.live else offline(args)
@@ -0,0 +1,116 @@
+# Multi-city weather: one city at a time vs the concurrent WeatherBoard.
+#
+#   uv run benchmarks/bench_weather_board.py
+#   uv run benchmarks/bench_weather_board.py --cities 100 --delay-ms 300 --rpm 600
+#
+# Runs against shared/weather_stub.py (no API key or network needed).
+#   fetch    --cities forecasts one after another, as the single-city UI does per click,
+#            then through WeatherBoard at several concurrency limits (fresh cache each time)
+#   refresh  a few cities' temperatures move between two refreshes; a plain refresh inside
+#            the cache TTL sees none of it, a forced one ("🔄 Refresh") must report exactly
+#            those as changed (and nothing on a forced refresh with no change)
+#   units    °C -> °F / kph -> mph for every city: a Python loop over rows vs the
+#            column-wise NumPy conversion, at --cities rows and at 100x that
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+import pandas as pd
+from shared.weather_client import WeatherClient
+from shared.weather_data import WeatherData
+from shared.weather_stub import WeatherStub
+from shared.weather_board import TEMPERATURE_COLUMNS, WIND_COLUMNS, WeatherBoard, convert_units, summarize
+from shared.stream_metrics import MetricsRegistry
+
+
+def weather(stub, ttl=600):
+    return WeatherData(WeatherClient(base_url=stub.url, ttl=ttl, stale_ttl=ttl, app="bench", metrics=MetricsRegistry()))
+
+
+async def fetch(args, stub, cities):
+    started, requests = time.perf_counter(), stub.total_requests
+    data = weather(stub)
+    for city in cities:
+        await data.forecast(city)
+    baseline = time.perf_counter() - started
+    print(f"{'one by one':<16} {baseline:6.2f}s  {stub.total_requests - requests} requests")
+
+    for concurrency in args.concurrency:
+        started, requests = time.perf_counter(), stub.total_requests
+        update = await WeatherBoard(weather(stub), max_concurrency=concurrency, requests_per_minute=args.rpm).refresh(cities)
+        elapsed = time.perf_counter() - started
+        print(f"{f'board x{concurrency}':<16} {elapsed:6.2f}s  {stub.total_requests - requests} requests  "
+              f"{baseline / elapsed:5.1f}x faster  ({len(update.table)} rows, {len(update.errors)} errors)")
+    return update
+
+
+async def refresh(args, stub, cities):
+    board = WeatherBoard(weather(stub))  # cached for 10 minutes, like the app
+    first = await board.refresh(cities)
+    moved = cities[::max(1, len(cities) // args.changes)][:args.changes]
+    for city in moved:
+        stub.offsets[city.casefold()] = 1.5
+    cached = await board.refresh(cities)
+    second = await board.refresh(cities, force=True)
+    third = await board.refresh(cities, force=True)
+    for city in moved:
+        del stub.offsets[city.casefold()]
+    ok = not cached.changed and sorted(second.changed) == sorted(moved) and not third.changed
+    print(f"refresh: first {len(first.changed)} cities drawn; after moving {len(moved)} temperatures "
+          f"{len(cached.changed)} changed from cache, {len(second.changed)} on a forced refresh; "
+          f"unchanged forced refresh {len(third.changed)} changed  {'OK' if ok else 'MISMATCH'}")
+
+
+def loop_convert(table):
+    rows = []
+    for city, row in table.iterrows():  # what per-city code does: one value at a time
+        row = row.copy()
+        for column in TEMPERATURE_COLUMNS:
+            row[column] = (row[column] * 9 / 5) + 32
+        for column in WIND_COLUMNS:
+            row[column] = row[column] * 0.621371
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def units(table):
+    for rows in (len(table), len(table) * 100):
+        big = pd.concat([table] * (rows // len(table)))
+        timings = {}
+        for name, convert in (("row loop", loop_convert), ("vectorized", lambda t: convert_units(t, "Fahrenheit"))):
+            started = time.perf_counter()
+            converted = convert(big)
+            timings[name] = time.perf_counter() - started
+        assert abs(converted["temp °F"].to_numpy() - (big["temp_c"].to_numpy() * 9 / 5 + 32)).max() < 1e-9
+        print(f"units: {rows:>6} rows  row loop {timings['row loop'] * 1000:8.1f} ms  "
+              f"vectorized {timings['vectorized'] * 1000:6.2f} ms  "
+              f"({timings['row loop'] / timings['vectorized']:.0f}x)")
+
+
+async def main(args):
+    stub = WeatherStub(delay=args.delay_ms / 1000).start()
+    cities = [f"City {i}" for i in range(args.cities)]
+    print(f"{args.cities} cities, API answers after {args.delay_ms:.0f} ms"
+          + (f", {args.rpm:g} requests/min" if args.rpm else ""))
+    try:
+        update = await fetch(args, stub, cities)
+        await refresh(args, stub, cities)
+        units(update.table)
+        summary = summarize(update.table)
+        print(f"summary: mean {summary['mean_temp_c']:.1f} °C, hottest {summary['hottest']}, "
+              f"coldest {summary['coldest']}, rain likely in {summary['rain_likely']} cities")
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare one-by-one and concurrent multi-city weather fetching.")
+    parser.add_argument("--cities", type=int, default=50, help="cities on the board (default: 50)")
+    parser.add_argument("--delay-ms", type=float, default=200, help="stub API latency (default: 200)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 10, 25], help="board limits to try")
+    parser.add_argument("--rpm", type=float, default=None, help="client-side requests/minute limit (default: none)")
+    parser.add_argument("--changes", type=int, default=5, help="cities that change between refreshes (default: 5)")
+    asyncio.run(main(parser.parse_args()))
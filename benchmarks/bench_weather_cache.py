@@ -0,0 +1,110 @@
+# Upstream requests and latency for weather tool calls: uncached vs WeatherClient.
+#
+#   uv run benchmarks/bench_weather_cache.py
+#   uv run benchmarks/bench_weather_cache.py --users 200 --cities 30 --delay-ms 300
+#
+# Runs against shared/weather_stub.py (no API key or network needed). Each simulated
+# user asks for a few cities drawn from a skewed (Zipf-like) popularity list, all users
+# at once, the way lunchtime traffic hits the weather tools. Then three checks:
+#   burst   --users concurrent calls for one city must cause one upstream request
+#   stale   after the TTL the old answer is served instantly while one refresh runs
+#   errors  a failing city is not cached and concurrent callers all see the error
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from shared.async_tools import get_http_client
+from shared.weather_client import WeatherClient
+from shared.weather_stub import WeatherStub
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def workload(users, cities, calls_per_user, seed=7):
+    names = [f"City {i}" for i in range(cities)]
+    weights = [1 / (rank + 1) for rank in range(cities)]
+    rng = random.Random(seed)
+    # Users type the same city in different ways; the cache key normalizes that
+    return [[rng.choice([name, name.lower(), f"  {name.upper()} "]) for name in rng.choices(names, weights, k=calls_per_user)]
+            for _ in range(users)]
+
+
+async def run_users(lookup, plan):
+    latencies = []
+
+    async def user(cities):
+        for city in cities:
+            started = time.perf_counter()
+            await lookup(city)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(cities) for cities in plan))
+    return time.perf_counter() - started, latencies
+
+
+async def main(args):
+    stub = WeatherStub(delay=args.delay_ms / 1000).start()
+    plan = workload(args.users, args.cities, args.calls)
+    calls = args.users * args.calls
+    print(f"{args.users} users x {args.calls} calls over {args.cities} cities, API answers after {args.delay_ms:.0f} ms")
+
+    async def uncached(city):
+        response = await get_http_client().get(f"{stub.url}/current.json", params={"key": "x", "q": city}, timeout=30)
+        return response.json()
+
+    client = WeatherClient(base_url=stub.url, api_key="x", request_timeout=30)
+    for name, lookup in [("uncached", uncached), ("WeatherClient", client.current)]:
+        before = stub.total_requests
+        wall, latencies = await run_users(lookup, plan)
+        upstream = stub.total_requests - before
+        print(f"{name:<14} upstream {upstream:>5}/{calls}  wall {wall:6.2f}s  "
+              f"latency p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms")
+    print(f"cache stats: {client.stats()}")
+
+    # burst: everyone asks for the same, uncached city at the same moment
+    client = WeatherClient(base_url=stub.url, api_key="x", request_timeout=30)
+    before = stub.total_requests
+    results = await asyncio.gather(*(client.current("Burst Town") for _ in range(args.users)))
+    upstream = stub.total_requests - before
+    assert upstream == 1 and all(r is results[0] for r in results), upstream
+    print(f"burst          {args.users} concurrent calls -> {upstream} upstream request ({client.outcomes['coalesced']} coalesced)")
+
+    # stale: past the TTL the old copy is returned at once and refreshed in the background
+    client = WeatherClient(base_url=stub.url, api_key="x", ttl=0.2, stale_ttl=60, request_timeout=30)
+    await client.current("Stale City")
+    await asyncio.sleep(0.3)
+    before = stub.total_requests
+    started = time.perf_counter()
+    await asyncio.gather(*(client.current("Stale City") for _ in range(10)))
+    served_in = time.perf_counter() - started
+    await asyncio.sleep(args.delay_ms / 1000 + 0.2)  # let the refresh land
+    refreshed = await client.current("Stale City")
+    assert stub.total_requests - before == 1 and client.outcomes["hit"] == 1, client.stats()
+    print(f"stale          10 calls after the TTL served in {served_in * 1000:.1f} ms, "
+          f"{stub.total_requests - before} background refresh, then fresh again ({refreshed['location']['name']})")
+
+    # errors: failures are shared by concurrent callers but never cached
+    client = WeatherClient(base_url=stub.url, api_key="x", request_timeout=30)
+    before = stub.total_requests
+    results = await asyncio.gather(*(client.current("Nowhere") for _ in range(5)), return_exceptions=True)
+    await asyncio.gather(client.current("nowhere"), return_exceptions=True)
+    assert all(isinstance(r, Exception) for r in results) and stub.total_requests - before == 2
+    print(f"errors         5 concurrent failing calls -> 1 request, retried on the next call; not cached")
+    stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare uncached weather lookups with WeatherClient.")
+    parser.add_argument("--users", type=int, default=100, help="concurrent users (default: 100)")
+    parser.add_argument("--cities", type=int, default=20, help="distinct cities (default: 20)")
+    parser.add_argument("--calls", type=int, default=5, help="weather calls per user (default: 5)")
+    parser.add_argument("--delay-ms", type=float, default=300, help="stub API response time (default: 300)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,140 @@
+# Time per sidebar interaction in 09-weather-api-app: rebuilt vs cached hourly chart.
+#
+#   uv run benchmarks/bench_weather_rerun.py
+#   uv run benchmarks/bench_weather_rerun.py --interactions 100 --app
+#
+# Every widget change reruns the Streamlit script. Runs a minimal version of the 09
+# forecast section under AppTest against shared/weather_stub.py, then clicks through
+# --interactions sidebar changes (switch the unit, toggle "Show hourly forecast") and
+# times each rerun:
+#   rebuilt  what main.py did: DataFrame + pd.to_datetime + px.line on every rerun
+#   cached   hourly_frame / hourly_figure keyed by (city, data timestamp[, unit])
+# Reported: mean and p90 time per interaction, and the part spent in the hourly
+# section. --app also times the same clicks on the real 09 main.py.
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for the shared/ package
+from streamlit.testing.v1 import AppTest
+from shared.weather_stub import WeatherStub
+
+
+def app(variant: str, base_url: str):
+    import time
+    import pandas as pd
+    import plotly.express as px
+    import streamlit as st
+    from shared.background_loop import run
+    from shared.weather_client import WeatherClient, normalize_city
+    from shared.weather_data import WeatherData
+
+    @st.cache_resource
+    def get_weather_data():
+        return WeatherData(WeatherClient(base_url=base_url, app="bench"))
+
+    @st.cache_data(max_entries=64, show_spinner=False)
+    def hourly_frame(city, updated, _hours):
+        hours_df = pd.DataFrame(_hours, columns=['time', 'temp_c'])
+        hours_df['time'] = pd.to_datetime(hours_df['time']).dt.strftime('%I:%M %p')
+        hours_df['temp_f'] = hours_df['temp_c'] * 9/5 + 32
+        return hours_df
+
+    @st.cache_resource(max_entries=64, show_spinner=False)
+    def hourly_figure(city, updated, unit, _hours):
+        hours_df = hourly_frame(city, updated, _hours)
+        hours_df['temp'] = hours_df['temp_c'] if unit == "Celsius" else hours_df['temp_f']
+        fig = px.line(hours_df, x='time', y='temp', title='Hourly Temperature', markers=True)
+        fig.update_traces(line=dict(color='skyblue'), marker=dict(size=6))
+        return fig
+
+    with st.sidebar:
+        city_input = st.text_input("📍 Enter city name", value="Karachi")
+        show_hourly = st.checkbox("🕒 Show hourly forecast", value=True)
+        unit = st.radio("🌡️ Temperature Unit", ["Celsius", "Fahrenheit"])
+
+    forecast = run(get_weather_data().forecast(city_input))
+    daily_data = forecast.days
+    started = time.perf_counter()
+    if show_hourly:
+        st.subheader("🕒 Hourly Weather Forecast")
+        if variant == "rebuilt":
+            hours_df = pd.DataFrame(daily_data[0].hours, columns=['time', 'temp_c'])
+            hours_df['time'] = pd.to_datetime(hours_df['time']).dt.strftime('%I:%M %p')
+            hours_df['temp'] = hours_df['temp_c'] if unit == "Celsius" else (hours_df['temp_c'] * 9/5) + 32
+            fig = px.line(hours_df, x='time', y='temp', title='Hourly Temperature', markers=True)
+            fig.update_traces(line=dict(color='skyblue'), marker=dict(size=6))
+        else:
+            updated = f"{forecast.current.last_updated}/{daily_data[0].date}"
+            fig = hourly_figure(normalize_city(city_input), updated, unit, daily_data[0].hours)
+        st.plotly_chart(fig, use_container_width=True)
+    st.session_state.section_seconds = time.perf_counter() - started
+
+
+def click(at, step):
+    """Sidebar changes in a fixed cycle: unit, unit, hourly off, hourly on."""
+    action = step % 4
+    if action in (0, 1):
+        radio = at.sidebar.radio[-1]
+        radio.set_value("Fahrenheit" if radio.value == "Celsius" else "Celsius")
+    else:
+        checkbox = at.sidebar.checkbox[0]
+        checkbox.set_value(not checkbox.value)
+
+
+def interactions(at, count, section=True):
+    at.run()  # first load: fetch and, for the cached variant, fill the caches
+    assert not at.exception, at.exception
+    times, sections = [], []
+    for step in range(count):
+        click(at, step)
+        started = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - started)
+        assert not at.exception, at.exception
+        if section:
+            sections.append(at.session_state.section_seconds)
+    return sorted(times), sections
+
+
+def report(name, times, sections=None):
+    mean = sum(times) / len(times) * 1000
+    p90 = times[int(len(times) * 0.9)] * 1000
+    line = f"{name:<20} {mean:7.1f} ms/interaction  p90 {p90:7.1f} ms"
+    if sections:
+        line += f"  hourly section {sum(sections) / len(sections) * 1000:6.1f} ms"
+    print(line)
+    return mean
+
+
+def main(args):
+    stub = WeatherStub().start()
+    os.environ["WEATHER_API_URL"] = stub.url  # read when the app first imports shared.weather_client
+    os.environ.setdefault("GEMINI_API_KEY", "x")  # the app builds its model client at startup
+    print(f"{args.interactions} sidebar interactions (unit switch / hourly toggle), weather stub at {stub.url}")
+    try:
+        results = {}
+        for variant in ["rebuilt", "cached"]:
+            at = AppTest.from_function(app, default_timeout=60, kwargs={"variant": variant, "base_url": stub.url})
+            times, sections = interactions(at, args.interactions)
+            results[variant] = report(variant, times, sections)
+        print(f"cached reruns take {results['cached'] / results['rebuilt']:.0%} of the rebuilt ones")
+
+        if args.app:
+            at = AppTest.from_file(str(Path(__file__).resolve().parents[1] / "09-weather-api-app" / "main.py"),
+                                   default_timeout=60)
+            at.run()
+            at.sidebar.checkbox[0].set_value(True)
+            times, _ = interactions(at, args.interactions, section=False)
+            report("09 main.py", times)
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time Streamlit reruns with and without the hourly chart caches.")
+    parser.add_argument("--interactions", type=int, default=40, help="sidebar changes to time (default: 40)")
+    parser.add_argument("--app", action="store_true", help="also time the real 09-weather-api-app/main.py")
+    main(parser.parse_args())
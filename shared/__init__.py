@@ -0,0 +1,3 @@
+# Helpers shared by all the example apps in this repo.
+# Apps add the repo root to sys.path and import from here, e.g.:
+#     from shared.model_client import get_model, get_config
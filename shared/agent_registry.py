@@ -0,0 +1,55 @@
+# Prebuilt agents shared by every chat session.
+#
+# The 07-function-tools apps built a new Agent (and, before the shared model client, a
+# new AsyncOpenAI client and model) in every @cl.on_chat_start and kept it in
+# cl.user_session, so memory and chat start time grew with the number of sessions. An
+# agent holds no per-session state, so one instance per process is enough:
+#
+#     agents = AgentRegistry()
+#
+#     @agents.register("weather")
+#     def weather_assistant():
+#         return Agent(name="Weather Assistant", tools=[get_weather], model=get_model())
+#
+#     result = await Runner.run(agents.get("weather"), input, run_config=config)
+#
+# Treat registered agents as read-only; use agent.clone(...) for a variant. Anything
+# that differs per session belongs in the session (e.g. its history), not on the agent.
+import threading
+
+
+class AgentRegistry:
+    """Builds each registered agent once, on first use, and returns the same instance after that."""
+
+    def __init__(self):
+        self._factories = {}
+        self._agents = {}
+        self._lock = threading.RLock()  # reentrant: a factory may get() the agents it hands off to
+        self.builds = 0
+
+    def register(self, name: str):
+        """Decorator registering a zero-argument factory that builds the agent `name`."""
+        def decorator(factory):
+            if name in self._factories:
+                raise ValueError(f"Agent {name!r} is already registered")
+            self._factories[name] = factory
+            return factory
+        return decorator
+
+    def get(self, name: str):
+        agent = self._agents.get(name)
+        if agent is None:
+            with self._lock:
+                agent = self._agents.get(name)
+                if agent is None:
+                    agent = self._agents[name] = self._factories[name]()
+                    self.builds += 1
+        return agent
+
+    def prebuild(self) -> None:
+        """Builds every registered agent now, e.g. at app startup, so no chat pays for it."""
+        for name in self._factories:
+            self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
@@ -0,0 +1,159 @@
+# Non-blocking execution for function tools.
+#
+# The SDK calls a sync @function_tool directly on the event loop, so a tool doing
+# requests.get() freezes every other chat (and every token being streamed) until the
+# HTTP call returns. Two ways out, both with a per-tool timeout and concurrency limit:
+#
+#   1. keep the sync function and let @bounded run it in a shared, bounded thread pool:
+#
+#          @function_tool
+#          @bounded(timeout=5, max_concurrency=4)
+#          def get_weather(city: str) -> str:
+#              return requests.get(...).text
+#
+#   2. make it async on the shared httpx connection pool (preferred for HTTP tools):
+#
+#          @function_tool
+#          @bounded(timeout=5, max_concurrency=8)
+#          async def get_weather(city: str) -> str:
+#              response = await get_http_client().get(...)
+#
+# @bounded goes under @function_tool and keeps the function's signature and docstring,
+# so the tool schema is unchanged. A timed-out call raises TimeoutError, which the SDK
+# reports to the model as a tool error. A timed-out thread cannot be killed; it keeps
+# its pool slot until the blocking call returns, which the pool size bounds.
+#
+# Creating an httpx client loads the CA bundle, 15-30 ms of blocking work that would
+# land on the event loop the first time a tool runs on it. Every client shares one SSL
+# context instead, and apps build it and their client at startup with
+# `await warm_up_http_client()`, which loads the bundle in a worker thread.
+import os
+import ssl
+import time
+import asyncio
+import functools
+import inspect
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+
+TOOL_THREADS = int(os.getenv("TOOL_THREADS", "16"))
+TOOL_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60)
+TOOL_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """The shared, bounded thread pool that sync tools run in."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=TOOL_THREADS, thread_name_prefix="tool")
+    return _executor
+
+
+class PerLoop:
+    """One object per event loop, made by `factory` on first use in that loop.
+
+    For things bound to the loop that created them, like httpx connection pools. The
+    object is closed (`aclose()`) and forgotten when asyncio.run() shuts its loop down,
+    since that cancels every task still pending; a loop that runs forever keeps it.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._items = weakref.WeakKeyDictionary()  # event loop -> (object, task closing it)
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        entry = self._items.get(loop)
+        if entry is None:
+            item = self.factory()
+            entry = self._items[loop] = (item, loop.create_task(self._close_on_shutdown(loop, item)))
+        return entry[0]
+
+    def peek(self):
+        """The running loop's object if one was made, without making it."""
+        entry = self._items.get(asyncio.get_running_loop())
+        return entry[0] if entry else None
+
+    async def _close_on_shutdown(self, loop, item):
+        try:
+            await loop.create_future()  # never set; cancelled when the loop shuts down
+        finally:
+            self._items.pop(loop, None)
+            await item.aclose()
+
+
+@functools.cache
+def ssl_context() -> ssl.SSLContext:
+    """The SSL context (CA bundle loaded) shared by every httpx client of the process."""
+    return httpx.create_ssl_context()
+
+
+_http_clients = PerLoop(lambda: httpx.AsyncClient(limits=TOOL_HTTP_LIMITS, timeout=TOOL_HTTP_TIMEOUT,
+                                                  verify=ssl_context()))
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Pooled httpx client for tools, one per event loop.
+
+    Connections belong to the loop that opened them, and scripts and CLIs start a new
+    loop for every asyncio.run(), so the pool is kept per loop and closed with it.
+    """
+    return _http_clients.get()
+
+
+async def warm_up_http_client() -> None:
+    """Creates this loop's tool client ahead of the first tool call, loading certificates off the loop."""
+    await asyncio.to_thread(ssl_context)
+    get_http_client()
+
+
+def bounded(timeout: float | None = 10, max_concurrency: int = 8):
+    """Decorator giving a tool function a timeout and a concurrency limit; sync functions run in the thread pool."""
+    def decorator(func):
+        semaphores = weakref.WeakKeyDictionary()  # asyncio primitives are bound to one loop
+
+        def semaphore():
+            loop = asyncio.get_running_loop()
+            if loop not in semaphores:
+                semaphores[loop] = asyncio.Semaphore(max_concurrency)
+            return semaphores[loop]
+
+        if inspect.iscoroutinefunction(func):
+            async def call(*args, **kwargs):
+                return await func(*args, **kwargs)
+        else:
+            async def call(*args, **kwargs):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with semaphore():
+                try:
+                    return await asyncio.wait_for(call(*args, **kwargs), timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"{func.__name__} did not finish within {timeout}s") from None
+
+        return wrapper
+    return decorator
+
+
+class RateLimiter:
+    """Spaces out request starts to at most `per_minute` per minute (None: no limit)."""
+
+    def __init__(self, per_minute: float | None):
+        self.interval = 60 / per_minute if per_minute else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = max(self._next, time.monotonic()) + self.interval
@@ -0,0 +1,115 @@
+# One long-lived event loop per Streamlit server process.
+#
+# The Streamlit apps called asyncio.run() on every button press. That builds and tears
+# down an event loop each time, so the shared Gemini client's connections (which belong
+# to the loop that opened them) could never be reused, and the next run on a new loop
+# could fail with "attached to a different loop" / "Event loop is closed" errors.
+#
+# Here a single loop runs in a daemon thread for the life of the process (the module
+# is imported once, Streamlit only re-executes the app script), and script threads
+# hand it coroutines:
+#
+#     result = run(Runner.run(agent, history, run_config=config))   # instead of asyncio.run
+#
+#     for delta in stream(text_deltas(agent, history)):              # async iterator -> script thread
+#         placeholder.markdown(text := text + delta)
+#
+#     updates = stream_updates(lambda emit: fan_out(message, translators, on_delta=emit))
+#     for language, delta in updates:                                # whatever is passed to emit(...)
+#         ...
+#     outputs = updates.result                                       # the coroutine's return value
+#
+# Streamlit calls (st.*, placeholders) only work in the script thread, so coroutines
+# on the loop should not touch the UI; they yield or emit values and the script thread
+# renders them. If the script stops early (a rerun, the user leaving) the coroutine is
+# cancelled.
+import time
+import queue
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_loop = None
+_lock = threading.Lock()
+_DONE = object()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide background loop, started on first use."""
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="background-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """Schedules `coro` on the background loop; returns a concurrent.futures.Future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run(coro, timeout: float | None = None):
+    """Runs `coro` on the background loop and waits for its result, like asyncio.run()."""
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()  # timeout, or the script thread is being stopped
+        raise
+
+
+class Updates:
+    """Iterating gives the values a coroutine emits as they come; `result` is its return value."""
+
+    def __init__(self, make_coro, timeout: float | None = None):
+        self._make_coro = make_coro
+        self._timeout = timeout
+        self._queue = queue.Queue()
+        self.result = None
+
+    async def _main(self):
+        async def emit(*item):
+            self._queue.put(item[0] if len(item) == 1 else item)
+
+        try:
+            return await self._make_coro(emit)
+        finally:
+            self._queue.put(_DONE)
+
+    def __iter__(self):
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+        future = submit(self._main())
+        try:
+            while True:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    raise TimeoutError(f"No result within {self._timeout}s") from None
+                if item is _DONE:
+                    self.result = future.result()
+                    return
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+
+def stream_updates(make_coro, timeout: float | None = None) -> Updates:
+    """Runs make_coro(emit) on the background loop; iterate the result for what it emits."""
+    return Updates(make_coro, timeout)
+
+
+def stream(aiterable, timeout: float | None = None):
+    """Iterates an async iterable (e.g. an async generator) on the background loop,
+    yielding its items in the calling thread."""
+    async def pump(emit):
+        async for item in aiterable:
+            await emit(item)
+
+    return iter(Updates(pump, timeout))
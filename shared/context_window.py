@@ -0,0 +1,158 @@
+# Token-budgeted sliding context window with a rolling summary.
+#
+# The chat apps used to append to cl.user_session["history"] forever and send all of
+# it on every turn, so long chats got slower and more expensive until they hit the
+# model's context limit. A ContextWindow is a Conversation (conversation.py: turns as
+# input items) that keeps the most recent turns verbatim and folds older turns into a
+# rolling summary written by a cheap summarizer agent. It keeps no running transcript,
+# which would grow forever; transcript() renders the summary and the current turns.
+#
+#     window = ContextWindow(max_tokens=3000)
+#     window.add_user(message.content)
+#     result = Runner.run_streamed(agent, window.to_input_items(), run_config=config)
+#     ...stream the reply...
+#     window.add_assistant(result.final_output)
+#     window.summarize_in_background()   # never delays the user's turn
+#
+# Summarization only ever starts after the reply has been sent. Until it finishes the
+# turns being folded stay in the window, and to_input_items() still respects the
+# budget by dropping the oldest turns from what is sent.
+#
+# With a `store` (see session_store.py) every turn and summary is written through to
+# it, and ContextWindow.load() rebuilds a window from the store.
+import asyncio
+import logging
+from agents import Agent, Runner
+from shared.model_client import get_config
+from shared.conversation import Conversation, format_turn
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODEL_NAME = "gemini-2.0-flash-lite"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+summarizer_agent = Agent(
+    name="Conversation Summarizer",
+    instructions=(
+        "You maintain a running summary of a conversation between a user and an assistant. "
+        "Merge the existing summary with the new turns into one concise summary. Keep names, "
+        "numbers, decisions, open questions and user preferences. Reply with the summary only."
+    ),
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) plus a little per-message overhead."""
+    return len(text) // 4 + 4
+
+
+class ContextWindow(Conversation):
+    """Chat history that stays within a token budget by summarizing old turns."""
+
+    def __init__(self, max_tokens: int = 3000, keep_recent: int = 6, summary_model: str = SUMMARY_MODEL_NAME,
+                 store=None, session_id: str | None = None):
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent  # turns that are never folded into the summary
+        self.summary_model = summary_model
+        self.store = store
+        self.session_id = session_id
+        self.summary = ""
+        self._offset = 0  # number of turns already folded into the summary
+        self._item_tokens = []
+        self._total_tokens = 0
+        self._task = None
+
+    @classmethod
+    def load(cls, store, session_id: str, **kwargs) -> "ContextWindow":
+        """Rebuilds a session's window (summary + verbatim turns) from a session store."""
+        window = cls(store=store, session_id=session_id, **kwargs)
+        summary, offset, items = store.load(session_id)
+        window.summary = summary
+        window._offset = offset
+        for item in items:
+            window._append(item["role"], item["content"])
+        return window
+
+    def add(self, role: str, content: str) -> None:
+        if self.store is not None:
+            self.store.append(self.session_id, self._offset + len(self._items), role, content)
+        self._append(role, content)
+
+    def _append(self, role: str, content: str) -> None:
+        self._items.append({"role": role, "content": content})  # not Conversation.add: no transcript
+        tokens = estimate_tokens(content)
+        self._item_tokens.append(tokens)
+        self._total_tokens += tokens
+
+    def transcript(self) -> str:
+        """The summary (if any) and the verbatim turns as "User: ...\\nAssistant: ..." text."""
+        head = format_turn("system", SUMMARY_PREFIX + self.summary) if self.summary else ""
+        return head + "".join(format_turn(item["role"], item["content"]) for item in self._items)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the summary plus all verbatim turns."""
+        return self._total_tokens + (estimate_tokens(self.summary) if self.summary else 0)
+
+    def to_input_items(self) -> list[dict]:
+        """Summary (if any) followed by the newest turns that fit in the budget."""
+        budget = self.max_tokens
+        head = []
+        if self.summary:
+            head.append({"role": "system", "content": SUMMARY_PREFIX + self.summary})
+            budget -= estimate_tokens(head[0]["content"])
+
+        start = len(self._items)
+        while start > 0:
+            cost = self._item_tokens[start - 1]
+            if cost > budget and start < len(self._items):  # the latest message is always sent
+                break
+            budget -= cost
+            start -= 1
+        return head + self._items[start:]
+
+    def summarize_in_background(self) -> asyncio.Task | None:
+        """Folds old turns into the summary in a background task if the window is over budget.
+
+        Call it after the reply has been sent. Does nothing while a summary is still being written.
+        """
+        if self._task is not None and not self._task.done():
+            return None
+        if self.tokens <= self.max_tokens or len(self._items) <= self.keep_recent:
+            return None
+
+        # Fold the oldest turns until what stays verbatim is back within half the budget.
+        fold = 0
+        remaining = self._total_tokens
+        while len(self._items) - fold > self.keep_recent and remaining > self.max_tokens // 2:
+            remaining -= self._item_tokens[fold]
+            fold += 1
+        if fold == 0:
+            return None
+
+        self._task = asyncio.create_task(self._summarize(fold))
+        return self._task
+
+    async def _summarize(self, fold: int) -> None:
+        turns = "\n".join(f"{item['role'].title()}: {item['content']}" for item in self._items[:fold])
+        prompt = f"Existing summary:\n{self.summary or '(none)'}\n\nNew turns:\n{turns}"
+        try:
+            result = await Runner.run(summarizer_agent, prompt, run_config=get_config(self.summary_model))
+        except Exception as e:
+            logger.warning("Conversation summary failed, keeping turns verbatim: %s", e)
+            return
+
+        # Turns are only ever appended, so the first `fold` items are still the ones we summarized.
+        self.summary = str(result.final_output).strip()
+        self._offset += fold
+        self._total_tokens -= sum(self._item_tokens[:fold])
+        del self._items[:fold]
+        del self._item_tokens[:fold]
+        if self.store is not None:
+            self.store.save_summary(self.session_id, self.summary, self._offset)
+
+    @property
+    def busy(self) -> bool:
+        """True while a background summary is being written."""
+        return self._task is not None and not self._task.done()
@@ -0,0 +1,50 @@
+# Incremental conversation buffer.
+#
+# 03-chat-history used to rebuild one big "User: ...\nAssistant: ..." prompt string
+# from the whole history on every message, so each turn cost O(n) work and a long
+# session O(n^2). A Conversation keeps the history as structured input items (what
+# Runner.run accepts directly) and only ever appends the new turns. The flat text
+# transcript is still available for display/logging and is rendered incrementally too.
+from io import StringIO
+
+ROLE_LABELS = {"user": "User", "assistant": "Assistant", "system": "System"}
+
+
+def format_turn(role: str, content: str) -> str:
+    """One line of the transcript: "User: ..."."""
+    return f"{ROLE_LABELS.get(role, role.title())}: {content}\n"
+
+
+class Conversation:
+    """Append-only chat history exposed as Runner input items."""
+
+    def __init__(self, items=None):
+        self._items = []
+        self._transcript = StringIO()
+        for item in items or []:
+            self.add(item["role"], item["content"])
+
+    def add(self, role: str, content: str) -> None:
+        """Appends one turn; O(1) regardless of how long the conversation is."""
+        self._items.append({"role": role, "content": content})
+        self._transcript.write(format_turn(role, content))
+
+    def add_user(self, content: str) -> None:
+        self.add("user", content)
+
+    def add_assistant(self, content: str) -> None:
+        self.add("assistant", content)
+
+    def to_input_items(self) -> list[dict]:
+        """The history as Runner input items. Returned as-is, not copied: treat it as read-only."""
+        return self._items
+
+    def transcript(self) -> str:
+        """The history rendered as "User: ...\\nAssistant: ..." text."""
+        return self._transcript.getvalue()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
@@ -0,0 +1,123 @@
+# Chunked, order-preserving parallel translation of long documents.
+#
+# The translator sent a whole document as one message: long texts ran into the
+# output-token limit, and nothing appeared until the model had read all of it. Here the
+# document is split into chunks of at most `max_tokens` (whole paragraphs where they
+# fit, else sentences, else words), a bounded pool of workers translates the chunks
+# concurrently, and the translations come out strictly in document order. Each chunk
+# is yielded as soon as it and every chunk before it are done, so the start of the
+# document shows while later chunks are still running:
+#
+#     async for piece in translate_document(text, french_translator_agent, run_config=config):
+#         ...  # chunk translations in order, each followed by its original separator
+#
+# Throughput grows with `max_concurrency` (DOC_CONCURRENCY, default 4) until the
+# provider's rate limit; `requests_per_minute` (DOC_RPM) spaces out chunk requests to
+# stay under it. If a chunk fails, the chunks before it are still delivered and then
+# the error is raised.
+import os
+import re
+import asyncio
+from dataclasses import dataclass
+from agents import Runner
+from shared.async_tools import RateLimiter
+from shared.context_window import estimate_tokens
+from shared.translation_memory import split_segments
+
+DEFAULT_CHUNK_TOKENS = int(os.getenv("DOC_CHUNK_TOKENS", "600"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("DOC_CONCURRENCY", "4"))
+DEFAULT_RPM = float(os.getenv("DOC_RPM", "0")) or None  # 0 = no client-side limit
+
+
+@dataclass
+class Chunk:
+    text: str
+    separator: str  # whitespace that followed the chunk in the original document
+
+
+def _split_long(paragraph: str, max_tokens: int) -> list[str]:
+    """Runs of whole sentences (words, for a giant sentence) of at most `max_tokens`."""
+    units = []
+    for sentence, separator in split_segments(paragraph):
+        if estimate_tokens(sentence) <= max_tokens:
+            units.append(sentence + separator)
+        else:
+            units.extend(re.findall(r"\S+\s*", sentence + separator))
+    pieces, current = [], ""
+    for unit in units:
+        if current and estimate_tokens(current + unit) > max_tokens:
+            pieces.append(current)
+            current = ""
+        current += unit
+    pieces.append(current)
+    return pieces
+
+
+def chunk_document(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> list[Chunk]:
+    """Packs paragraphs (split further when too long) into chunks of at most `max_tokens`."""
+    parts = re.split(r"(\n\s*\n)", text.strip())  # paragraphs and the blank lines between them
+    units = []  # (text, separator after it)
+    for paragraph, separator in zip(parts[::2], parts[1::2] + [""]):
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append((paragraph, separator))
+        else:
+            pieces = _split_long(paragraph, max_tokens)
+            units.extend((piece.rstrip(), piece[len(piece.rstrip()):]) for piece in pieces[:-1])
+            units.append((pieces[-1].rstrip(), separator))
+
+    chunks, current, current_sep = [], "", ""
+    for unit, separator in units:
+        if current and estimate_tokens(current + current_sep + unit) > max_tokens:
+            chunks.append(Chunk(current, current_sep))
+            current, current_sep = "", ""
+        current = current + current_sep + unit if current else unit
+        current_sep = separator
+    if current:
+        chunks.append(Chunk(current, current_sep))
+    return chunks
+
+
+def chunk_input(chunk: Chunk, index: int, total: int) -> list[dict]:
+    """Input for one chunk: the text plus a note that it is part of a longer document."""
+    if total == 1:
+        return [{"role": "user", "content": chunk.text}]
+    note = (f"This is part {index + 1} of {total} of a longer document; the other parts are translated "
+            f"separately. Reply with the translation of this part only, keeping its formatting.")
+    return [{"role": "system", "content": note}, {"role": "user", "content": chunk.text}]
+
+
+async def translate_document(text: str, agent, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                             max_tokens: int = DEFAULT_CHUNK_TOKENS, requests_per_minute: float | None = DEFAULT_RPM,
+                             runner=None, **run_kwargs):
+    """Async generator of chunk translations in document order, each followed by its separator."""
+    runner = runner or Runner.run
+    chunks = chunk_document(text, max_tokens)
+    loop = asyncio.get_running_loop()
+    results = [loop.create_future() for _ in chunks]
+    todo = asyncio.Queue()
+    for index in range(len(chunks)):
+        todo.put_nowait(index)
+    limiter = RateLimiter(requests_per_minute)
+
+    async def worker():
+        while not todo.empty():
+            index = todo.get_nowait()
+            try:
+                await limiter.wait()
+                result = await runner(agent, chunk_input(chunks[index], index, len(chunks)), **run_kwargs)
+                results[index].set_result(str(result.final_output).strip())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results[index].set_exception(e)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency, len(chunks)))]
+    try:
+        for chunk, result in zip(chunks, results):
+            yield await result + chunk.separator
+    finally:
+        for task in workers:
+            task.cancel()
+        for result in results:
+            if result.done() and not result.cancelled():
+                result.exception()  # retrieved, so a failure after the one raised is not logged as lost
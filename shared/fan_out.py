@@ -0,0 +1,82 @@
+# Parallel multi-language fan-out for translation requests.
+#
+# The triage agents in 06-handoffs and 08-translator are told to "give tasks to each
+# relevant agent" for multi-language requests, but a handoff goes to one agent at a time,
+# so "translate this to French, Arabic and Japanese" either comes back in one language
+# or takes the sum of all the translations. fan_out() runs the matching translator
+# agents concurrently instead, so the request takes about as long as the slowest one.
+#
+#     languages = requested_languages(message.content, TRANSLATORS)   # ["French", "Arabic", "Japanese"]
+#     outputs = await fan_out(message.content, {l: TRANSLATORS[l] for l in languages},
+#                             on_delta=show_delta, run_config=config)
+#     reply = merge_translations(outputs)
+#
+# `on_delta(language, text)` is awaited for every streamed delta so each language can
+# be shown in its own panel as it arrives. At most `max_concurrency` translators run
+# at once (FANOUT_CONCURRENCY, default 5).
+#
+# Only an explicit instruction counts as a request for several languages ("to French
+# and German", "into Arabic, Urdu & Hindi"): text that merely mentions languages, like
+# "The French and German teams meet Friday", is something to translate, not a target.
+import os
+import re
+import asyncio
+import logging
+from agents import Runner
+from shared.stream_metrics import TimedStream
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "5"))
+
+
+def requested_languages(text: str, languages) -> list[str]:
+    """Languages from `languages` that `text` asks to translate to ("to/into X, Y and Z"), in order."""
+    names = {language.casefold(): language for language in languages}
+    name = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+    listed = rf"(?:{name})(?:(?:\s*,\s*|\s*,?\s*(?:and|&)\s*)(?:{name}))*"
+    found = []
+    for match in re.finditer(rf"\b(?:to|into)\s+({listed})\b", text, re.IGNORECASE):
+        for language in re.findall(name, match.group(1), re.IGNORECASE):
+            if names[language.casefold()] not in found:
+                found.append(names[language.casefold()])
+    return found
+
+
+def only_this_language(language: str, input) -> list[dict]:
+    """Input for one translator: the conversation plus a note that other languages are handled elsewhere."""
+    items = [{"role": "user", "content": input}] if isinstance(input, str) else list(input)
+    note = (f"The user asked for several languages; the others are handled separately. "
+            f"Reply with the {language} translation only.")
+    return [{"role": "system", "content": note}, *items]
+
+
+async def fan_out(input, translators: dict, on_delta=None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                  app: str = "fan-out", runner=None, **run_kwargs) -> dict[str, str]:
+    """Runs every translator in `translators` ({language: agent}) concurrently on `input`.
+
+    Returns {language: translation} in the order of `translators`. A failed language
+    gets an error line instead of failing the whole request.
+    """
+    runner = runner or Runner.run_streamed
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def translate(language, agent):
+        async with semaphore:
+            result = runner(agent, only_this_language(language, input), **run_kwargs)
+            try:
+                async for event in TimedStream(result, app=app):
+                    if event.type == "raw_response_event" and hasattr(event.data, 'delta') and on_delta:
+                        await on_delta(language, event.data.delta)
+            except Exception as e:
+                logger.warning("%s translation failed: %s", language, e)
+                return f"({language} translation failed: {e})"
+            return str(result.final_output)
+
+    outputs = await asyncio.gather(*(translate(language, agent) for language, agent in translators.items()))
+    return dict(zip(translators, outputs))
+
+
+def merge_translations(outputs: dict[str, str]) -> str:
+    """One reply with a section per language."""
+    return "\n\n".join(f"**{language}:**\n{text}" for language, text in outputs.items())
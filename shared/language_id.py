@@ -0,0 +1,153 @@
+# Local language identification, run before a translator agent is called.
+#
+# A lot of translator traffic needs no model at all: text already in the target
+# language, or nothing to translate (numbers, URLs, emoji). The apps sent all of it
+# through a full LLM round-trip anyway. This is a small character n-gram model (1- to
+# 3-grams, add-one smoothed, trained at first use from shared/language_samples.py) that
+# classifies a message in well under a millisecond:
+#
+#     detection = precheck(message, "French", app="08-translator")
+#     if detection.skip:                       # "no_text" or "same_language"
+#         show(message)                        # returned unchanged, no model run
+#     items = with_source_note(items, detection)  # tells triage the source language
+#
+# The detector only answers when it is sure: at least `min_letters` letters and a
+# posterior of at least `min_confidence`; short or mixed text gets language None and
+# is translated as before, so a wrong guess costs a model run rather than a missing
+# translation. The defaults were chosen on the TUNING set in benchmarks/bench_language_id.py;
+# its HELD_OUT set gives the precision/recall to expect.
+import re
+import math
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from shared.language_samples import SAMPLES
+from shared.stream_metrics import describe_metrics, registry
+
+describe_metrics({
+    "translation_skipped_total": "Translations answered locally without a model run, by reason (no_text, same_language).",
+})
+
+_NOISE = re.compile(r"https?://\S+|www\.\S+|\S+@\S+\.\S+|[@#]\w+")  # URLs, emails, mentions, hashtags
+
+
+def letters_only(text: str) -> str:
+    """Lowercased words of `text` (letters and combining marks), URLs and numbers removed."""
+    text = _NOISE.sub(" ", text).casefold()
+    kept = "".join(ch if unicodedata.category(ch)[0] in "LM" else " " for ch in text)
+    return " ".join(kept.split())
+
+
+def ngrams(text: str, orders=(1, 2, 3)):
+    for word in letters_only(text).split():
+        padded = f" {word} "
+        for n in orders:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip():
+                    yield gram
+
+
+@dataclass(frozen=True)
+class Detection:
+    """What the detector found; `language` is None when there is no text or no confident guess."""
+    language: str | None
+    confidence: float
+    letters: int
+    skip: str | None = None  # why no translation is needed: "no_text", "same_language" or None
+
+
+class LanguageDetector:
+    """Naive Bayes over character 1-3-grams, one profile per language."""
+
+    def __init__(self, samples: dict[str, str] = SAMPLES, orders=(1, 2, 3), min_confidence: float = 0.95,
+                 min_letters: int = 6, evidence: int = 30):
+        self.orders = orders
+        self.min_confidence = min_confidence
+        self.min_letters = min_letters
+        self.evidence = evidence  # n-grams counted at most, so long text does not look infinitely certain
+        self.languages = list(samples)
+        self._profiles = {}  # language -> ({gram: log p}, {order: log p of an unseen gram})
+        vocabulary = {n: set() for n in orders}
+        counts = {}
+        for language, text in samples.items():
+            counts[language] = {}
+            for gram in ngrams(text, orders):
+                counts[language][gram] = counts[language].get(gram, 0) + 1
+                vocabulary[len(gram)].add(gram)
+        for language, grams in counts.items():
+            totals = {n: sum(c for g, c in grams.items() if len(g) == n) for n in orders}
+            unseen = {n: -math.log(totals[n] + len(vocabulary[n]) + 1) for n in orders}
+            logp = {g: math.log(c + 1) + unseen[len(g)] for g, c in grams.items()}
+            self._profiles[language] = (logp, unseen)
+
+    def scores(self, text: str) -> dict[str, float]:
+        """Mean log-likelihood per n-gram for each language."""
+        return self._scores(list(ngrams(text, self.orders)))
+
+    def _scores(self, grams: list[str]) -> dict[str, float]:
+        if not grams:
+            return {}
+        return {
+            language: sum(logp.get(g, unseen[len(g)]) for g in grams) / len(grams)
+            for language, (logp, unseen) in self._profiles.items()
+        }
+
+    def detect(self, text: str) -> Detection:
+        grams = list(ngrams(text, self.orders))
+        letters = sum(1 for g in grams if len(g) == 1)
+        scores = self._scores(grams)
+        if not scores:
+            return Detection(None, 0.0, 0)
+        weight = min(len(grams), self.evidence)
+        best = max(scores.values())
+        total = sum(math.exp((s - best) * weight) for s in scores.values())
+        language = max(scores, key=scores.get)
+        confidence = 1 / total
+        if letters < self.min_letters or confidence < self.min_confidence:
+            return Detection(None, confidence, letters)
+        return Detection(language, confidence, letters)
+
+
+@lru_cache(maxsize=1)
+def get_detector() -> LanguageDetector:
+    """The default detector, trained once per process."""
+    return LanguageDetector()
+
+
+def detect_language(text: str) -> Detection:
+    return get_detector().detect(text)
+
+
+def precheck(text: str, target: str | None = None, app: str = "default", metrics=None, detector=None) -> Detection:
+    """Detects the language of `text` and sets `skip` when it can be returned as it is.
+
+    "no_text": nothing but numbers, URLs, punctuation or emoji. "same_language": the text
+    is confidently in `target` already. Skips are counted in translation_skipped_total.
+    """
+    detection = (detector or get_detector()).detect(text)
+    skip = None
+    if not detection.letters:
+        skip = "no_text"
+    elif target and detection.language and detection.language.casefold() == target.casefold():
+        skip = "same_language"
+    if skip:
+        (metrics or registry).inc("translation_skipped_total", app=app, reason=skip)
+        detection = Detection(detection.language, detection.confidence, detection.letters, skip)
+    return detection
+
+
+def source_note(detection: Detection) -> dict | None:
+    """A system item telling the agent which language the user wrote in, if it is known."""
+    if not detection.language:
+        return None
+    return {"role": "system", "content": f"The user's message is written in {detection.language} "
+                                         f"(detected locally, {detection.confidence:.0%} confidence)."}
+
+
+def with_source_note(items: list[dict], detection: Detection) -> list[dict]:
+    """`items` with the source-language note just before the latest message."""
+    note = source_note(detection)
+    if note is None:
+        return items
+    return [*items[:-1], note, *items[-1:]]
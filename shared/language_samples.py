@@ -0,0 +1,140 @@
+# Training text for the character n-gram language identifier (shared/language_id.py).
+#
+# Everyday sentences per translator language: errands, work, travel, chat. The model
+# is trained from these at first use, so adding a language means adding a sample here
+# (a few hundred characters of ordinary prose is enough for sentence-length input).
+# Keep the test sentences in benchmarks/bench_language_id.py out of this file.
+#
+# "Roman Urdu" is not a translator target; it is here so Urdu typed in Latin letters
+# (common in chat) is recognised as such instead of looking like a confident English
+# or Italian guess that would skip the translation.
+
+SAMPLES = {
+    "English": """
+        The weather is lovely today, so we are going to the park after lunch. Please send me the report
+        before the meeting on Friday. I don't know where I left my keys; have you seen them? Thank you for
+        your help with the project, it was very useful. Our team works from home on Mondays and in the
+        office for the rest of the week. Could you tell me how much the train ticket to the city costs?
+        She has been learning to play the piano since she was a child. The new restaurant near the station
+        serves fresh bread and excellent coffee. If it rains tomorrow, the match will be moved to next
+        weekend. What time does the shop open in the morning? We should think about what happened and why
+        it went wrong. Everyone was happy with the results of the first year. Hello, how are you doing?
+        I would like to book a table for two people this evening. My brother lives with his family in a
+        small house by the river. Which way is the nearest hospital? They were waiting for the bus when it
+        started to snow. Could you please check my order and let me know when it will arrive?
+    """,
+    "French": """
+        Il fait très beau aujourd'hui, alors nous allons au parc après le déjeuner. Merci de m'envoyer le
+        rapport avant la réunion de vendredi. Je ne sais pas où j'ai laissé mes clés ; est-ce que tu les as
+        vues ? Merci pour ton aide sur le projet, elle a été très utile. Notre équipe travaille à la maison
+        le lundi et au bureau le reste de la semaine. Pourriez-vous me dire combien coûte le billet de train
+        pour la ville ? Elle apprend à jouer du piano depuis qu'elle est enfant. Le nouveau restaurant près
+        de la gare sert du pain frais et un excellent café. S'il pleut demain, le match sera déplacé au
+        week-end prochain. À quelle heure le magasin ouvre-t-il le matin ? Nous devons réfléchir à ce qui
+        s'est passé et pourquoi cela n'a pas marché. Tout le monde était content des résultats de la
+        première année. Bonjour, comment allez-vous ? Je voudrais réserver une table pour deux personnes ce
+        soir. Mon frère habite avec sa famille dans une petite maison au bord de la rivière. Où se trouve
+        l'hôpital le plus proche ? Ils attendaient le bus quand il a commencé à neiger. Pouvez-vous vérifier
+        ma commande et me dire quand elle arrivera ?
+    """,
+    "Spanish": """
+        Hoy hace muy buen tiempo, así que vamos al parque después de comer. Por favor, envíame el informe
+        antes de la reunión del viernes. No sé dónde dejé mis llaves; ¿las has visto? Gracias por tu ayuda
+        con el proyecto, fue muy útil. Nuestro equipo trabaja desde casa los lunes y en la oficina el resto
+        de la semana. ¿Podría decirme cuánto cuesta el billete de tren a la ciudad? Ella aprende a tocar el
+        piano desde que era niña. El nuevo restaurante cerca de la estación sirve pan fresco y un café
+        excelente. Si llueve mañana, el partido se cambiará al próximo fin de semana. ¿A qué hora abre la
+        tienda por la mañana? Tenemos que pensar en lo que pasó y por qué salió mal. Todos estaban contentos
+        con los resultados del primer año. Hola, ¿cómo estás? Quisiera reservar una mesa para dos personas
+        esta noche. Mi hermano vive con su familia en una casa pequeña junto al río. ¿Dónde está el hospital
+        más cercano? Estaban esperando el autobús cuando empezó a nevar. ¿Puede revisar mi pedido y decirme
+        cuándo llegará?
+    """,
+    "German": """
+        Heute ist das Wetter sehr schön, deshalb gehen wir nach dem Mittagessen in den Park. Bitte schick
+        mir den Bericht vor der Besprechung am Freitag. Ich weiß nicht, wo ich meine Schlüssel gelassen
+        habe; hast du sie gesehen? Vielen Dank für deine Hilfe bei dem Projekt, sie war sehr nützlich. Unser
+        Team arbeitet montags von zu Hause und den Rest der Woche im Büro. Können Sie mir sagen, wie viel die
+        Fahrkarte in die Stadt kostet? Sie lernt Klavier spielen, seit sie ein Kind war. Das neue Restaurant
+        in der Nähe des Bahnhofs hat frisches Brot und ausgezeichneten Kaffee. Wenn es morgen regnet, wird
+        das Spiel auf das nächste Wochenende verschoben. Um wie viel Uhr öffnet das Geschäft am Morgen? Wir
+        müssen darüber nachdenken, was passiert ist und warum es schiefgegangen ist. Alle waren mit den
+        Ergebnissen des ersten Jahres zufrieden. Hallo, wie geht es dir? Ich möchte für heute Abend einen
+        Tisch für zwei Personen reservieren. Mein Bruder wohnt mit seiner Familie in einem kleinen Haus am
+        Fluss. Wo ist das nächste Krankenhaus? Sie warteten auf den Bus, als es anfing zu schneien. Können
+        Sie bitte meine Bestellung prüfen und mir sagen, wann sie ankommt?
+    """,
+    "Italian": """
+        Oggi fa molto bello, quindi andiamo al parco dopo pranzo. Per favore, mandami il rapporto prima
+        della riunione di venerdì. Non so dove ho lasciato le chiavi; le hai viste? Grazie per il tuo aiuto
+        con il progetto, è stato molto utile. Il nostro gruppo lavora da casa il lunedì e in ufficio il resto
+        della settimana. Potrebbe dirmi quanto costa il biglietto del treno per la città? Lei impara a
+        suonare il pianoforte da quando era bambina. Il nuovo ristorante vicino alla stazione serve pane
+        fresco e un ottimo caffè. Se domani piove, la partita sarà spostata al prossimo fine settimana. A che
+        ora apre il negozio la mattina? Dobbiamo pensare a cosa è successo e perché è andato storto. Tutti
+        erano contenti dei risultati del primo anno. Ciao, come stai? Vorrei prenotare un tavolo per due
+        persone stasera. Mio fratello vive con la sua famiglia in una piccola casa vicino al fiume. Dov'è
+        l'ospedale più vicino? Stavano aspettando l'autobus quando ha cominciato a nevicare. Può controllare
+        il mio ordine e dirmi quando arriverà?
+    """,
+    "Urdu": """
+        آج موسم بہت اچھا ہے، اس لیے ہم دوپہر کے کھانے کے بعد پارک جا رہے ہیں۔ براہ کرم جمعہ کی میٹنگ سے
+        پہلے مجھے رپورٹ بھیج دیں۔ مجھے نہیں معلوم کہ میں نے اپنی چابیاں کہاں رکھی ہیں، کیا آپ نے انہیں دیکھا
+        ہے؟ منصوبے میں آپ کی مدد کا شکریہ، یہ بہت مفید تھی۔ ہماری ٹیم پیر کو گھر سے اور باقی ہفتہ دفتر سے کام
+        کرتی ہے۔ کیا آپ مجھے بتا سکتے ہیں کہ شہر کے لیے ریل گاڑی کا ٹکٹ کتنے کا ہے؟ وہ بچپن سے پیانو بجانا
+        سیکھ رہی ہے۔ اسٹیشن کے قریب نیا ریستوران تازہ روٹی اور بہترین کافی پیش کرتا ہے۔ اگر کل بارش ہوئی تو
+        میچ اگلے ہفتے کے آخر تک ملتوی کر دیا جائے گا۔ دکان صبح کتنے بجے کھلتی ہے؟ ہمیں سوچنا چاہیے کہ کیا ہوا
+        اور کیوں غلط ہوا۔ پہلے سال کے نتائج سے سب خوش تھے۔ السلام علیکم، آپ کیسے ہیں؟ میں آج رات دو لوگوں
+        کے لیے میز بک کروانا چاہتا ہوں۔ میرا بھائی اپنے خاندان کے ساتھ دریا کے کنارے ایک چھوٹے سے گھر میں
+        رہتا ہے۔ سب سے قریبی ہسپتال کہاں ہے؟ وہ بس کا انتظار کر رہے تھے جب برف پڑنے لگی۔
+    """,
+    "Hindi": """
+        आज मौसम बहुत अच्छा है, इसलिए हम दोपहर के खाने के बाद पार्क जा रहे हैं। कृपया शुक्रवार की बैठक से
+        पहले मुझे रिपोर्ट भेज दें। मुझे नहीं पता कि मैंने अपनी चाबियाँ कहाँ रखी हैं, क्या आपने उन्हें देखा है?
+        परियोजना में आपकी मदद के लिए धन्यवाद, यह बहुत उपयोगी थी। हमारी टीम सोमवार को घर से और बाकी हफ्ते
+        दफ्तर से काम करती है। क्या आप मुझे बता सकते हैं कि शहर के लिए रेल का टिकट कितने का है? वह बचपन से
+        पियानो बजाना सीख रही है। स्टेशन के पास नया रेस्तराँ ताज़ी रोटी और बढ़िया कॉफ़ी देता है। अगर कल बारिश
+        हुई तो मैच अगले सप्ताहांत तक टाल दिया जाएगा। दुकान सुबह कितने बजे खुलती है? हमें सोचना चाहिए कि क्या
+        हुआ और क्यों गलत हुआ। पहले साल के नतीजों से सब खुश थे। नमस्ते, आप कैसे हैं? मैं आज रात दो लोगों के
+        लिए मेज़ बुक करना चाहता हूँ। मेरा भाई अपने परिवार के साथ नदी के किनारे एक छोटे से घर में रहता है।
+        सबसे नज़दीकी अस्पताल कहाँ है? वे बस का इंतज़ार कर रहे थे जब बर्फ़ गिरने लगी।
+    """,
+    "Arabic": """
+        الطقس جميل جدا اليوم، لذلك سنذهب إلى الحديقة بعد الغداء. من فضلك أرسل لي التقرير قبل اجتماع يوم
+        الجمعة. لا أعرف أين تركت مفاتيحي، هل رأيتها؟ شكرا لمساعدتك في المشروع، لقد كانت مفيدة جدا. يعمل
+        فريقنا من المنزل يوم الاثنين ومن المكتب بقية الأسبوع. هل يمكنك أن تخبرني كم تكلف تذكرة القطار إلى
+        المدينة؟ إنها تتعلم العزف على البيانو منذ أن كانت طفلة. المطعم الجديد بالقرب من المحطة يقدم خبزا
+        طازجا وقهوة ممتازة. إذا أمطرت غدا فسيتم تأجيل المباراة إلى نهاية الأسبوع القادم. في أي ساعة يفتح
+        المتجر في الصباح؟ يجب أن نفكر فيما حدث ولماذا فشل. كان الجميع سعداء بنتائج السنة الأولى. مرحبا، كيف
+        حالك؟ أريد أن أحجز طاولة لشخصين هذا المساء. يعيش أخي مع عائلته في بيت صغير بجانب النهر. أين أقرب
+        مستشفى؟ كانوا ينتظرون الحافلة عندما بدأ الثلج يتساقط.
+    """,
+    "Japanese": """
+        今日はとても天気がいいので、昼ご飯の後で公園に行きます。金曜日の会議の前に報告書を送ってください。
+        鍵をどこに置いたか分かりません。見ましたか？プロジェクトを手伝ってくれてありがとう。とても役に立ちました。
+        私たちのチームは月曜日は家で、残りの週は会社で働いています。町までの電車の切符はいくらか教えていただけますか？
+        彼女は子供の頃からピアノを習っています。駅の近くの新しいレストランでは、焼きたてのパンとおいしいコーヒーが出ます。
+        明日雨が降ったら、試合は来週末に延期されます。お店は朝何時に開きますか？何が起きたのか、なぜうまくいかなかったのかを
+        考えるべきです。みんな一年目の結果に満足していました。こんにちは、お元気ですか？今晩二人で席を予約したいです。
+        兄は家族と一緒に川のそばの小さな家に住んでいます。一番近い病院はどこですか？バスを待っていたら雪が降り始めました。
+    """,
+    "Chinese": """
+        今天天气很好，所以我们吃完午饭后去公园。请在星期五的会议之前把报告发给我。我不知道把钥匙放在哪里了，
+        你看见了吗？谢谢你帮忙做这个项目，非常有用。我们的团队星期一在家工作，其余时间在办公室。你能告诉我去市里的
+        火车票多少钱吗？她从小就开始学弹钢琴。车站附近的新餐厅有新鲜的面包和很好的咖啡。如果明天下雨，比赛将推迟到
+        下个周末。商店早上几点开门？我们应该想想发生了什么，为什么会出问题。大家对第一年的结果都很满意。你好，你最近
+        怎么样？我想订今晚两个人的桌子。我哥哥和他的家人住在河边的一个小房子里。最近的医院在哪里？他们在等公共汽车的
+        时候开始下雪了。
+    """,
+    "Roman Urdu": """
+        Aaj mausam bohat acha hai, is liye hum dopehar ke khane ke baad park ja rahe hain. Meherbani kar ke
+        jumma ki meeting se pehle mujhe report bhej dein. Mujhe nahi pata ke maine apni chabiyan kahan rakhi
+        hain, kya aap ne unhein dekha hai? Project mein aap ki madad ka shukriya, ye bohat mufeed thi. Hamari
+        team peer ko ghar se aur baqi hafta daftar se kaam karti hai. Kya aap mujhe bata sakte hain ke shehar
+        ke liye train ka ticket kitne ka hai? Wo bachpan se piano bajana seekh rahi hai. Agar kal barish hui
+        to match agle hafte tak multavi kar diya jaye ga. Dukaan subah kitne baje khulti hai? Humein sochna
+        chahiye ke kya hua aur kyun ghalat hua. Assalam o alaikum, aap kaise hain? Main theek hoon, aap sunao.
+        Mera bhai apne khandan ke sath darya ke kinare ek chhote se ghar mein rehta hai. Sab se qareeb
+        hospital kahan hai? Yaar kal zaroor aana, bohat maza aaye ga.
+    """,
+}
@@ -0,0 +1,113 @@
+# One process-wide Gemini client, model and RunConfig shared by every app.
+#
+# Before this, every app (and in 07-function-tools every chat session) built its own
+# AsyncOpenAI client, so each one paid a fresh TCP + TLS handshake with Gemini.
+# Here the client is created once per process with a tuned connection pool and
+# keep-alive, uses HTTP/2 when the `h2` package is installed, and can be warmed up
+# at startup so the first user request already finds an open connection.
+#
+# The connections themselves belong to the event loop that opened them, and the apps
+# that call asyncio.run() per request start a new loop every time, so the client keeps
+# one connection pool per loop (LoopTransport) and closes it when that loop shuts down.
+# A warm-up therefore only helps the loop it runs on: call warm_up() on the loop that
+# serves the requests (Chainlit's startup hook, the Streamlit apps' background loop).
+import os
+import asyncio
+import logging
+import weakref
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from agents import OpenAIChatCompletionsModel, RunConfig
+from shared.async_tools import PerLoop, ssl_context
+
+logger = logging.getLogger(__name__)
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+DEFAULT_MODEL_NAME = "gemini-2.0-flash"
+
+# Keep enough idle connections around for concurrent chat sessions and don't let
+# them expire between messages of a normal conversation.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=300)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_client = None
+_models = {}
+_configs = {}
+_warmed_up = weakref.WeakSet()  # event loops whose pool already has a connection open
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class LoopTransport(httpx.AsyncBaseTransport):
+    """Sends each request through the connection pool of the running event loop."""
+
+    def __init__(self, limits: httpx.Limits = HTTP_LIMITS, http2: bool = False):
+        self._pools = PerLoop(lambda: httpx.AsyncHTTPTransport(limits=limits, http2=http2, verify=ssl_context()))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pools.get().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pool = self._pools.peek()  # only a pool this loop already has; don't open one to close it
+        if pool is not None:
+            await pool.aclose()
+
+
+def get_client() -> AsyncOpenAI:
+    """Returns the shared Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY is not set in the environment variables.")
+
+        http_client = DefaultAsyncHttpxClient(
+            transport=LoopTransport(HTTP_LIMITS, http2=http2_available()),
+            timeout=HTTP_TIMEOUT,
+        )
+        _client = AsyncOpenAI(api_key=api_key, base_url=GEMINI_BASE_URL, http_client=http_client)
+    return _client
+
+
+def get_model(model_name: str = DEFAULT_MODEL_NAME) -> OpenAIChatCompletionsModel:
+    """Returns the shared chat completions model for `model_name`."""
+    if model_name not in _models:
+        _models[model_name] = OpenAIChatCompletionsModel(model=model_name, openai_client=get_client())
+    return _models[model_name]
+
+
+def get_config(model_name: str = DEFAULT_MODEL_NAME) -> RunConfig:
+    """Returns the shared RunConfig (tracing disabled) for `model_name`."""
+    if model_name not in _configs:
+        _configs[model_name] = RunConfig(
+            model=get_model(model_name),
+            model_provider=get_client(),
+            tracing_disabled=True,
+        )
+    return _configs[model_name]
+
+
+async def warm_up() -> None:
+    """Opens a connection to Gemini from the running event loop ahead of the first real request.
+
+    Lists the models, which costs no tokens. Does nothing once it has succeeded on this
+    loop; failures are logged rather than raised so an app can still start offline, and
+    the next call tries again.
+    """
+    loop = asyncio.get_running_loop()
+    if loop in _warmed_up:
+        return
+    try:
+        await asyncio.to_thread(ssl_context)  # load certificates off the loop
+        await get_client().models.list()
+    except Exception as e:
+        logger.warning("Gemini warm-up failed: %s", e)
+        return
+    _warmed_up.add(loop)
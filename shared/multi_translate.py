@@ -0,0 +1,61 @@
+# Single-call multi-target translation with a structured output.
+#
+# fan_out() runs one translator agent per language: N requests, and the source text
+# (plus instructions) is paid for N times as input tokens. For short texts one call
+# that returns every translation at once is cheaper:
+#
+#     translations = await translate_all(text, ["French", "Arabic"], run_config=config)
+#     # {"French": "...", "Arabic": "..."}
+#
+# The agent's output_type is a list of (language, text) pairs rather than a dict, since
+# strict JSON schemas cannot describe free-form keys. It is a trade, not a free win:
+# the whole answer arrives at once (nothing streams), one generation of N translations
+# takes longer than N parallel ones, and the JSON wrapping costs output tokens. So it
+# is opt-in (SINGLE_CALL_TRANSLATION=1, or the toggle in 08-translator) and even then
+# only used for short texts; see use_single_call() and benchmarks/bench_multi_translate.py.
+import os
+from pydantic import BaseModel
+from agents import Agent, Runner
+
+SINGLE_CALL_ENABLED = os.getenv("SINGLE_CALL_TRANSLATION", "0") == "1"
+SINGLE_CALL_MAX_CHARS = int(os.getenv("SINGLE_CALL_MAX_CHARS", "200"))
+
+
+class Translation(BaseModel):
+    language: str
+    text: str
+
+
+class MultiTranslation(BaseModel):
+    translations: list[Translation]
+
+
+multi_translator_agent = Agent(
+    name="Multi Translator",
+    instructions=(
+        "You translate the user's text into every language they list. Provide accurate translations "
+        "and maintain the original meaning. Return exactly one translation per listed language, "
+        "using the language names as given."
+    ),
+    output_type=MultiTranslation,
+)
+
+
+def use_single_call(text: str, enabled: bool = SINGLE_CALL_ENABLED, max_chars: int = SINGLE_CALL_MAX_CHARS) -> bool:
+    """Whether to use one structured call for `text`: only when opted in, and only for short texts."""
+    return enabled and len(text) <= max_chars
+
+
+def multi_translation_prompt(text: str, languages: list[str]) -> str:
+    return f"Languages: {', '.join(languages)}\n\nText:\n{text}"
+
+
+async def translate_all(text: str, languages: list[str], runner=None, **run_kwargs) -> dict[str, str]:
+    """Translates `text` into all `languages` with one model call; returns {language: translation}."""
+    runner = runner or Runner.run
+    result = await runner(multi_translator_agent, multi_translation_prompt(text, languages), **run_kwargs)
+    by_language = {t.language.strip().casefold(): t.text for t in result.final_output.translations}
+    return {
+        language: by_language.get(language.casefold(), f"({language} translation missing from the reply)")
+        for language in languages
+    }
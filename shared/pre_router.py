@@ -0,0 +1,188 @@
+# Deterministic pre-router: skip the triage LLM hop when the right specialist is obvious.
+#
+# 05-tools and 06-handoffs always ran the triage agent first, which costs a full model
+# round-trip just to pick a handoff. A PreRouter looks at the user's message before
+# that and, when it is confident, starts the run at the specialist directly:
+#
+#     router = PreRouter(triage_agent, rules={math_tutor_agent.name: [r"\d+\s*[+*^]\s*\d+", "equation"]})
+#     decision = await router.route(message.content)
+#     result = Runner.run_streamed(decision.agent, history.to_input_items(), run_config=config)
+#
+# Two deciders, tried in order:
+#   1. keyword/regex rules per specialist; a message matching exactly one specialist is routed.
+#   2. optional nearest-centroid classifier: each specialist's handoff_description (plus any
+#      example questions) is embedded once and the message goes to the closest centroid,
+#      if it is close enough and clearly closer than the runner-up.
+# Anything else, including messages that match several specialists, goes to the triage
+# agent as before; rules can also name the triage agent itself to keep messages it must
+# handle (e.g. translation requests in 05-tools) away from the specialists.
+#
+# Decisions and an estimate of the latency saved (skips x the measured cost of a
+# triage hop, learned from runs that did go through triage) are counted in the
+# stream_metrics registry and in stats().
+import re
+import math
+import hashlib
+from dataclasses import dataclass
+from shared.semantic_cache import gemini_embed, normalize
+from shared.stream_metrics import describe_metrics, registry
+
+describe_metrics({
+    "prerouter_decisions_total": "Pre-router decisions, by method and chosen agent.",
+    "prerouter_saved_seconds_total": "Estimated triage time saved by routing directly to a specialist.",
+    "prerouter_triage_hop_seconds": "Measured time the triage agent spent before handing off.",
+})
+
+
+def hashed_embed_sync(text: str, dims: int = 512) -> list[float]:
+    """Local, dependency-free embedding: hashed word and character-trigram counts."""
+    vector = [0.0] * dims
+    words = re.findall(r"\w+", text.casefold())
+    features = words + [w[i:i + 3] for w in words for i in range(max(1, len(w) - 2))]
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=4).digest()
+        vector[int.from_bytes(digest, "little") % dims] += 1.0
+    return vector
+
+
+async def hashed_embed(text: str) -> list[float]:
+    return hashed_embed_sync(text)
+
+
+# (threshold, margin) that kept misroutes at zero on benchmarks/bench_pre_router.py;
+# the hashed embedding gives much lower similarities than a real embedding model.
+CONFIDENCE = {hashed_embed: (0.25, 0.15), gemini_embed: (0.70, 0.05)}
+
+
+def get_embedder(name: str | None):
+    """Embedder for the centroid classifier by name: "local", "gemini", or None/"" for rules only."""
+    if not name:
+        return None
+    return {"local": hashed_embed, "gemini": gemini_embed}[name]
+
+
+@dataclass
+class RouteDecision:
+    agent: object  # the Agent to start the run with
+    method: str  # "rule", "embedding" or "triage"
+    confidence: float
+    skipped_triage: bool
+
+
+class PreRouter:
+    """Chooses the specialist for a message without an LLM call, or falls back to triage."""
+
+    def __init__(self, triage_agent, rules: dict | None = None, embed=None, examples: dict | None = None,
+                 threshold: float | None = None, margin: float | None = None, app: str = "default", metrics=None):
+        self.triage_agent = triage_agent
+        self.specialists = list(triage_agent.handoffs)
+        self.embed = embed  # async text -> vector; None disables the centroid classifier
+        self.examples = examples or {}  # {agent name: [example questions]} to sharpen the centroids
+        default_threshold, default_margin = CONFIDENCE.get(embed, (0.55, 0.08))
+        self.threshold = default_threshold if threshold is None else threshold
+        self.margin = default_margin if margin is None else margin  # lead over the runner-up agent
+        self.app = app
+        self.metrics = metrics or registry
+        # Agents are unhashable dataclasses, so rules and examples are keyed by agent name
+        agents = {agent.name: agent for agent in [triage_agent, *self.specialists]}
+        self._rules = []
+        for name, patterns in (rules or {}).items():
+            if name not in agents:
+                raise ValueError(f"Pre-router rule for unknown agent {name!r}; expected one of {list(agents)}")
+            compiled = [re.compile(p if _is_regex(p) else rf"\b{re.escape(p)}\b", re.IGNORECASE) for p in patterns]
+            self._rules.append((agents[name], compiled))
+        self._centroids = None
+        self.decisions = {"rule": 0, "embedding": 0, "triage": 0}
+        self.triage_hops = 0
+        self.triage_hop_seconds = 0.0
+
+    def match_rules(self, text: str):
+        """The single specialist whose rules match `text`, or None if none or several do.
+
+        The triage agent wins whenever its own rules match.
+        """
+        matched = [agent for agent, patterns in self._rules if any(p.search(text) for p in patterns)]
+        if any(agent is self.triage_agent for agent in matched):
+            return self.triage_agent
+        return matched[0] if len(matched) == 1 else None
+
+    async def _build_centroids(self):
+        centroids = []
+        for agent in self.specialists:
+            texts = [agent.handoff_description or agent.name, *self.examples.get(agent.name, [])]
+            vectors = [normalize(await self.embed(t)) for t in texts]
+            centroids.append((agent, normalize([sum(column) for column in zip(*vectors)])))
+        return centroids
+
+    async def classify(self, text: str):
+        """(agent, similarity, margin over the runner-up) from the nearest centroid."""
+        if self._centroids is None:
+            self._centroids = await self._build_centroids()
+        vector = normalize(await self.embed(text))
+        scored = sorted(((math.sumprod(vector, c), agent) for agent, c in self._centroids),
+                        key=lambda pair: pair[0], reverse=True)
+        best, agent = scored[0]
+        runner_up = scored[1][0] if len(scored) > 1 else -1.0
+        return agent, best, best - runner_up
+
+    async def rank(self, text: str) -> list:
+        """Specialists from most to least likely for `text`: rule matches first, then by centroid similarity."""
+        matched = [agent for agent, patterns in self._rules if any(p.search(text) for p in patterns)]
+        ranked = [agent for agent in matched if agent is not self.triage_agent]
+        rest = [agent for agent in self.specialists if all(agent is not r for r in ranked)]
+        if self.embed is not None and rest:
+            if self._centroids is None:
+                self._centroids = await self._build_centroids()
+            vector = normalize(await self.embed(text))
+            similarity = {agent.name: math.sumprod(vector, c) for agent, c in self._centroids}
+            rest.sort(key=lambda agent: similarity[agent.name], reverse=True)
+        return ranked + rest
+
+    async def route(self, text: str) -> RouteDecision:
+        agent = self.match_rules(text)
+        if agent is self.triage_agent:
+            return self._decide(agent, "triage", 1.0)
+        if agent is not None:
+            return self._decide(agent, "rule", 1.0)
+
+        if self.embed is not None and self.specialists:
+            agent, similarity, margin = await self.classify(text)
+            if similarity >= self.threshold and margin >= self.margin:
+                return self._decide(agent, "embedding", similarity)
+
+        return self._decide(self.triage_agent, "triage", 0.0)
+
+    def _decide(self, agent, method, confidence) -> RouteDecision:
+        self.decisions[method] += 1
+        self.metrics.inc("prerouter_decisions_total", app=self.app, method=method, agent=agent.name)
+        skipped = agent is not self.triage_agent
+        if skipped and self.triage_hops:
+            self.metrics.inc("prerouter_saved_seconds_total", self.mean_triage_hop, app=self.app)
+        return RouteDecision(agent, method, confidence, skipped)
+
+    def observe(self, timed_stream) -> None:
+        """Learns the cost of a triage hop from a TimedStream that started at triage and handed off."""
+        triage = timed_stream.per_agent.get(self.triage_agent.name)
+        if triage is None or len(timed_stream.per_agent) < 2:
+            return  # no handoff: triage answered itself, so this was not a routing hop
+        self.triage_hops += 1
+        self.triage_hop_seconds += triage["seconds"]
+        self.metrics.observe("prerouter_triage_hop_seconds", triage["seconds"], app=self.app)
+
+    @property
+    def mean_triage_hop(self) -> float:
+        return self.triage_hop_seconds / self.triage_hops if self.triage_hops else 0.0
+
+    def stats(self) -> dict:
+        total = sum(self.decisions.values())
+        skipped = total - self.decisions["triage"]
+        return {
+            **self.decisions,
+            "skip_rate": skipped / total if total else 0.0,
+            "mean_triage_hop_ms": self.mean_triage_hop * 1000,
+            "estimated_saved_seconds": skipped * self.mean_triage_hop,
+        }
+
+
+def _is_regex(pattern: str) -> bool:
+    return any(ch in pattern for ch in r"\[](){}*+?^$|")
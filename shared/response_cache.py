@@ -0,0 +1,239 @@
+# Opt-in exact-match response cache in front of Runner.run / Runner.run_streamed.
+#
+# FAQ-style traffic asks the same question again and again. With this cache a repeat
+# of an already answered question is served from memory (or from SQLite after a
+# restart) instead of going to Gemini again.
+#
+#     cache = ResponseCache(max_entries=1000, ttl=3600, db_path="cache.sqlite3")
+#     result = await cache.run(agent, user_input, run_config=config)
+#     result = cache.run_streamed(agent, history, run_config=config)  # same stream_events() loop
+#
+# The key covers everything that changes the answer: agent name, instructions, tool
+# and handoff signatures, output type, model and the normalized input.
+import re
+import json
+import time
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass
+from agents import Runner
+from agents.stream_events import RawResponsesStreamEvent
+from openai.types.responses import ResponseTextDeltaEvent
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a message, so trivial variations share a key."""
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def normalize_input(input) -> list:
+    """Normalizes a string or a list of input items (chat history) for hashing."""
+    if isinstance(input, str):
+        return [{"role": "user", "content": normalize_text(input)}]
+    items = []
+    for item in input:
+        item = dict(item)
+        if isinstance(item.get("content"), str):
+            item["content"] = normalize_text(item["content"])
+        items.append(item)
+    return items
+
+
+def model_name(agent, run_config=None) -> str:
+    """Name of the model the run will use (the run config's model wins, like in the SDK)."""
+    model = (run_config.model if run_config and run_config.model else None) or agent.model
+    if model is None or isinstance(model, str):
+        return str(model)
+    return str(getattr(model, "model", type(model).__name__))
+
+
+def agent_signature(agent) -> dict:
+    """Everything about an agent that can change its answer."""
+    instructions = agent.instructions
+    if callable(instructions):  # dynamic instructions: best we can do is the function's identity
+        instructions = f"{instructions.__module__}.{instructions.__qualname__}"
+
+    tools = []
+    for tool in agent.tools:
+        schema = getattr(tool, "params_json_schema", None)
+        tools.append([getattr(tool, "name", type(tool).__name__), schema])
+
+    handoffs = [getattr(h, "name", None) or getattr(h, "tool_name", None) for h in agent.handoffs]
+    output_type = getattr(agent.output_type, "__name__", str(agent.output_type)) if agent.output_type else None
+
+    return {
+        "name": agent.name,
+        "instructions": instructions,
+        "tools": tools,
+        "handoffs": handoffs,
+        "output_type": output_type,
+    }
+
+
+def make_key(agent, input, run_config=None) -> str:
+    """Stable cache key for running `agent` on `input`."""
+    payload = {
+        "agent": agent_signature(agent),
+        "model": model_name(agent, run_config),
+        "input": normalize_input(input),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedRunResult:
+    """What Runner.run returns on a cache hit; apps only read `final_output`."""
+    final_output: str
+    cached: bool = True
+
+
+class CachedStreamedRun:
+    """Stands in for RunResultStreaming on a cache hit.
+
+    Replays the stored answer as raw_response_event deltas (one per word), so loops
+    like `if event.type == "raw_response_event" and hasattr(event.data, 'delta')`
+    keep working unchanged.
+    """
+
+    def __init__(self, final_output: str):
+        self.final_output = final_output
+        self.cached = True
+        self.is_complete = False
+
+    async def stream_events(self):
+        for i, chunk in enumerate(re.findall(r"\s*\S+\s*|\s+", self.final_output)):
+            data = ResponseTextDeltaEvent.model_construct(
+                type="response.output_text.delta",
+                item_id="cached",
+                output_index=0,
+                content_index=0,
+                delta=chunk,
+                logprobs=[],
+                sequence_number=i,
+            )
+            yield RawResponsesStreamEvent(data=data)
+        self.is_complete = True
+
+
+class _RecordingStreamedRun:
+    """Wraps a live RunResultStreaming and stores its answer once the stream has finished."""
+
+    def __init__(self, result, cache, key):
+        self._result = result
+        self._cache = cache
+        self._key = key
+        self.cached = False
+
+    async def stream_events(self):
+        async for event in self._result.stream_events():
+            yield event
+        if isinstance(self._result.final_output, str):
+            self._cache.set(self._key, self._result.final_output)
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+
+class ResponseCache:
+    """LRU + TTL cache of final outputs, optionally persisted to SQLite."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, db_path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, final_output), oldest first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, final_output TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM response_cache WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            row = self._db.execute(
+                "SELECT expires_at, final_output FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                entry = row
+                self._store(key, entry)
+
+        if entry is None or entry[0] < now:
+            if entry is not None:
+                self._delete(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, final_output: str) -> None:
+        entry = (time.time() + self.ttl, final_output)
+        self._store(key, entry)
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO response_cache (key, final_output, expires_at) VALUES (?, ?, ?)",
+                (key, final_output, entry[0]),
+            )
+            self._db.commit()
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # evicted from RAM only, SQLite keeps it until it expires
+            self.evictions += 1
+
+    def _delete(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM response_cache")
+            self._db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def run(self, agent, input, **kwargs):
+        """Runner.run with the cache in front of it."""
+        key = make_key(agent, input, kwargs.get("run_config"))
+        cached = self.get(key)
+        if cached is not None:
+            return CachedRunResult(cached)
+
+        result = await Runner.run(agent, input, **kwargs)
+        if isinstance(result.final_output, str):
+            self.set(key, result.final_output)
+        return result
+
+    def run_streamed(self, agent, input, **kwargs):
+        """Runner.run_streamed with the cache in front of it; hits are replayed as stream events."""
+        key = make_key(agent, input, kwargs.get("run_config"))
+        cached = self.get(key)
+        if cached is not None:
+            return CachedStreamedRun(cached)
+        return _RecordingStreamedRun(Runner.run_streamed(agent, input, **kwargs), self, key)
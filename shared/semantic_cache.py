@@ -0,0 +1,192 @@
+# Semantic cache: reuse an answer when a new question means the same as an old one.
+#
+# The exact-match cache in response_cache.py misses paraphrases like
+# "weather in Karachi?" vs "what's Karachi weather". Here every question is embedded
+# with Gemini (same embedding model as 14-pinecone) and compared with the questions
+# answered before; if the cosine similarity passes `threshold` the stored answer is
+# returned without calling the agent.
+#
+#     cache = SemanticCache(threshold=0.92)
+#     result = await cache.run(agent, user_input, run_config=config)
+#
+# Every agent gets its own namespace, keyed by its name, instructions and model, so a
+# math answer is never served for a history question, nor one agent's answer for another
+# that shares its name. The index is in-process and size-bounded (LRU per namespace);
+# with unit vectors the cosine is a plain dot product (math.sumprod, C speed).
+#
+# Embeddings rate "opening hours" and "opening hours on Sunday" as near-identical, so
+# a match is also refused when the questions' specifics differ: numbers, names
+# (capitalized words) and day words like "today" or "Sunday" must appear in both.
+import re
+import math
+import time
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from agents import Runner
+from shared.model_client import get_client
+
+GEMINI_EMBEDDING_MODEL = "gemini-embedding-001"
+
+
+def normalize(vector) -> list[float]:
+    """Scales a vector to unit length so cosine similarity is just a dot product."""
+    norm = math.sqrt(math.sumprod(vector, vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+_DAY_WORDS = {"today", "tonight", "tomorrow", "yesterday", "weekend", "monday", "tuesday", "wednesday",
+              "thursday", "friday", "saturday", "sunday"}
+
+
+def specifics(text: str) -> set[str]:
+    """Numbers, names and day words in `text`, casefolded: what a cached answer must match exactly."""
+    terms = set()
+    for sentence in re.split(r"[.!?]+", text):
+        words = re.findall(r"\w+", sentence)
+        for position, word in enumerate(words):
+            folded = word.casefold()
+            if (any(ch.isdigit() for ch in word) or folded in _DAY_WORDS
+                    or (position > 0 and word[0].isupper() and word != "I")):
+                terms.add(folded)
+    return terms
+
+
+def same_specifics(question: str, other: str) -> bool:
+    """True if every number, name and day word of either question also appears in the other."""
+    words = set(re.findall(r"\w+", question.casefold()))
+    other_words = set(re.findall(r"\w+", other.casefold()))
+    return all(term in words and term in other_words for term in specifics(question) | specifics(other))
+
+
+def agent_namespace(agent, run_config=None) -> str:
+    """Cache namespace for `agent`: its name plus a digest of its instructions and model."""
+    instructions = agent.instructions
+    if callable(instructions):  # dynamic instructions: the function stands for them
+        instructions = f"{instructions.__module__}.{instructions.__qualname__}"
+    model = getattr(agent, "model", None) or getattr(run_config, "model", None)
+    model = model if isinstance(model, str) or model is None else getattr(model, "model", type(model).__name__)
+    digest = hashlib.blake2b(f"{instructions}\0{model}".encode(), digest_size=8).hexdigest()
+    return f"{agent.name}:{digest}"
+
+
+async def gemini_embed(text: str) -> list[float]:
+    """Embeds `text` with Gemini through the shared, pooled client."""
+    response = await get_client().embeddings.create(model=GEMINI_EMBEDDING_MODEL, input=text)
+    return response.data[0].embedding
+
+
+@dataclass
+class CacheEntry:
+    question: str
+    vector: list[float]
+    answer: str
+    created_at: float
+
+
+@dataclass
+class SemanticCacheHit:
+    """What SemanticCache.run returns on a hit; apps only read `final_output`."""
+    final_output: str
+    similarity: float
+    matched_question: str
+    cached: bool = True
+
+
+class SemanticCache:
+    """Per-namespace, size-bounded in-process vector index of answered questions."""
+
+    def __init__(self, embed=gemini_embed, threshold: float = 0.92, max_entries: int = 1000, ttl: float | None = None):
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries  # per namespace
+        self.ttl = ttl
+        self._namespaces = {}  # namespace -> OrderedDict[int, CacheEntry], least recently used first
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.refused = 0  # similar enough, but with different numbers, names or days
+        self.evictions = 0
+
+    async def embed_question(self, question: str) -> list[float]:
+        return normalize(await self.embed(question.strip()))
+
+    def search(self, namespace: str, vector: list[float]):
+        """Best (similarity, entry_id, entry) for `vector` in `namespace`, or None if it is empty."""
+        entries = self._namespaces.get(namespace)
+        if not entries:
+            return None
+
+        if self.ttl is not None:
+            expired_before = time.time() - self.ttl
+            for entry_id in [i for i, e in entries.items() if e.created_at < expired_before]:
+                del entries[entry_id]
+
+        best = None
+        for entry_id, entry in entries.items():
+            similarity = math.sumprod(vector, entry.vector)
+            if best is None or similarity > best[0]:
+                best = (similarity, entry_id, entry)
+        return best
+
+    async def lookup(self, namespace: str, question: str, vector: list[float] | None = None):
+        """Returns (hit_or_None, vector); pass the vector back to store() to avoid embedding twice."""
+        if vector is None:
+            vector = await self.embed_question(question)
+
+        best = self.search(namespace, vector)
+        if best is None or best[0] < self.threshold:
+            self.misses += 1
+            return None, vector
+        if not same_specifics(question, best[2].question):
+            self.refused += 1
+            self.misses += 1
+            return None, vector
+
+        similarity, entry_id, entry = best
+        self._namespaces[namespace].move_to_end(entry_id)
+        self.hits += 1
+        return SemanticCacheHit(entry.answer, similarity, entry.question), vector
+
+    async def store(self, namespace: str, question: str, answer: str, vector: list[float] | None = None) -> None:
+        if vector is None:
+            vector = await self.embed_question(question)
+
+        entries = self._namespaces.setdefault(namespace, OrderedDict())
+        entries[self._next_id] = CacheEntry(question, vector, answer, time.time())
+        self._next_id += 1
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "namespaces": len(self._namespaces),
+            "entries": sum(len(e) for e in self._namespaces.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refused": self.refused,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def run(self, agent, input, runner=None, **kwargs):
+        """Runs `agent` unless a semantically equal question was answered before.
+
+        Only single questions (string input) are cached; a chat history is passed
+        straight to `runner`. `runner` can be another cache's run, e.g. ResponseCache.run.
+        """
+        runner = runner or Runner.run
+        if not isinstance(input, str):
+            return await runner(agent, input, **kwargs)
+
+        namespace = agent_namespace(agent, kwargs.get("run_config"))
+        hit, vector = await self.lookup(namespace, input)
+        if hit is not None:
+            return hit
+
+        result = await runner(agent, input, **kwargs)
+        if isinstance(result.final_output, str):
+            await self.store(namespace, input, result.final_output, vector)
+        return result
@@ -0,0 +1,191 @@
+# Durable, pluggable session store for chat history.
+#
+# History used to live only in cl.user_session: lost on restart and kept in RAM for
+# every connected (or idle but not yet timed out) user. Here turns are appended to a
+# store as they happen, a session is loaded lazily when a chat starts, and only the
+# most recently active sessions stay in memory.
+#
+#     sessions = SessionCache(get_session_store())   # SQLite when SESSION_DB is set
+#     with sessions.turn(session_id) as history:     # ContextWindow, loaded from the store if needed
+#         history.add_user(message.content)          # written through to the store
+#         ...run the agent, stream the reply...
+#         history.add_assistant(result.final_output)
+#
+# Stores implement load / append / save_summary; MemorySessionStore is the
+# non-durable default, SQLiteSessionStore uses WAL so writes stay cheap. A turn
+# number (seq) is only ever written once: storing it again raises instead of
+# silently replacing a turn.
+#
+# A session is never evicted from RAM while one of its turns is in progress
+# (inside sessions.turn()): reloading it mid-reply would number the next turn
+# from what is stored and miss the reply still being streamed.
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from shared.context_window import ContextWindow
+
+
+class SessionStore(ABC):
+    """Interface for session backends."""
+
+    @abstractmethod
+    def load(self, session_id: str) -> tuple[str, int, list[dict]]:
+        """Returns (summary, number of turns folded into it, verbatim turns after those)."""
+
+    @abstractmethod
+    def append(self, session_id: str, seq: int, role: str, content: str) -> None:
+        """Stores turn number `seq` of a session; raises if that turn is already stored."""
+
+    @abstractmethod
+    def save_summary(self, session_id: str, summary: str, summarized_upto: int) -> None:
+        """Stores the rolling summary, which covers turns [0, summarized_upto)."""
+
+
+class MemorySessionStore(SessionStore):
+    """Keeps everything in process memory; nothing survives a restart."""
+
+    def __init__(self):
+        self._turns = {}
+        self._summaries = {}
+
+    def load(self, session_id):
+        summary, upto = self._summaries.get(session_id, ("", 0))
+        turns = self._turns.get(session_id, {})
+        return summary, upto, [turns[seq] for seq in sorted(turns) if seq >= upto]
+
+    def append(self, session_id, seq, role, content):
+        turns = self._turns.setdefault(session_id, {})  # seq -> turn, like the turns table
+        if seq in turns:
+            raise ValueError(f"Turn {seq} of session {session_id!r} is already stored")
+        turns[seq] = {"role": role, "content": content}
+
+    def save_summary(self, session_id, summary, summarized_upto):
+        self._summaries[session_id] = (summary, summarized_upto)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite backend in WAL mode; every turn is one small INSERT."""
+
+    def __init__(self, path: str = "sessions.sqlite3"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # durable across app crashes, fast commits
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS turns (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL DEFAULT '',
+                summarized_upto INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+    def load(self, session_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT summary, summarized_upto FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            summary, upto = row if row else ("", 0)
+            turns = self._db.execute(
+                "SELECT role, content FROM turns WHERE session_id = ? AND seq >= ? ORDER BY seq",
+                (session_id, upto),
+            ).fetchall()
+        return summary, upto, [{"role": role, "content": content} for role, content in turns]
+
+    def append(self, session_id, seq, role, content):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO turns (session_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, seq, role, content, time.time()),
+            )
+
+    def save_summary(self, session_id, summary, summarized_upto):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO sessions (session_id, summary, summarized_upto, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET summary = excluded.summary, "
+                "summarized_upto = excluded.summarized_upto, updated_at = excluded.updated_at",
+                (session_id, summary, summarized_upto, time.time()),
+            )
+
+    def close(self):
+        self._db.close()
+
+
+def get_session_store(path: str | None = None) -> SessionStore:
+    """SQLiteSessionStore at `path` (default: SESSION_DB), or a MemorySessionStore when neither is set."""
+    path = path or os.getenv("SESSION_DB")
+    return SQLiteSessionStore(path) if path else MemorySessionStore()
+
+
+class SessionCache:
+    """Bounded in-RAM cache of ContextWindows in front of a SessionStore.
+
+    Sessions are loaded on first use and evicted when they have been idle for
+    `idle_seconds` or when more than `max_sessions` are held (least recently used
+    first). Evicting is safe because every turn is already in the store; a window
+    still writing its summary, or with a turn in progress (see turn()), is never evicted.
+    """
+
+    def __init__(self, store: SessionStore | None = None, max_sessions: int = 1000,
+                 idle_seconds: float = 900, **window_kwargs):
+        self.store = store or MemorySessionStore()
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.window_kwargs = window_kwargs
+        self._windows = OrderedDict()  # session_id -> (last_used, ContextWindow), least recent first
+        self._in_progress = {}  # session_id -> turns being handled right now
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, session_id: str) -> ContextWindow:
+        now = time.monotonic()
+        entry = self._windows.pop(session_id, None)
+        if entry is None:
+            window = ContextWindow.load(self.store, session_id, **self.window_kwargs)
+            self.loads += 1
+        else:
+            window = entry[1]
+        self._windows[session_id] = (now, window)
+        self._evict(now)
+        return window
+
+    @contextmanager
+    def turn(self, session_id: str):
+        """The session's window, kept in RAM until the block (one user turn and its reply) ends."""
+        window = self.get(session_id)
+        self._in_progress[session_id] = self._in_progress.get(session_id, 0) + 1
+        try:
+            yield window
+        finally:
+            self._in_progress[session_id] -= 1
+            if not self._in_progress[session_id]:
+                del self._in_progress[session_id]
+
+    def _evict(self, now: float) -> None:
+        for session_id, (last_used, window) in list(self._windows.items()):
+            idle = now - last_used > self.idle_seconds
+            full = len(self._windows) > self.max_sessions
+            if not (idle or full):
+                break  # ordered by last use, so everything after this is newer
+            if window.busy or session_id in self._in_progress:
+                continue
+            del self._windows[session_id]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._windows)
@@ -0,0 +1,185 @@
+# Speculative execution of likely specialists while the triage agent decides.
+#
+# With a triage agent the user waits for the triage round-trip and only then for the
+# specialist's whole answer. A Speculator starts the top-k likely specialists at the
+# same time as the triage run and buffers their output. As soon as triage hands off:
+#   - if the chosen specialist was speculated, the triage run and the other candidates
+#     are cancelled and the chosen one's stream continues (buffered part first);
+#   - otherwise all candidates are cancelled and the triage run carries on as usual.
+# If triage starts answering by itself, every candidate is cancelled right away.
+#
+#     speculator = Speculator(triage_agent, k=2, budget_chars=2000, rank=router.rank)
+#     result = await speculator.run_streamed(history.to_input_items(), text=message.content, run_config=config)
+#     async for event in result.stream_events():   # same events and final_output as Runner.run_streamed
+#
+# Cost is capped two ways: a candidate that streams more than `budget_chars` before
+# triage decides is cancelled, and at most `max_inflight` candidates run across all
+# users (beyond that requests run without speculation). Candidates see the
+# conversation only, not triage's handoff call, so their answer can differ slightly
+# from what the handed-off run would have produced.
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from agents import Runner
+from shared.stream_metrics import describe_metrics, is_text_delta, registry
+
+logger = logging.getLogger(__name__)
+
+describe_metrics({
+    "speculation_total": "Triage runs with speculation, by outcome (hit, miss, triage_answered, skipped).",
+    "speculation_wasted_chars_total": "Characters streamed by speculative candidates that were thrown away.",
+    "speculation_saved_seconds": "On hits, how long the chosen specialist had been running when triage decided.",
+})
+
+_DONE = object()
+
+
+@dataclass
+class _Candidate:
+    agent: object
+    result: object
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    chars: int = 0
+    over_budget: bool = False
+    error: Exception | None = None
+    task: asyncio.Task | None = None
+
+    @property
+    def usable(self) -> bool:
+        return not self.over_budget and self.error is None
+
+
+class Speculator:
+    """Runs a triage agent with its k most likely specialists started speculatively."""
+
+    def __init__(self, triage_agent, k: int = 2, budget_chars: int = 2000, max_inflight: int = 64,
+                 rank=None, runner=None, app: str = "default", metrics=None):
+        self.triage_agent = triage_agent
+        self.k = k
+        self.budget_chars = budget_chars
+        self.max_inflight = max_inflight
+        self.rank = rank  # async text -> specialists, most likely first; default is handoff order
+        self.runner = runner or Runner.run_streamed
+        self.app = app
+        self.metrics = metrics or registry
+        self.inflight = 0
+        self.outcomes = {"hit": 0, "miss": 0, "triage_answered": 0, "skipped": 0}
+        self.wasted_chars = 0
+        self.saved_seconds = 0.0
+
+    async def run_streamed(self, input, text: str | None = None, **kwargs) -> "SpeculativeRun":
+        """Like Runner.run_streamed(triage_agent, input, **kwargs); `text` (the latest user message) drives ranking."""
+        if self.rank is not None and text is not None:
+            ranked = await self.rank(text)
+        else:
+            ranked = list(self.triage_agent.handoffs)
+        k = max(0, min(self.k, self.max_inflight - self.inflight))
+        return SpeculativeRun(self, input, ranked[:k], kwargs)
+
+    def _record(self, outcome: str) -> None:
+        self.outcomes[outcome] += 1
+        self.metrics.inc("speculation_total", app=self.app, outcome=outcome)
+
+    def stats(self) -> dict:
+        decided = self.outcomes["hit"] + self.outcomes["miss"]
+        return {
+            **self.outcomes,
+            "hit_rate": self.outcomes["hit"] / decided if decided else 0.0,
+            "wasted_chars": self.wasted_chars,
+            "mean_saved_ms": self.saved_seconds / self.outcomes["hit"] * 1000 if self.outcomes["hit"] else 0.0,
+        }
+
+
+class SpeculativeRun:
+    """Stands in for a RunResultStreaming: stream_events(), final_output and current_agent."""
+
+    def __init__(self, speculator: Speculator, input, candidates: list, kwargs: dict):
+        self.speculator = speculator
+        self.started = time.perf_counter()
+        self._triage = speculator.runner(speculator.triage_agent, input, **kwargs)
+        self._active = self._triage
+        self._candidates = {}
+        for agent in candidates:
+            candidate = _Candidate(agent, speculator.runner(agent, input, **kwargs))
+            candidate.task = asyncio.create_task(self._pump(candidate))
+            self._candidates[agent.name] = candidate
+        speculator.inflight += len(self._candidates)
+        if not self._candidates:
+            speculator._record("skipped")
+
+    @property
+    def current_agent(self):
+        return self._active.current_agent
+
+    @property
+    def final_output(self):
+        return self._active.final_output
+
+    async def _pump(self, candidate: _Candidate) -> None:
+        """Buffers a candidate's events; stops it if it goes over budget before it is chosen."""
+        try:
+            async for event in candidate.result.stream_events():
+                candidate.queue.put_nowait(event)
+                if is_text_delta(event):
+                    candidate.chars += len(event.data.delta)
+                    if self._active is not candidate.result and candidate.chars > self.speculator.budget_chars:
+                        candidate.over_budget = True
+                        candidate.result.cancel()
+                        break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Speculative run of %s failed: %s", candidate.agent.name, e)
+            candidate.error = e
+        finally:
+            candidate.queue.put_nowait(_DONE)
+
+    def _cancel_candidates(self, keep: _Candidate | None = None) -> None:
+        for candidate in self._candidates.values():
+            if candidate is keep:
+                continue
+            candidate.result.cancel()
+            if candidate.task is not None:
+                candidate.task.cancel()
+            self.speculator.wasted_chars += candidate.chars
+            self.speculator.metrics.inc("speculation_wasted_chars_total", candidate.chars, app=self.speculator.app)
+        self.speculator.inflight -= len(self._candidates)
+        self._candidates = {}
+
+    async def stream_events(self):
+        speculator = self.speculator
+        try:
+            async for event in self._triage.stream_events():
+                if self._candidates and event.type == "agent_updated_stream_event" \
+                        and event.new_agent.name != speculator.triage_agent.name:
+                    chosen = self._candidates.get(event.new_agent.name)
+                    if chosen is not None and chosen.usable:
+                        saved = time.perf_counter() - self.started
+                        speculator._record("hit")
+                        speculator.saved_seconds += saved
+                        speculator.metrics.observe("speculation_saved_seconds", saved, app=speculator.app)
+                        self._active = chosen.result
+                        self._cancel_candidates(keep=chosen)
+                        self._triage.cancel()
+                        async for candidate_event in self._drain(chosen):
+                            yield candidate_event
+                        return
+                    speculator._record("miss")
+                    self._cancel_candidates()
+                elif self._candidates and is_text_delta(event):
+                    speculator._record("triage_answered")
+                    self._cancel_candidates()
+                yield event
+        finally:
+            if self._candidates:
+                self._cancel_candidates()  # the caller stopped early or the triage run failed
+
+    async def _drain(self, candidate: _Candidate):
+        while True:
+            event = await candidate.queue.get()
+            if event is _DONE:
+                break
+            yield event
+        if candidate.error is not None:
+            raise candidate.error
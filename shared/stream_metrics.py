@@ -0,0 +1,255 @@
+# Streaming latency instrumentation: time to first token, inter-token gaps, tokens/sec.
+#
+# Wrap the result of Runner.run_streamed() in a TimedStream and iterate it instead of
+# result.stream_events(); events pass through unchanged while their timings are
+# recorded into an in-process MetricsRegistry, broken down per agent across handoffs.
+#
+#     result = Runner.run_streamed(agent, input, run_config=config)
+#     async for event in TimedStream(result, app="04-streaming"):
+#         ...same loop body as before...
+#
+# The registry can be dumped as Prometheus text (registry.to_prometheus()) or JSON
+# (registry.to_json()), or served over HTTP for scraping with start_metrics_server(port):
+# GET /metrics returns Prometheus text, GET /metrics.json the JSON snapshot. The server
+# listens on 127.0.0.1 unless given another host.
+#
+# A "token" here is one text delta event (response.output_text.delta). Gemini sends a
+# few tokens per delta, so tokens/sec is really deltas/sec; it is still the rate the
+# user sees text arrive at. Tool-call argument deltas are not text the user sees and
+# are not counted.
+#
+# Other modules name their own metrics' help text with describe_metrics({...}).
+import json
+import time
+import logging
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+_HELP = {
+    "stream_ttft_seconds": "Time from starting the run to the first text delta.",
+    "stream_inter_token_gap_seconds": "Time between consecutive text deltas from the same agent.",
+    "stream_tokens_per_second": "Text deltas per second over a whole streamed run.",
+    "stream_duration_seconds": "Wall time of a whole streamed run.",
+    "stream_agent_seconds": "Time each agent held the stream, handoffs included.",
+    "stream_tokens_total": "Text deltas streamed.",
+    "streams_total": "Streamed runs, by outcome.",
+}
+
+
+def describe_metrics(help: dict[str, str]) -> None:
+    """Registers the # HELP text for metrics; a name can't be given two different texts."""
+    for name, text in help.items():
+        if _HELP.setdefault(name, text) != text:
+            raise ValueError(f"Metric {name!r} is already described as {_HELP[name]!r}")
+
+
+def is_text_delta(event) -> bool:
+    """True for a streamed event carrying visible reply text (not tool-call arguments)."""
+    return event.type == "raw_response_event" and getattr(event.data, "type", "") == "response.output_text.delta"
+
+
+class Summary:
+    """Count and sum of all observations, quantiles over the most recent `window` of them."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def quantiles(self) -> dict[float, float]:
+        values = sorted(self.recent)
+        if not values:
+            return {}
+        return {q: values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES}
+
+
+class MetricsRegistry:
+    """Thread-safe store of summaries and counters keyed by metric name and labels."""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._summaries = {}  # (name, labels) -> Summary
+        self._counters = {}  # (name, labels) -> float
+        self._lock = threading.Lock()  # the metrics server reads from its own thread
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = Summary(self.window)
+            summary.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> dict:
+        """Plain-dict view of every metric, the same data as the Prometheus output."""
+        out = {}
+        with self._lock:
+            for (name, labels), summary in sorted(self._summaries.items()):
+                out.setdefault(name, []).append({
+                    "labels": dict(labels),
+                    "count": summary.count,
+                    "sum": summary.sum,
+                    "quantiles": {str(q): v for q, v in summary.quantiles().items()},
+                })
+            for (name, labels), value in sorted(self._counters.items()):
+                out.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return out
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format: summaries with quantiles, plus counters."""
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), summary in sorted(self._summaries.items()):
+                header(name, "summary")
+                for q, v in summary.quantiles().items():
+                    lines.append(f"{name}{_labels(labels + (('quantile', str(q)),))} {v:.6f}")
+                lines.append(f"{name}_sum{_labels(labels)} {summary.sum:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {summary.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                header(name, "counter")
+                lines.append(f"{name}{_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+registry = MetricsRegistry()  # process-wide default
+
+
+class TimedStream:
+    """Iterates a streamed run's events and records its latency metrics when it ends.
+
+    After iteration the per-run numbers are also available as attributes:
+    ttft, tokens, duration, tokens_per_second and per_agent ({name: {"tokens", "seconds"}}).
+    """
+
+    def __init__(self, result, app: str = "default", metrics: MetricsRegistry | None = None):
+        self.result = result
+        self.app = app
+        self.metrics = metrics or registry
+        self.started = time.perf_counter()  # run_streamed() has just started the run
+        self.ttft = None
+        self.tokens = 0
+        self.duration = 0.0
+        self.per_agent = {}
+        self._agent = getattr(getattr(result, "current_agent", None), "name", "unknown")
+        self._agent_since = self.started
+        self._last_token = None
+
+    def __aiter__(self):
+        return self._events()
+
+    async def _events(self):
+        status = "error"
+        try:
+            async for event in self.result.stream_events():
+                now = time.perf_counter()
+                if event.type == "agent_updated_stream_event":
+                    self._switch_agent(event.new_agent.name, now)
+                elif is_text_delta(event) and event.data.delta:
+                    self._token(now)
+                yield event
+            status = "ok"
+        finally:
+            self._finish(status)
+
+    def _agent_stats(self, name):
+        return self.per_agent.setdefault(name, {"tokens": 0, "seconds": 0.0})
+
+    def _switch_agent(self, name, now):
+        if name == self._agent:
+            return
+        self._agent_stats(self._agent)["seconds"] += now - self._agent_since
+        self._agent = name
+        self._agent_since = now
+        self._last_token = None  # a handoff gap is not an inter-token gap
+
+    def _token(self, now):
+        labels = {"app": self.app, "agent": self._agent}
+        if self.ttft is None:
+            self.ttft = now - self.started
+            self.metrics.observe("stream_ttft_seconds", self.ttft, **labels)
+        elif self._last_token is not None:
+            self.metrics.observe("stream_inter_token_gap_seconds", now - self._last_token, **labels)
+        self._last_token = now
+        self.tokens += 1
+        self._agent_stats(self._agent)["tokens"] += 1
+        self.metrics.inc("stream_tokens_total", **labels)
+
+    def _finish(self, status):
+        now = time.perf_counter()
+        self._agent_stats(self._agent)["seconds"] += now - self._agent_since
+        self.duration = now - self.started
+        self.metrics.inc("streams_total", app=self.app, status=status)
+        self.metrics.observe("stream_duration_seconds", self.duration, app=self.app)
+        for name, stats in self.per_agent.items():
+            self.metrics.observe("stream_agent_seconds", stats["seconds"], app=self.app, agent=name)
+        if self.tokens and self.duration > 0:
+            self.metrics.observe("stream_tokens_per_second", self.tokens_per_second, app=self.app)
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.duration if self.duration else 0.0
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", metrics: MetricsRegistry | None = None):
+    """Serves /metrics (Prometheus text) and /metrics.json from a daemon thread.
+
+    Only this machine can scrape it by default; pass host="0.0.0.0" to expose it.
+    """
+    metrics = metrics or registry
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = metrics.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass  # scrapes every few seconds would flood the app log
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Serving stream metrics on http://%s:%d/metrics", host, port)
+    return server
@@ -0,0 +1,136 @@
+# Coalesced token flushing for streamed replies.
+#
+# The streaming apps awaited msg.stream_token(token) once per raw delta event: one
+# websocket frame per token, which saturates the socket and the event loop when many
+# users stream at once. A TokenCoalescer buffers the deltas and sends them as one
+# frame when `max_chars` are buffered or `max_delay` seconds have passed since the
+# first buffered delta, whichever comes first. Leaving the `async with` block always
+# flushes what is left, even if the stream failed.
+#
+#     async with TokenCoalescer(msg.stream_token) as stream:
+#         async for event in result.stream_events():
+#             if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
+#                 await stream.push(event.data.delta)
+#
+# Defaults come from STREAM_FLUSH_CHARS / STREAM_FLUSH_MS so a deployment can tune them.
+#
+# The Streamlit apps have the same problem in a different shape: st.text(text) per
+# token adds a new element holding the whole text so far, so the page fills up with
+# partial copies and the bytes sent grow with the square of the length. A
+# ThrottledPlaceholder keeps one st.empty() placeholder and re-renders it in place at
+# most every `min_interval` seconds (STREAM_RENDER_MS), plus once at the end:
+#
+#     with ThrottledPlaceholder(st.empty()) as output:
+#         for token in stream(translation_deltas(message, language)):
+#             output.push(token)
+#     translated_text = output.text
+import os
+import time
+import asyncio
+
+DEFAULT_MAX_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", "64"))
+DEFAULT_MAX_DELAY = float(os.getenv("STREAM_FLUSH_MS", "30")) / 1000
+DEFAULT_RENDER_INTERVAL = float(os.getenv("STREAM_RENDER_MS", "100")) / 1000
+
+
+class TokenCoalescer:
+    """Buffers streamed text deltas and forwards them to `sink` in batches."""
+
+    def __init__(self, sink, max_chars: int = DEFAULT_MAX_CHARS, max_delay: float = DEFAULT_MAX_DELAY):
+        self.sink = sink  # async callable taking a str, e.g. cl.Message.stream_token
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self.frames = 0
+        self.tokens = 0
+        self._buffer = []
+        self._buffered_chars = 0
+        self._timer = None  # sleeping until max_delay, then flushes
+        self._timed_flush = None  # the timer task once it has woken up and is sending
+        self._send_lock = asyncio.Lock()  # keeps frames in order when the timer and push() both flush
+
+    async def push(self, token: str) -> None:
+        if not token:
+            return
+        self.tokens += 1
+        self._buffer.append(token)
+        self._buffered_chars += len(token)
+        if self._buffered_chars >= self.max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        self._timed_flush = asyncio.current_task()
+        try:
+            await self.flush()
+        finally:
+            self._timed_flush = None
+
+    async def flush(self) -> None:
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        async with self._send_lock:
+            await self.sink(text)
+            self.frames += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._timer is not None:
+            self._timer.cancel()  # still sleeping: its text goes out with the final flush
+            self._timer = None
+        if self._timed_flush is not None:
+            await self._timed_flush  # already sending: its frame must go out before the last one
+        await self.flush()
+
+
+class ThrottledPlaceholder:
+    """Accumulates streamed text and re-renders one Streamlit placeholder in place, at a bounded rate."""
+
+    def __init__(self, placeholder, min_interval: float = DEFAULT_RENDER_INTERVAL, method: str = "markdown"):
+        self.placeholder = placeholder  # e.g. st.empty() or column.empty()
+        self.min_interval = min_interval
+        self._render = getattr(placeholder, method)  # "markdown" or "text"
+        self.renders = 0
+        self.tokens = 0
+        self._parts = []
+        self._dirty = False
+        self._last_render = 0.0
+
+    @property
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts[:] = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def push(self, token: str) -> None:
+        if not token:
+            return
+        self.tokens += 1
+        self._parts.append(token)
+        self._dirty = True
+        if time.monotonic() - self._last_render >= self.min_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        self._render(self.text)
+        self.renders += 1
+        self._dirty = False
+        self._last_render = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
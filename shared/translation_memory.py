@@ -0,0 +1,205 @@
+# Sentence-level translation memory in SQLite.
+#
+# Translator traffic repeats a lot (UI strings, boilerplate sentences, greetings), but
+# the apps sent every message to the translator agent as a whole. TranslationMemory
+# splits a message into sentences, looks each one up by (hash of the sentence, target
+# language, hash of the agent's instructions) and only sends the misses to the agent,
+# concurrently, one sentence per run. The translations are put back together in the
+# original order, with the original line breaks:
+#
+#     memory = TranslationMemory("translation_memory.sqlite3")
+#     result = await memory.translate(message, french_translator_agent, "French", run_config=config)
+#     result.text, result.hits, result.misses, result.tokens_saved
+#
+# Changing an agent's instructions changes the key, so old translations are not reused
+# for a prompt that would translate differently. Sentences are translated without the
+# sentences around them, which is what makes them reusable but can cost some context
+# (pronouns, terminology) on long, connected texts. Hit ratio and saved tokens (a
+# ~4 chars/token estimate of the skipped input + output) are in stats() and in the
+# stream_metrics registry.
+import re
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from agents import Runner
+from shared.context_window import estimate_tokens
+from shared.stream_metrics import describe_metrics, registry
+
+describe_metrics({
+    "translation_memory_segments_total": "Sentences looked up in the translation memory, by result (hit, miss).",
+    "translation_memory_tokens_saved_total": "Estimated tokens not sent to or generated by the model thanks to hits.",
+})
+
+# Sentence ends followed by whitespace, CJK sentence ends, or line breaks
+_BOUNDARY = re.compile(r"(?<=[.!?؟۔])\s+|(?<=[。！？])\s*|\s*\n\s*")
+
+
+def split_segments(text: str) -> list[tuple[str, str]]:
+    """(sentence, whitespace after it) pairs; joining them gives back the stripped text."""
+    text = text.strip()
+    pieces, start = [], 0
+    for match in _BOUNDARY.finditer(text):
+        if match.end() > start:
+            pieces.append((text[start:match.start()], match.group()))
+            start = match.end()
+    pieces.append((text[start:], ""))
+    return [(segment, separator) for segment, separator in pieces if segment or separator]
+
+
+def needs_translation(segment: str) -> bool:
+    """Segments without letters (numbers, dashes, emoji) are passed through as they are."""
+    return any(ch.isalpha() for ch in segment)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_segment(segment: str) -> str:
+    return re.sub(r"\s+", " ", segment).strip()
+
+
+def instructions_hash(agent) -> str:
+    instructions = agent.instructions
+    if callable(instructions):  # dynamic instructions: the function's identity is the best we have
+        instructions = f"{instructions.__module__}.{instructions.__qualname__}"
+    return _hash(str(instructions))
+
+
+@dataclass
+class MemoryTranslation:
+    """A translated message and how much of it came from the memory."""
+    text: str
+    segments: int
+    hits: int
+    misses: int
+    tokens_saved: int
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.segments if self.segments else 0.0
+
+
+class TranslationMemory:
+    """Persistent (SQLite, WAL) store of sentence translations, with the translate-the-misses logic."""
+
+    def __init__(self, path: str = "translation_memory.sqlite3", max_concurrency: int = 4,
+                 app: str = "default", metrics=None):
+        self.max_concurrency = max_concurrency
+        self.app = app
+        self.metrics = metrics or registry
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                source_hash TEXT NOT NULL,
+                language TEXT NOT NULL,
+                instructions_hash TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (source_hash, language, instructions_hash)
+            )
+            """
+        )
+
+    def _key(self, segment, agent, language):
+        return _hash(normalize_segment(segment)), language.casefold(), instructions_hash(agent)
+
+    def get(self, segment: str, agent, language: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT translation FROM segments WHERE source_hash = ? AND language = ? AND instructions_hash = ?",
+                self._key(segment, agent, language),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, segment: str, agent, language: str, translation: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO segments "
+                "(source_hash, language, instructions_hash, source, translation, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (*self._key(segment, agent, language), normalize_segment(segment), translation, time.time()),
+            )
+
+    def _record(self, hits: int, misses: int, tokens_saved: int) -> None:
+        self.hits += hits
+        self.misses += misses
+        self.tokens_saved += tokens_saved
+        if hits:
+            self.metrics.inc("translation_memory_segments_total", hits, app=self.app, result="hit")
+            self.metrics.inc("translation_memory_tokens_saved_total", tokens_saved, app=self.app)
+        if misses:
+            self.metrics.inc("translation_memory_segments_total", misses, app=self.app, result="miss")
+
+    async def translate(self, text: str, agent, language: str, runner=None, **run_kwargs) -> MemoryTranslation:
+        """Translates `text` with `agent`, sending only sentences missing from the memory."""
+        runner = runner or Runner.run
+        pieces = split_segments(text)
+        wanted = [segment for segment, _ in pieces if needs_translation(segment)]
+        translations = {segment: self.get(segment, agent, language) for segment in dict.fromkeys(wanted)}
+        missing = [segment for segment, translation in translations.items() if translation is None]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def translate_one(segment):
+            async with semaphore:
+                result = await runner(agent, segment, **run_kwargs)
+            translation = str(result.final_output).strip()
+            self.put(segment, agent, language, translation)
+            return translation
+
+        results = await asyncio.gather(*(translate_one(s) for s in missing), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        translations.update((s, r) for s, r in zip(missing, results) if not isinstance(r, BaseException))
+
+        # Every sentence not sent to the model is a hit, including repeats within the message
+        hits = len(wanted) - len(missing)
+        sent = set(missing)
+        tokens_saved = 0
+        for segment in wanted:
+            if segment in sent:
+                sent.discard(segment)  # its first occurrence went to the model
+            else:
+                tokens_saved += estimate_tokens(segment) + estimate_tokens(translations[segment] or "")
+        self._record(hits, len(missing), tokens_saved)
+        if errors:
+            raise errors[0]  # the sentences that did succeed are already stored
+
+        text = "".join(
+            (translations[segment] if needs_translation(segment) else segment) + separator
+            for segment, separator in pieces
+        )
+        return MemoryTranslation(text, len(wanted), hits, len(missing), tokens_saved)
+
+    def remember(self, text: str, agent, language: str, translation: str) -> bool:
+        """Stores a translation made outside translate() (e.g. streamed) if `text` is a single sentence."""
+        wanted = [segment for segment, _ in split_segments(text) if needs_translation(segment)]
+        if len(wanted) != 1 or not translation.strip():
+            return False
+        self.put(wanted[0], agent, language, translation.strip())
+        self._record(0, 1, 0)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,170 @@
+# Many cities at once: concurrent forecasts in one pandas table.
+#
+# 09-weather-api-app showed one city per click, so watching 50 cities meant 50 rounds
+# of type, click, wait. WeatherBoard fetches every city's forecast concurrently through
+# the shared WeatherData layer (pooled async HTTP client, TTL cache, singleflight),
+# at most `max_concurrency` at a time and `requests_per_minute` when the API plan has
+# a quota, and puts the results in one DataFrame, a row per city:
+#
+#     board = WeatherBoard(weather_data)
+#     update = await board.refresh(["Karachi", "Lahore", "Dubai"])
+#     update.table            # city -> temp_c, feelslike_c, wind_kph, maxtemp_c, ...
+#     update.changed          # cities whose row differs from the previous refresh
+#     convert_units(update.table, "Fahrenheit"), summarize(update.table)
+#     update = await board.refresh(cities, force=True)   # "Refresh": skip the TTL cache
+#
+# Unit conversion and the cross-city aggregates work on whole columns (NumPy), not
+# per city. Each row is fingerprinted (pd.util.hash_pandas_object), so a refresh
+# can tell which cities actually changed and the UI redraws only those.
+import os
+import time
+import asyncio
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+from shared.async_tools import RateLimiter
+from shared.weather_client import normalize_city
+
+BOARD_CONCURRENCY = int(os.getenv("WEATHER_BOARD_CONCURRENCY", "10"))
+BOARD_RPM = float(os.getenv("WEATHER_BOARD_RPM", "0")) or None  # 0 = no client-side limit
+
+TEMPERATURE_COLUMNS = ["temp_c", "feelslike_c", "maxtemp_c", "mintemp_c"]
+WIND_COLUMNS = ["wind_kph", "maxwind_kph"]
+COLUMNS = ["country", "condition", *TEMPERATURE_COLUMNS, *WIND_COLUMNS, "avghumidity", "chance_of_rain", "lat", "lon"]
+
+
+def parse_cities(text: str) -> list[str]:
+    """City names from comma- or line-separated text, without duplicates (case and spacing ignored)."""
+    cities = {}
+    for name in text.replace("\n", ",").split(","):
+        name = " ".join(name.split())
+        if name:
+            cities.setdefault(normalize_city(name), name)
+    return list(cities.values())
+
+
+def forecast_row(forecast) -> dict:
+    today = forecast.days[0] if forecast.days else None
+    return {
+        "country": forecast.location.country,
+        "condition": forecast.current.condition,
+        "temp_c": forecast.current.temp_c,
+        "feelslike_c": forecast.current.feelslike_c,
+        "maxtemp_c": today.maxtemp_c if today else np.nan,
+        "mintemp_c": today.mintemp_c if today else np.nan,
+        "wind_kph": forecast.current.wind_kph,
+        "maxwind_kph": today.maxwind_kph if today else np.nan,
+        "avghumidity": today.avghumidity if today else np.nan,
+        "chance_of_rain": today.chance_of_rain if today else np.nan,
+        "lat": forecast.location.lat,
+        "lon": forecast.location.lon,
+    }
+
+
+def forecast_table(forecasts: dict) -> pd.DataFrame:
+    """One row per city (the index), numeric columns as float64."""
+    table = pd.DataFrame.from_dict({city: forecast_row(f) for city, f in forecasts.items()},
+                                   orient="index", columns=COLUMNS)
+    numeric = COLUMNS[2:]
+    table[numeric] = table[numeric].astype("float64")
+    table.index.name = "city"
+    return table
+
+
+def convert_units(table: pd.DataFrame, unit: str = "Celsius") -> pd.DataFrame:
+    """Display copy of `table` with temperatures in `unit` (and wind in mph for Fahrenheit)."""
+    shown = table.copy()
+    if unit == "Fahrenheit":
+        shown[TEMPERATURE_COLUMNS] = shown[TEMPERATURE_COLUMNS].to_numpy() * 9 / 5 + 32
+        shown[WIND_COLUMNS] = shown[WIND_COLUMNS].to_numpy() * 0.621371
+        temperature, wind = "°F", "mph"
+    else:
+        temperature, wind = "°C", "kph"
+    return shown.rename(columns={
+        "temp_c": f"temp {temperature}", "feelslike_c": f"feels like {temperature}",
+        "maxtemp_c": f"max {temperature}", "mintemp_c": f"min {temperature}",
+        "wind_kph": f"wind {wind}", "maxwind_kph": f"max wind {wind}",
+        "avghumidity": "humidity %", "chance_of_rain": "rain chance %",
+    })
+
+
+def summarize(table: pd.DataFrame, rain_threshold: float = 50) -> dict:
+    """Aggregates across cities (temperatures in °C, wind in kph)."""
+    if table.empty:
+        return {"cities": 0}
+    temps = table["temp_c"].to_numpy()
+    return {
+        "cities": len(table),
+        "mean_temp_c": float(np.nanmean(temps)),
+        "median_temp_c": float(np.nanmedian(temps)),
+        "spread_c": float(np.nanmax(temps) - np.nanmin(temps)),
+        "hottest": table["temp_c"].idxmax(),
+        "coldest": table["temp_c"].idxmin(),
+        "windiest": table["wind_kph"].idxmax(),
+        "rain_likely": int((table["chance_of_rain"].to_numpy() >= rain_threshold).sum()),
+    }
+
+
+def fingerprints(table: pd.DataFrame) -> pd.Series:
+    """A hash of each city's row; equal hashes mean nothing shown for that city changed."""
+    return pd.util.hash_pandas_object(table, index=True)
+
+
+@dataclass
+class BoardUpdate:
+    """The result of one refresh."""
+    cities: list[str]
+    table: pd.DataFrame
+    changed: list[str]
+    errors: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    first: bool = False  # no earlier refresh to compare with, so every city counts as changed
+
+
+class WeatherBoard:
+    """Fetches many cities concurrently and remembers the last table to report what changed."""
+
+    def __init__(self, weather, max_concurrency: int = BOARD_CONCURRENCY,
+                 requests_per_minute: float | None = BOARD_RPM):
+        self.weather = weather  # a WeatherData
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self._fingerprints = None  # {city: row hash} from the last refresh
+
+    async def fetch(self, cities: list[str], max_age: float | None = None) -> tuple[dict, dict]:
+        """({city: Forecast}, {city: error message}) for `cities`, fetched concurrently.
+
+        Cached forecasts are used unless older than `max_age` (0: fetch every city).
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = RateLimiter(self.requests_per_minute)
+
+        async def one(city):
+            async with semaphore:
+                if self.weather.cached(city, max_age) is None:  # cache hits do not count against the quota
+                    await limiter.wait()
+                return await self.weather.forecast(city, max_age)
+
+        results = await asyncio.gather(*(one(city) for city in cities), return_exceptions=True)
+        forecasts, errors = {}, {}
+        for city, result in zip(cities, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                errors[city] = str(result) or type(result).__name__
+            else:
+                forecasts[city] = result
+        return forecasts, errors
+
+    async def refresh(self, cities: list[str], force: bool = False) -> BoardUpdate:
+        """Fetches `cities` and compares with the last refresh; `force` asks the API even
+        for cities still in the TTL cache, which would otherwise come back unchanged."""
+        started = time.perf_counter()
+        forecasts, errors = await self.fetch(cities, max_age=0 if force else None)
+        table = forecast_table(forecasts)
+        current = fingerprints(table)
+        first = self._fingerprints is None
+        previous = {} if first else self._fingerprints
+        changed = [city for city, fingerprint in current.items() if previous.get(city) != fingerprint]
+        self._fingerprints = current.to_dict()
+        return BoardUpdate(cities, table, changed, errors, time.perf_counter() - started, first)
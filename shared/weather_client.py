@@ -0,0 +1,183 @@
+# Shared weatherapi.com client with a TTL cache and request coalescing.
+#
+# The weather tools called the API on every tool call, even for the same city a few
+# seconds apart and across users. WeatherClient keeps the JSON per (endpoint, city,
+# params), with the city normalized, so "Karachi" and " karachi" share an entry:
+#
+#     weather = WeatherClient(app="07-function-tools")
+#     data = await weather.current("Karachi")        # current.json
+#     data = await weather.forecast("Karachi", days=7)  # forecast.json
+#
+#   - fresh (younger than `ttl`): served from memory;
+#   - stale (younger than `stale_ttl`): served from memory right away while one
+#     background refresh fetches a new copy (stale-while-revalidate);
+#   - missing or too old: fetched, and concurrent callers for the same key wait on
+#     that one request instead of each sending their own (singleflight).
+#
+# get(..., max_age=s) tightens that for one call: an entry older than `s` seconds is
+# fetched again (max_age=0 always fetches, e.g. for a "Refresh" button).
+#
+# get(..., parse=fn) caches fn(json) instead of the raw JSON, so callers that only
+# need a few fields keep a compact object (see shared/weather_data.py). Failed
+# fetches are not cached. Outcomes go to the stream_metrics registry as
+# weather_cache_total{result=hit|stale|miss|coalesced} and in stats(). Point
+# WEATHER_API_URL at shared/weather_stub.py to run without the real API.
+import os
+import re
+import time
+import asyncio
+import logging
+import weakref
+import threading
+from collections import OrderedDict
+from shared.async_tools import get_http_client
+from shared.stream_metrics import describe_metrics, registry
+
+logger = logging.getLogger(__name__)
+
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "http://api.weatherapi.com/v1")
+WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "8e3aca2b91dc4342a1162608252604")
+WEATHER_TTL = float(os.getenv("WEATHER_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "3600"))
+
+describe_metrics({
+    "weather_cache_total": "Weather lookups, by outcome (hit, stale, miss, coalesced).",
+    "weather_fetch_seconds": "Time taken by a weather API request.",
+    "weather_fetch_errors_total": "Weather API requests that failed.",
+})
+
+
+def normalize_city(city: str) -> str:
+    """Case- and whitespace-insensitive form of a city name, used in the cache key."""
+    return re.sub(r"\s+", " ", city).strip().casefold()
+
+
+class WeatherClient:
+    """Async weatherapi.com client with a TTL + stale-while-revalidate cache and singleflight."""
+
+    def __init__(self, base_url: str = WEATHER_API_URL, api_key: str = WEATHER_API_KEY,
+                 ttl: float = WEATHER_TTL, stale_ttl: float = WEATHER_STALE_TTL, max_entries: int = 1024,
+                 request_timeout: float = 3, app: str = "default", metrics=None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self.request_timeout = request_timeout
+        self.app = app
+        self.metrics = metrics or registry
+        self._entries = OrderedDict()  # key -> (fetched_at, data), least recently used first
+        self._lock = threading.Lock()  # Streamlit sessions run in their own threads
+        self._inflight = weakref.WeakKeyDictionary()  # event loop -> {key: task}; tasks belong to one loop
+        self.outcomes = {"hit": 0, "stale": 0, "miss": 0, "coalesced": 0}
+        self.fetches = 0
+        self.errors = 0
+
+    async def current(self, city: str) -> dict:
+        return await self.get("current.json", city)
+
+    async def forecast(self, city: str, days: int = 7) -> dict:
+        return await self.get("forecast.json", city, days=days, aqi="no", alerts="no")
+
+    async def get(self, endpoint: str, city: str, parse=None, *, max_age: float | None = None, **params):
+        """The API's JSON (or parse(json)) for `endpoint` and `city`, from the cache when it is fresh enough."""
+        key = (endpoint, normalize_city(city), tuple(sorted(params.items())), parse)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+        age = time.monotonic() - entry[0] if entry else None
+        if entry and max_age is not None and age >= max_age:
+            entry = None  # older than this caller accepts: fetch it (or join the fetch in flight)
+
+        if entry and age < self.ttl:
+            self._count("hit")
+            return entry[1]
+
+        if entry and age < self.stale_ttl:
+            self._count("stale")
+            self._fetch(key, city, params, background=True)  # refresh in the background, answer now
+            return entry[1]
+
+        inflight = self._inflight_tasks().get(key)
+        self._count("coalesced" if inflight else "miss")
+        return await asyncio.shield(inflight or self._fetch(key, city, params))
+
+    def peek(self, endpoint: str, city: str, parse=None, *, max_age: float | None = None, **params):
+        """The cached value if there is one (fresh or stale), without any network request."""
+        key = (endpoint, normalize_city(city), tuple(sorted(params.items())), parse)
+        with self._lock:
+            entry = self._entries.get(key)
+        limit = self.stale_ttl if max_age is None else min(self.stale_ttl, max_age)
+        return entry[1] if entry and time.monotonic() - entry[0] < limit else None
+
+    def _inflight_tasks(self) -> dict:
+        loop = asyncio.get_running_loop()
+        if loop not in self._inflight:
+            self._inflight[loop] = {}
+        return self._inflight[loop]
+
+    def _fetch(self, key, city, params, background: bool = False) -> asyncio.Task:
+        """The one in-flight request for `key`, started if there is none yet."""
+        tasks = self._inflight_tasks()
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = asyncio.create_task(self._request(key, city, params))
+            task.add_done_callback(lambda t: self._fetched(tasks, key, t, background))
+        return task
+
+    def _fetched(self, tasks, key, task, background):
+        tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is not None and background:
+            # Nobody awaits a background refresh, so report it here; the stale copy stays
+            logger.warning("Weather refresh for %s failed: %s", key[1], task.exception())
+
+    async def _request(self, key, city, params):
+        endpoint, parse = key[0], key[3]
+        started = time.perf_counter()
+        self.fetches += 1
+        try:
+            response = await get_http_client().get(
+                f"{self.base_url}/{endpoint}",
+                params={"key": self.api_key, "q": city, **params},
+                timeout=self.request_timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if parse is not None:
+                data = parse(data)
+        except Exception:
+            self.errors += 1
+            self.metrics.inc("weather_fetch_errors_total", app=self.app, endpoint=endpoint)
+            raise
+        finally:
+            self.metrics.observe("weather_fetch_seconds", time.perf_counter() - started,
+                                 app=self.app, endpoint=endpoint)
+        self._store(key, data)
+        return data
+
+    def _store(self, key, data):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, outcome):
+        self.outcomes[outcome] += 1
+        self.metrics.inc("weather_cache_total", app=self.app, result=outcome)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = sum(self.outcomes.values())
+        served_from_memory = self.outcomes["hit"] + self.outcomes["stale"]
+        return {
+            "entries": len(self._entries),
+            **self.outcomes,
+            "fetches": self.fetches,
+            "errors": self.errors,
+            "hit_rate": served_from_memory / lookups if lookups else 0.0,
+        }
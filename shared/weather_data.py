@@ -0,0 +1,116 @@
+# One weather data layer for both the agent's tool and the UI.
+#
+# 09-weather-api-app fetched the same forecast twice per "Check Weather" click: once
+# in the get_weather tool and once in fetch_weather_data() for the charts, each with
+# its own cache. WeatherData fetches forecast.json once per city per TTL (through
+# WeatherClient, so concurrent callers share the request) and keeps only the fields
+# the apps show, as small frozen dataclasses instead of the ~100 KB raw JSON:
+#
+#     weather = WeatherData(WeatherClient(app="09-weather-api-app"))
+#     forecast = await weather.forecast("Karachi")   # Forecast(location, current, days)
+#     current = await weather.current("Karachi")     # same cached fetch, no extra request
+#     weather.cached("Karachi")                      # Forecast or None, never a network hop
+from dataclasses import dataclass
+from shared.weather_client import WeatherClient
+
+FORECAST_DAYS = 7
+
+
+@dataclass(frozen=True, slots=True)
+class Location:
+    name: str
+    country: str
+    lat: float | None
+    lon: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class Current:
+    temp_c: float
+    feelslike_c: float
+    wind_kph: float
+    condition: str
+    icon_url: str
+    last_updated: str = ""  # the API's "YYYY-MM-DD HH:MM" for this reading; a key for derived data
+
+
+@dataclass(frozen=True, slots=True)
+class Day:
+    date: str
+    maxtemp_c: float
+    mintemp_c: float
+    maxwind_kph: float
+    avghumidity: float
+    chance_of_rain: int
+    condition: str
+    icon_url: str
+    hours: tuple[tuple[str, float], ...]  # (local time "YYYY-MM-DD HH:MM", temp_c)
+
+
+@dataclass(frozen=True, slots=True)
+class Forecast:
+    location: Location
+    current: Current
+    days: tuple[Day, ...]
+
+    def describe_current(self, city: str | None = None) -> str:
+        """The one-line answer the get_weather tool gives."""
+        return (f"The current weather in {city or self.location.name} is {self.current.temp_c}°C "
+                f"with {self.current.condition}.")
+
+
+def icon_url(condition: dict) -> str:
+    icon = condition.get("icon", "")
+    return "https:" + icon if icon.startswith("//") else icon
+
+
+def parse_forecast(data: dict) -> Forecast:
+    """Keeps the fields the apps use from a forecast.json response."""
+    location, current = data["location"], data["current"]
+    days = tuple(
+        Day(
+            date=day["date"],
+            maxtemp_c=day["day"]["maxtemp_c"],
+            mintemp_c=day["day"]["mintemp_c"],
+            maxwind_kph=day["day"]["maxwind_kph"],
+            avghumidity=day["day"]["avghumidity"],
+            chance_of_rain=day["day"]["daily_chance_of_rain"],
+            condition=day["day"]["condition"]["text"],
+            icon_url=icon_url(day["day"]["condition"]),
+            hours=tuple((hour["time"], hour["temp_c"]) for hour in day.get("hour", [])),
+        )
+        for day in data.get("forecast", {}).get("forecastday", [])
+    )
+    return Forecast(
+        location=Location(location.get("name", ""), location.get("country", ""), location.get("lat"), location.get("lon")),
+        current=Current(
+            temp_c=current["temp_c"],
+            feelslike_c=current["feelslike_c"],
+            wind_kph=current["wind_kph"],
+            condition=current["condition"]["text"],
+            icon_url=icon_url(current["condition"]),
+            last_updated=current.get("last_updated", ""),
+        ),
+        days=days,
+    )
+
+
+class WeatherData:
+    """Parsed forecasts per city, one forecast.json fetch per city per TTL."""
+
+    def __init__(self, client: WeatherClient | None = None, days: int = FORECAST_DAYS):
+        self.client = client or WeatherClient()
+        self.days = days
+
+    def _params(self) -> dict:
+        return {"days": self.days, "aqi": "no", "alerts": "no"}
+
+    async def forecast(self, city: str, max_age: float | None = None) -> Forecast:
+        return await self.client.get("forecast.json", city, parse=parse_forecast, max_age=max_age, **self._params())
+
+    async def current(self, city: str) -> Current:
+        return (await self.forecast(city)).current
+
+    def cached(self, city: str, max_age: float | None = None) -> Forecast | None:
+        return self.client.peek("forecast.json", city, parse=parse_forecast, max_age=max_age, **self._params())
+
@@ -0,0 +1,139 @@
+# Local stand-in for the weatherapi.com endpoints the apps use (current.json, forecast.json).
+#
+# Answers with made-up but correctly shaped JSON after an optional delay, and counts
+# the requests it served, so caching and concurrency can be checked without an API key
+# or network:
+#
+#     python -m shared.weather_stub --port 8089 --delay-ms 300
+#     WEATHER_API_URL=http://127.0.0.1:8089/v1 chainlit run 07-function-tools/request.py
+#
+# or from Python (port 0 picks a free port):
+#
+#     stub = WeatherStub(delay=0.3).start()
+#     client = WeatherClient(base_url=stub.url)
+#     ...
+#     stub.requests  # {"karachi": 1}
+#     stub.offsets["karachi"] = 2.5  # later answers for Karachi are 2.5 °C warmer
+#
+# A city named "nowhere" gets a 400 like the real API gives for unknown places.
+import json
+import time
+import zlib
+import argparse
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CONDITIONS = ["Sunny", "Partly cloudy", "Cloudy", "Light rain", "Mist", "Thundery outbreaks"]
+
+
+def fake_current(city: str) -> dict:
+    seed = zlib.crc32(city.casefold().encode())
+    temp = 5 + seed % 35
+    return {
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "temp_c": float(temp),
+        "feelslike_c": float(temp + seed % 4),
+        "wind_kph": float(seed % 30),
+        "humidity": 30 + seed % 60,
+        "condition": {"text": CONDITIONS[seed % len(CONDITIONS)], "icon": "//cdn.weatherapi.com/weather/64x64/day/113.png"},
+    }
+
+
+def fake_forecast_day(city: str, day: date) -> dict:
+    seed = zlib.crc32(f"{city.casefold()}:{day}".encode())
+    low = 5 + seed % 25
+    start = datetime.combine(day, datetime.min.time())
+    return {
+        "date": day.isoformat(),
+        "day": {
+            "maxtemp_c": float(low + 4 + seed % 8),
+            "mintemp_c": float(low),
+            "maxwind_kph": float(seed % 40),
+            "avghumidity": 30 + seed % 60,
+            "daily_chance_of_rain": seed % 100,
+            "condition": {"text": CONDITIONS[seed % len(CONDITIONS)], "icon": "//cdn.weatherapi.com/weather/64x64/day/116.png"},
+        },
+        "hour": [
+            {"time": (start + timedelta(hours=h)).strftime("%Y-%m-%d %H:%M"), "temp_c": float(low + (h * (seed % 7)) % 9)}
+            for h in range(24)
+        ],
+    }
+
+
+class WeatherStub:
+    """Threaded HTTP server speaking the weatherapi.com JSON shapes."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.requests = Counter()  # normalized city -> requests served
+        self.offsets = {}  # normalized city -> °C added to its current temperature
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                city = query.get("q", "").strip()
+                with stub._lock:
+                    stub.requests[city.casefold()] += 1
+                time.sleep(stub.delay)
+                status, body = stub.respond(url.path.rsplit("/", 1)[-1], city, query)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        ThreadingHTTPServer.daemon_threads = True
+        ThreadingHTTPServer.request_queue_size = 128  # load tests connect many clients at once
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_port}/v1"
+
+    def respond(self, endpoint: str, city: str, query: dict) -> tuple[int, dict]:
+        if not city or city.casefold() == "nowhere":
+            return 400, {"error": {"code": 1006, "message": "No matching location found."}}
+        location = {"name": city.title(), "country": "Standland", "lat": 24.86, "lon": 67.01}
+        current = fake_current(city)
+        offset = self.offsets.get(city.casefold(), 0)
+        current["temp_c"] += offset
+        current["feelslike_c"] += offset
+        if endpoint == "current.json":
+            return 200, {"location": location, "current": current}
+        if endpoint == "forecast.json":
+            days = min(int(query.get("days", 1)), 14)
+            forecast = [fake_forecast_day(city, date.today() + timedelta(days=i)) for i in range(days)]
+            return 200, {"location": location, "current": current, "forecast": {"forecastday": forecast}}
+        return 404, {"error": {"code": 1005, "message": "API request url is invalid."}}
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def start(self) -> "WeatherStub":
+        threading.Thread(target=self.server.serve_forever, name="weather-stub", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the weatherapi.com API.")
+    parser.add_argument("--port", type=int, default=8089, help="port to listen on (default: 8089)")
+    parser.add_argument("--delay-ms", type=float, default=0, help="delay before every answer (default: 0)")
+    args = parser.parse_args()
+    stub = WeatherStub(port=args.port, delay=args.delay_ms / 1000)
+    print(f"Weather stub on {stub.url} (set WEATHER_API_URL to this)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass